@@ -0,0 +1,171 @@
+"""
+Computation of finite differences with a pool of processes.
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2022 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+#: Type of functions that can be differentiated: they take a dictionary of input values and
+#: return a dictionary of output values, with variable names as keys.
+VariableFunction = Callable[[Mapping[str, np.ndarray]], Mapping[str, np.ndarray]]
+
+# The function that is evaluated in a worker process.
+_worker_function: VariableFunction = None
+
+
+def _initialize_worker(function: VariableFunction):
+    """Stores the function to evaluate, once for all, in a worker process."""
+    global _worker_function  # pylint: disable=global-statement
+    _worker_function = function
+
+
+def _evaluate(inputs: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Evaluates the stored function in a worker process."""
+    return _evaluate_function(_worker_function, inputs)
+
+
+def _evaluate_function(
+    function: VariableFunction, inputs: Mapping[str, np.ndarray]
+) -> Dict[str, np.ndarray]:
+    """Evaluates a copy of provided function, so that its initial state is kept."""
+    outputs = deepcopy(function)(inputs)
+    return {name: np.asarray(value) for name, value in outputs.items()}
+
+
+class ParallelFiniteDifference:
+    def __init__(self, function: VariableFunction, worker_count: int, step: float = 1.0e-6):
+        """
+        Computes forward finite differences of a function, using a pool of processes.
+
+        The function is sent once to each worker process, when the pool is started (i.e.
+        at first call of :meth:`compute_partials`). It has to be picklable, unless processes
+        are started by forking. Workers keep the state of the function at that time: if the
+        function is modified afterwards, :meth:`shutdown` has to be called so that the pool
+        is started again with the current state.
+        If `worker_count` is 1 or less, evaluations are done in the current process, with
+        the current state of the function.
+
+        Each evaluation is done with a copy of the function, so that results do not depend
+        on previous evaluations in the same process.
+        For the same reason, the reference point is also evaluated in a worker process,
+        unless its output values are provided to :meth:`compute_partials`.
+
+        As in OpenMDAO with `step_calc="rel_element"`, the step for each input element is
+        relative to its value, unless this value is zero.
+
+        :param function: takes a dictionary of input values and returns a dictionary of
+                         output values, with variable names as keys
+        :param worker_count: number of processes
+        :param step: relative step for finite differences (absolute step for null values)
+        """
+        self.function = function
+        self.worker_count = worker_count
+        self.step = step
+        self._executor = None
+
+    def compute_partials(
+        self,
+        inputs: Mapping[str, np.ndarray],
+        of: List[str],
+        wrt: List[str],
+        partials,
+        elementwise: Sequence[str] = (),
+        outputs: Optional[Mapping[str, np.ndarray]] = None,
+    ):
+        """
+        Computes partial derivatives of outputs with respect to inputs.
+
+        There is one evaluation of the function for each element of each input in `wrt`,
+        plus one for the reference point if `outputs` is not provided.
+
+        Inputs in `elementwise` are expected to have the same shape as outputs, which depend
+        on them element by element. All their elements are perturbed at once, so they need
+        only one evaluation each, and the obtained partials are the diagonal values
+        (as expected by OpenMDAO when partials are declared with `rows` and `cols`).
+
+        :param inputs: input values, with variable names as keys
+        :param of: names of outputs to differentiate
+        :param wrt: names of inputs to differentiate with respect to
+        :param partials: where partial derivatives are written, with (of, wrt) as keys (e.g.
+                         the Jacobian provided to OpenMDAO compute_partials())
+        :param elementwise: names of inputs in `wrt` on which outputs depend element-wise
+        :param outputs: if provided, output values at reference point (e.g. as obtained
+                        by OpenMDAO compute()), that must be consistent with an evaluation
+                        of the function
+        """
+        reference_inputs = {name: np.array(value) for name, value in inputs.items()}
+
+        columns = []
+        tasks = [] if outputs is not None else [reference_inputs]
+        for input_name in wrt:
+            value = np.array(reference_inputs[input_name], dtype=float)
+            steps = self.step * np.where(value == 0.0, 1.0, np.abs(value))
+            if input_name in elementwise:
+                indices = [slice(None)]
+            else:
+                indices = range(value.size)
+            for index in indices:
+                perturbed_inputs = dict(reference_inputs)
+                perturbed_value = value.copy()
+                perturbed_value.flat[index] += steps.flat[index]
+                perturbed_inputs[input_name] = perturbed_value
+                tasks.append(perturbed_inputs)
+                # Actual step, as obtained with floating-point arithmetic.
+                columns.append((input_name, index, np.ravel(perturbed_value - value)[index]))
+
+        if self.worker_count <= 1:
+            results = [_evaluate_function(self.function, task) for task in tasks]
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    self.worker_count, initializer=_initialize_worker, initargs=(self.function,)
+                )
+            results = list(self._executor.map(_evaluate, tasks))
+
+        if outputs is None:
+            reference_outputs, *results = results
+        else:
+            reference_outputs = {name: np.asarray(value) for name, value in outputs.items()}
+
+        jacobian = {
+            (output_name, input_name): np.zeros(
+                (np.size(reference_outputs[output_name]), np.size(reference_inputs[input_name]))
+            )
+            for output_name in of
+            for input_name in wrt
+            if input_name not in elementwise
+        }
+        for (input_name, index, step), perturbed_outputs in zip(columns, results):
+            for output_name in of:
+                derivative = (
+                    np.ravel(perturbed_outputs[output_name])
+                    - np.ravel(reference_outputs[output_name])
+                ) / step
+                if input_name in elementwise:
+                    jacobian[output_name, input_name] = derivative
+                else:
+                    jacobian[output_name, input_name][:, index] = derivative
+
+        for key, value in jacobian.items():
+            partials[key] = value
+
+    def shutdown(self):
+        """Stops worker processes. They will be started again if needed."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
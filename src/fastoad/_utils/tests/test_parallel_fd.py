@@ -0,0 +1,104 @@
+"""
+Test module for parallel_fd.py
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2022 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from ..parallel_fd import ParallelFiniteDifference
+
+
+class _Function:
+    def __init__(self):
+        self.call_count = 0
+        self.factor = 3.0
+
+    def __call__(self, inputs):
+        # call_count is modified to check that each evaluation starts from the sent state.
+        self.call_count += 1
+        x = inputs["x"]
+        return {
+            "f": np.sum(x ** 2) * inputs["y"],
+            "g": self.factor * x + inputs["y"],
+            "h": x ** 2,
+            "count": self.call_count,
+        }
+
+
+def test_parallel_finite_difference():
+    fd = ParallelFiniteDifference(_Function(), worker_count=2)
+    inputs = {"x": np.array([1.0, 2.0, 3.0]), "y": 2.0}
+    partials = {}
+    try:
+        fd.compute_partials(inputs, ["f", "g", "count"], ["x", "y"], partials)
+    finally:
+        fd.shutdown()
+
+    assert_allclose(partials["f", "x"], [[4.0, 8.0, 12.0]], rtol=1e-5)
+    assert_allclose(partials["f", "y"], [[14.0]], rtol=1e-5)
+    assert_allclose(partials["g", "x"], 3.0 * np.eye(3), rtol=1e-5)
+    assert_allclose(partials["g", "y"], np.ones((3, 1)), rtol=1e-5)
+    assert_allclose(partials["count", "x"], np.zeros((1, 3)))
+    assert_allclose(partials["count", "y"], np.zeros((1, 1)))
+
+
+def test_parallel_finite_difference_function_state():
+    function = _Function()
+    fd = ParallelFiniteDifference(function, worker_count=2)
+    inputs = {"x": np.array([1.0, 2.0, 3.0]), "y": 2.0}
+    try:
+        partials = {}
+        fd.compute_partials(inputs, ["g"], ["x"], partials)
+        assert_allclose(partials["g", "x"], 3.0 * np.eye(3), rtol=1e-5)
+
+        # Workers keep the state of the function when the pool has been started
+        function.factor = 5.0
+        partials = {}
+        fd.compute_partials(inputs, ["g"], ["x"], partials)
+        assert_allclose(partials["g", "x"], 3.0 * np.eye(3), rtol=1e-5)
+
+        # Restarted workers get the current state
+        fd.shutdown()
+        partials = {}
+        fd.compute_partials(inputs, ["g"], ["x"], partials)
+        assert_allclose(partials["g", "x"], 5.0 * np.eye(3), rtol=1e-5)
+    finally:
+        fd.shutdown()
+
+
+def test_parallel_finite_difference_relative_step():
+    fd = ParallelFiniteDifference(_Function(), worker_count=1)
+    # With an absolute step of 1e-6, round-off errors would spoil the derivative with
+    # respect to x[0], and the step would be too large for x[1].
+    inputs = {"x": np.array([1.0e8, 1.0e-8, 0.0]), "y": 2.0}
+    partials = {}
+    fd.compute_partials(inputs, ["h"], ["x"], partials)
+
+    assert_allclose(np.diag(partials["h", "x"]), [2.0e8, 2.0e-8, 0.0], rtol=1e-5, atol=1e-5)
+
+
+def test_parallel_finite_difference_with_reference_outputs():
+    fd = ParallelFiniteDifference(_Function(), worker_count=1)
+    inputs = {"x": np.array([1.0, 2.0, 3.0]), "y": 2.0}
+    outputs = _Function()(inputs)
+    outputs["f"] = 0.0  # Not the actual value, to check provided outputs are used.
+    partials = {}
+    fd.compute_partials(inputs, ["f", "g", "count"], ["x", "y"], partials, outputs=outputs)
+
+    # f is 28.0 at perturbed points, and steps are relative
+    assert_allclose(partials["f", "x"], [28.0 / (1.0e-6 * inputs["x"])], rtol=1e-5)
+    assert_allclose(partials["g", "x"], 3.0 * np.eye(3), rtol=1e-5)
+    assert_allclose(partials["g", "y"], np.ones((3, 1)), rtol=1e-5)
+    assert_allclose(partials["count", "x"], np.zeros((1, 3)))
@@ -311,21 +311,7 @@ class FASTOADProblemConfigurator:
                     identifier = options.pop(KEY_COMPONENT_ID)
 
                     # Process option values that are relative paths
-                    conf_dirname = pth.dirname(self._conf_file)
-                    for name, option_value in options.items():
-                        option_is_path = (
-                            name.endswith("file")
-                            or name.endswith("path")
-                            or name.endswith("dir")
-                            or name.endswith("directory")
-                            or name.endswith("folder")
-                        )
-                        if (
-                            isinstance(option_value, str)
-                            and option_is_path
-                            and not pth.isabs(option_value)
-                        ):
-                            options[name] = pth.join(conf_dirname, option_value)
+                    self._make_paths_absolute(options, pth.dirname(self._conf_file))
 
                     sub_component = RegisterOpenMDAOSystem.get_system(identifier, options=options)
                     group.add_subsystem(key, sub_component, promotes=["*"])
@@ -349,6 +335,34 @@ class FASTOADProblemConfigurator:
                 except Exception as err:
                     raise FASTConfigurationBadOpenMDAOInstructionError(err, key, value)
 
+    @classmethod
+    def _make_paths_absolute(cls, options: dict, conf_dirname: str):
+        """
+        In provided options, relative paths are made relative to `conf_dirname`.
+
+        Options are considered as paths according to their name. Options that are
+        dictionaries (e.g. options of subsystems) are processed recursively.
+
+        :param options: options of a registered system, modified in-place
+        :param conf_dirname: the folder of the configuration file
+        """
+        for name, option_value in options.items():
+            if isinstance(option_value, dict):
+                option_value = dict(option_value)
+                cls._make_paths_absolute(option_value, conf_dirname)
+                options[name] = option_value
+                continue
+
+            option_is_path = (
+                name.endswith("file")
+                or name.endswith("path")
+                or name.endswith("dir")
+                or name.endswith("directory")
+                or name.endswith("folder")
+            )
+            if isinstance(option_value, str) and option_is_path and not pth.isabs(option_value):
+                options[name] = pth.join(conf_dirname, option_value)
+
     def _add_constraints(self, model, auto_scaling):
         """
         Adds constraints to provided model as instructed in current configuration
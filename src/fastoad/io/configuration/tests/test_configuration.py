@@ -264,3 +264,33 @@ def test_set_optimization_definition(cleanup):
         conf_dict_opt = conf_dict["optimization"]
         # Should be equal
         assert optimization_conf == conf_dict_opt
+
+
+def test_make_paths_absolute():
+    conf_dirname = pth.abspath("conf_folder")
+    options = {
+        "out_file": "results/flight_points.csv",
+        "mission_file_path": pth.abspath("mission.yml"),
+        "mission_name": "operational",
+        "missions": {
+            "sizing": {"mission_file_path": "mission.yml", "out_file": "sizing.csv"},
+            "operational": {"mission_name": "operational", "cache_folder": "cache"},
+        },
+    }
+    FASTOADProblemConfigurator._make_paths_absolute(options, conf_dirname)
+
+    assert options == {
+        "out_file": pth.join(conf_dirname, "results/flight_points.csv"),
+        "mission_file_path": pth.abspath("mission.yml"),
+        "mission_name": "operational",
+        "missions": {
+            "sizing": {
+                "mission_file_path": pth.join(conf_dirname, "mission.yml"),
+                "out_file": pth.join(conf_dirname, "sizing.csv"),
+            },
+            "operational": {
+                "mission_name": "operational",
+                "cache_folder": pth.join(conf_dirname, "cache"),
+            },
+        },
+    }
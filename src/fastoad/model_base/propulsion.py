@@ -15,13 +15,16 @@ Base classes for propulsion components.
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from abc import ABC, abstractmethod
-from typing import Union
+from dataclasses import fields
+from typing import Optional, Union
 
 import numpy as np
 import pandas as pd
+from aenum import Enum
 from openmdao import api as om
 from openmdao.core.component import Component
 
+from fastoad._utils.parallel_fd import ParallelFiniteDifference
 from fastoad.model_base import FlightPoint
 
 
@@ -95,6 +98,59 @@ class IPropulsion(ABC):
         :return: the consumed mass in kg
         """
 
+    #: True if :meth:`compute_flight_points` accepts FlightPoint instances with numpy arrays
+    #: as field values. Models that can process only one flight point at a time should set it
+    #: to False, so that :meth:`compute_flight_points_batch` calls them point by point.
+    is_vectorized = True
+
+    def compute_flight_points_batch(self, flight_points: FlightPoint):
+        """
+        Computes several flight points at once.
+
+        Fields of provided FlightPoint instance are either 1D numpy arrays of the same size,
+        with one element per flight point, or scalars that apply to all flight points.
+        Conventions about :code:`thrust_is_regulated`, :code:`thrust_rate` and :code:`thrust`
+        are the same as for :meth:`compute_flight_points`.
+
+        Default implementation calls :meth:`compute_flight_points` once if
+        :attr:`is_vectorized` is True, and once per flight point otherwise. Models that
+        can do better than that may overload this method.
+
+        :param flight_points: FlightPoint instance with array values
+        :return: None (inputs are updated in-place)
+        """
+        if self.is_vectorized:
+            self.compute_flight_points(flight_points)
+        else:
+            _compute_point_by_point(self, flight_points)
+
+
+class BatchPropulsionAdapter(IPropulsion):
+    def __init__(self, propulsion: IPropulsion):
+        """
+        Wrapper that sends to :meth:`IPropulsion.compute_flight_points_batch` of the wrapped
+        model the FlightPoint instances that have array values.
+
+        It allows code that computes several flight points at once (e.g. batched segment
+        computation) to work with any propulsion model, while vectorized models still get
+        only one call.
+
+        :param propulsion: the wrapped propulsion model
+        """
+        self.propulsion = propulsion
+
+    def compute_flight_points(self, flight_points: Union[FlightPoint, pd.DataFrame]):
+        if isinstance(flight_points, FlightPoint) and _get_batch_size(flight_points):
+            self.propulsion.compute_flight_points_batch(flight_points)
+        else:
+            self.propulsion.compute_flight_points(flight_points)
+
+    def compute_flight_points_batch(self, flight_points: FlightPoint):
+        self.propulsion.compute_flight_points_batch(flight_points)
+
+    def get_consumed_mass(self, flight_point: FlightPoint, time_step: float) -> float:
+        return self.propulsion.get_consumed_mass(flight_point, time_step)
+
 
 class IOMPropulsionWrapper:
     """
@@ -131,15 +187,58 @@ class IOMPropulsionWrapper:
         """
 
 
+_DEFAULT_OPTIONS = {"partials_method": "fd", "fd_workers": 0, "use_coloring": False}
+
+
 class BaseOMPropulsionComponent(om.ExplicitComponent, ABC):
     """
     Base class for creating an OpenMDAO component from subclasses of :class:`IOMPropulsionWrapper`.
 
     Classes that implements this interface should add their own inputs in setup()
     and implement :meth:`get_wrapper`.
+
+    Option "partials_method" can be set to "cs" for using complex step instead of finite
+    differences, provided that the propulsion model accepts complex values.
+    Option "fd_workers" can be set to a number greater than 1 for computing finite
+    differences in parallel with this number of processes. The wrapper returned by
+    :meth:`get_wrapper` has then to be picklable.
+
+    Outputs depend element-wise on flight inputs (:attr:`FLIGHT_INPUTS`), so their partials
+    are declared as diagonal. Option "use_coloring" can be set to True for computing finite
+    differences with all elements of a flight input perturbed at once, so that partials are
+    obtained with a few calls to the propulsion model instead of one per element.
+
+    Classes that overload initialize() should call `super().initialize()` for these options
+    to be available. Otherwise, default values are used.
     """
 
+    #: Inputs that define the flight points. Outputs depend element-wise on them.
+    FLIGHT_INPUTS = [
+        "data:propulsion:mach",
+        "data:propulsion:altitude",
+        "data:propulsion:engine_setting",
+        "data:propulsion:use_thrust_rate",
+        "data:propulsion:required_thrust_rate",
+        "data:propulsion:required_thrust",
+    ]
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._parallel_fd: Optional[ParallelFiniteDifference] = None
+
+    def initialize(self):
+        self.options.declare(
+            "partials_method", default=_DEFAULT_OPTIONS["partials_method"], values=["fd", "cs"]
+        )
+        self.options.declare("fd_workers", default=_DEFAULT_OPTIONS["fd_workers"], types=int)
+        self.options.declare("use_coloring", default=_DEFAULT_OPTIONS["use_coloring"], types=bool)
+
     def setup(self):
+        # Worker processes of a previous setup would keep a former propulsion model.
+        if self._parallel_fd is not None:
+            self._parallel_fd.shutdown()
+            self._parallel_fd = None
+
         self.add_input("data:propulsion:mach", np.nan, shape_by_conn=True)
         self.add_input("data:propulsion:altitude", np.nan, shape_by_conn=True, units="m")
         self.add_input("data:propulsion:engine_setting", np.nan, shape_by_conn=True)
@@ -158,24 +257,67 @@ class BaseOMPropulsionComponent(om.ExplicitComponent, ABC):
         )
 
     def setup_partials(self):
-        self.declare_partials("*", "*", method="fd")
+        # Partials may be computed in compute_partials() (see _use_own_fd()).
+        method_kwargs = (
+            {} if self._use_own_fd() else {"method": self._get_option("partials_method")}
+        )
+
+        input_sizes = self.get_io_metadata("input", metadata_keys=["size"])
+        diagonal = np.arange(input_sizes["data:propulsion:mach"]["size"])
+        self.declare_partials(
+            "*", self.FLIGHT_INPUTS, rows=diagonal, cols=diagonal, **method_kwargs
+        )
+
+        model_inputs = [name for name in input_sizes if name not in self.FLIGHT_INPUTS]
+        if model_inputs:
+            self.declare_partials("*", model_inputs, **method_kwargs)
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
-        wrapper = self.get_wrapper().get_model(inputs)
-        flight_point = FlightPoint(
-            mach=inputs["data:propulsion:mach"],
-            altitude=inputs["data:propulsion:altitude"],
-            engine_setting=inputs["data:propulsion:engine_setting"],
-            thrust_is_regulated=np.logical_not(
-                inputs["data:propulsion:use_thrust_rate"].astype(int)
-            ),
-            thrust_rate=inputs["data:propulsion:required_thrust_rate"],
-            thrust=inputs["data:propulsion:required_thrust"],
+        _compute_propulsion(self.get_wrapper(), inputs, outputs)
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+        if not self._use_own_fd():
+            return
+
+        if self._parallel_fd is None:
+            self._parallel_fd = ParallelFiniteDifference(
+                _PropulsionEvaluator(self.get_wrapper()), self._get_option("fd_workers")
+            )
+        self._parallel_fd.compute_partials(
+            {name: inputs[name] for name in inputs.keys()},
+            list(self.get_io_metadata("output", metadata_keys=[])),
+            list(self.get_io_metadata("input", metadata_keys=[])),
+            partials,
+            elementwise=self.FLIGHT_INPUTS,
+        )
+
+    def cleanup(self):
+        super().cleanup()
+        if self._parallel_fd is not None:
+            self._parallel_fd.shutdown()
+            self._parallel_fd = None
+
+    def _use_own_fd(self) -> bool:
+        """
+        True if finite differences are computed in :meth:`compute_partials`, i.e. with
+        perturbation of all elements of flight inputs at once, and possibly in parallel.
+
+        Note: OpenMDAO coloring could do the same, but its automatic detection of sparsity
+        fails with scaled outputs, while the sparsity is known here.
+        """
+        return self._get_option("partials_method") == "fd" and (
+            self._get_option("fd_workers") > 1 or self._get_option("use_coloring")
         )
-        wrapper.compute_flight_points(flight_point)
-        outputs["data:propulsion:SFC"] = flight_point.sfc
-        outputs["data:propulsion:thrust_rate"] = flight_point.thrust_rate
-        outputs["data:propulsion:thrust"] = flight_point.thrust
+
+    def _get_option(self, name: str):
+        """
+        :return: value of option `name`, or its default value if options have not been
+                 declared, i.e. if a subclass overloads initialize() without calling
+                 `super().initialize()`
+        """
+        if name in self.options:
+            return self.options[name]
+        return _DEFAULT_OPTIONS[name]
 
     @staticmethod
     @abstractmethod
@@ -188,6 +330,40 @@ class BaseOMPropulsionComponent(om.ExplicitComponent, ABC):
         """
 
 
+def _compute_propulsion(wrapper: IOMPropulsionWrapper, inputs, outputs):
+    """Computes outputs of :class:`BaseOMPropulsionComponent` with provided wrapper."""
+    model = wrapper.get_model(inputs)
+    flight_point = FlightPoint(
+        mach=inputs["data:propulsion:mach"],
+        altitude=inputs["data:propulsion:altitude"],
+        engine_setting=inputs["data:propulsion:engine_setting"],
+        thrust_is_regulated=np.logical_not(
+            np.real(inputs["data:propulsion:use_thrust_rate"]).astype(int)
+        ),
+        thrust_rate=inputs["data:propulsion:required_thrust_rate"],
+        thrust=inputs["data:propulsion:required_thrust"],
+    )
+    model.compute_flight_points_batch(flight_point)
+    outputs["data:propulsion:SFC"] = flight_point.sfc
+    outputs["data:propulsion:thrust_rate"] = flight_point.thrust_rate
+    outputs["data:propulsion:thrust"] = flight_point.thrust
+
+
+class _PropulsionEvaluator:
+    """
+    Picklable counterpart of :class:`BaseOMPropulsionComponent`, for computing propulsion in
+    other processes.
+    """
+
+    def __init__(self, wrapper: IOMPropulsionWrapper):
+        self._wrapper = wrapper
+
+    def __call__(self, inputs):
+        outputs = {}
+        _compute_propulsion(self._wrapper, inputs, outputs)
+        return outputs
+
+
 class AbstractFuelPropulsion(IPropulsion, ABC):
     """
     Propulsion model that consume any fuel should inherit from this one.
@@ -213,9 +389,65 @@ class FuelEngineSet(AbstractFuelPropulsion):
         self.engine = engine
         self.engine_count = engine_count
 
+    @property
+    def is_vectorized(self) -> bool:
+        return self.engine.is_vectorized
+
     def compute_flight_points(self, flight_points: Union[FlightPoint, pd.DataFrame]):
         if flight_points.thrust is not None:
             flight_points.thrust = flight_points.thrust / self.engine_count
 
         self.engine.compute_flight_points(flight_points)
         flight_points.thrust = flight_points.thrust * self.engine_count
+
+    def compute_flight_points_batch(self, flight_points: FlightPoint):
+        # The whole batch goes to the engine model, that decides how to process it.
+        if flight_points.thrust is not None:
+            flight_points.thrust = flight_points.thrust / self.engine_count
+
+        self.engine.compute_flight_points_batch(flight_points)
+        flight_points.thrust = flight_points.thrust * self.engine_count
+
+
+def _get_batch_size(flight_points: FlightPoint) -> int:
+    """
+    :return: the size of array values in provided FlightPoint instance, or 0 if all values are
+             scalars
+    """
+    sizes = [
+        np.size(getattr(flight_points, field.name))
+        for field in fields(flight_points)
+        if np.ndim(getattr(flight_points, field.name)) > 0
+    ]
+    return max(sizes, default=0)
+
+
+def _compute_point_by_point(propulsion: IPropulsion, flight_points: FlightPoint):
+    """
+    Calls :meth:`IPropulsion.compute_flight_points` of provided model for each element of
+    array values in provided FlightPoint instance, and stores results in it as arrays.
+    """
+    batch_size = _get_batch_size(flight_points)
+    if batch_size == 0:
+        propulsion.compute_flight_points(flight_points)
+        return
+
+    field_names = [field.name for field in fields(flight_points)]
+    points = []
+    for i in range(batch_size):
+        values = {}
+        for name in field_names:
+            value = getattr(flight_points, name)
+            values[name] = np.asarray(value)[i] if np.ndim(value) > 0 else value
+        point = FlightPoint(**values)
+        propulsion.compute_flight_points(point)
+        points.append(point)
+
+    for name in field_names:
+        values = [getattr(point, name) for point in points]
+        if all(value is None for value in values):
+            continue
+        if all(isinstance(value, (str, Enum)) for value in values) and len(set(values)) == 1:
+            setattr(flight_points, name, values[0])
+        else:
+            setattr(flight_points, name, np.array([np.asarray(value).item() for value in values]))
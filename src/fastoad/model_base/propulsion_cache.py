@@ -0,0 +1,224 @@
+"""
+Memoization of propulsion computations.
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2022 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import inspect
+from collections import OrderedDict
+from dataclasses import fields
+from functools import wraps
+from typing import Any, Dict, Hashable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .flight_point import FlightPoint
+from .propulsion import IOMPropulsionWrapper, IPropulsion
+
+#: Default quantization steps of flight point fields that define cache keys.
+DEFAULT_RESOLUTIONS = {"mach": 1.0e-6, "altitude": 1.0e-3, "thrust": 1.0e-3, "thrust_rate": 1.0e-8}
+
+#: Flight point fields that a propulsion model has to provide, and that are always stored.
+OUTPUT_FIELDS = ["thrust", "thrust_rate", "sfc"]
+
+
+class CachedPropulsion(IPropulsion):
+    def __init__(
+        self,
+        propulsion: IPropulsion,
+        max_size: int = 1024,
+        resolutions: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Least-recently-used storage of the results of a propulsion model.
+
+        Results of :meth:`compute_flight_points` are stored with mach, altitude, engine
+        setting, thrust_is_regulated and thrust (if thrust is regulated) or thrust rate
+        (otherwise) as key. Numerical values are quantized with the steps in
+        `resolutions`, so that nearly identical flight points share the same entry.
+
+        On a match, the fields in :data:`OUTPUT_FIELDS` and the other fields that the model
+        modified in the stored computation are copied into the provided flight point, except
+        the thrust order (thrust or thrust rate) that keeps its requested value.
+
+        Only flight points with one value per field are stored. Other ones (including
+        complex values) are computed by the wrapped model.
+
+        :param propulsion: the wrapped propulsion model
+        :param max_size: maximum number of stored entries. When exceeded, the least recently
+                         used entry is removed.
+        :param resolutions: quantization steps for "mach", "altitude", "thrust" and
+                            "thrust_rate". Missing ones are taken from
+                            :data:`DEFAULT_RESOLUTIONS`.
+        """
+        self.propulsion = propulsion
+        self.max_size = max_size
+        self.resolutions = dict(DEFAULT_RESOLUTIONS, **(resolutions or {}))
+
+        #: Number of requests that found a stored entry.
+        self.hits = 0
+        #: Number of requests that found no stored entry.
+        self.misses = 0
+
+        self._entries: Dict[Hashable, Dict[str, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Ratio of requests that found a stored entry (0.0 if there was no request)."""
+        request_count = self.hits + self.misses
+        return self.hits / request_count if request_count else 0.0
+
+    @property
+    def is_vectorized(self) -> bool:
+        return self.propulsion.is_vectorized
+
+    def clear(self):
+        """Removes all stored entries and resets counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def compute_flight_points(self, flight_points: Union[FlightPoint, pd.DataFrame]):
+        key = self._get_key(flight_points) if isinstance(flight_points, FlightPoint) else None
+        if key is None:
+            self.propulsion.compute_flight_points(flight_points)
+            return
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            entry = self._compute(flight_points)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            for name, value in entry.items():
+                setattr(flight_points, name, _copy(value))
+
+    def compute_flight_points_batch(self, flight_points: FlightPoint):
+        self.propulsion.compute_flight_points_batch(flight_points)
+
+    def get_consumed_mass(self, flight_point: FlightPoint, time_step: float) -> float:
+        return self.propulsion.get_consumed_mass(flight_point, time_step)
+
+    def _compute(self, flight_point: FlightPoint) -> Dict[str, Any]:
+        """
+        Computes provided flight point with the wrapped model.
+
+        :return: copies of the values of :data:`OUTPUT_FIELDS` and of the other values that
+                 the model has modified, with field names as keys
+        """
+        field_names = [field.name for field in fields(flight_point)]
+        initial_values = {name: _copy(getattr(flight_point, name)) for name in field_names}
+        self.propulsion.compute_flight_points(flight_point)
+
+        order_name = "thrust" if self._is_thrust_regulated(flight_point) else "thrust_rate"
+        return {
+            name: _copy(getattr(flight_point, name))
+            for name in field_names
+            if name != order_name
+            and (
+                name in OUTPUT_FIELDS
+                or not _is_same(getattr(flight_point, name), initial_values[name])
+            )
+        }
+
+    def _get_key(self, flight_point: FlightPoint) -> Optional[tuple]:
+        """
+        :return: the key for provided flight point, or None if it cannot be stored
+        """
+        thrust_is_regulated = self._is_thrust_regulated(flight_point)
+        engine_setting = flight_point.engine_setting
+        if np.size(thrust_is_regulated) != 1 or np.size(engine_setting) != 1:
+            return None
+
+        key = [bool(np.asarray(thrust_is_regulated).item()), np.asarray(engine_setting).item()]
+        order_name = "thrust" if key[0] else "thrust_rate"
+        for name in ["mach", "altitude", order_name]:
+            value = getattr(flight_point, name)
+            if value is None:
+                key.append(None)
+                continue
+            if np.size(value) != 1 or np.iscomplexobj(value):
+                return None
+            key.append(
+                (np.shape(value), round(float(np.asarray(value).item()) / self.resolutions[name]))
+            )
+
+        return tuple(key)
+
+    @staticmethod
+    def _is_thrust_regulated(flight_point: FlightPoint):
+        if flight_point.thrust_is_regulated is None:
+            return flight_point.thrust_rate is None
+        return flight_point.thrust_is_regulated
+
+
+def cached_propulsion(max_size: int = 1024, resolutions: Optional[Dict[str, float]] = None):
+    """
+    Decorator for subclasses of :class:`~fastoad.model_base.propulsion.IOMPropulsionWrapper`.
+
+    Propulsion models provided by `get_model()` of the decorated class are wrapped in a
+    :class:`CachedPropulsion` instance::
+
+        @RegisterPropulsion("my.propulsion.wrapper")
+        @cached_propulsion(max_size=500)
+        class MyPropulsionWrapper(IOMPropulsionWrapper):
+            ...
+
+    :param max_size: see :class:`CachedPropulsion`
+    :param resolutions: see :class:`CachedPropulsion`
+    :return: the decorator
+    """
+
+    def decorate(wrapper_class: type) -> type:
+        if not issubclass(wrapper_class, IOMPropulsionWrapper):
+            raise TypeError(f"{wrapper_class.__name__} is not a subclass of IOMPropulsionWrapper.")
+
+        get_model = wrapper_class.get_model
+
+        @wraps(get_model)
+        def get_cached_model(*args) -> CachedPropulsion:
+            return CachedPropulsion(get_model(*args), max_size=max_size, resolutions=resolutions)
+
+        if isinstance(inspect.getattr_static(wrapper_class, "get_model"), staticmethod):
+            get_cached_model = staticmethod(get_cached_model)
+        wrapper_class.get_model = get_cached_model
+        return wrapper_class
+
+    return decorate
+
+
+def _copy(value):
+    """
+    :return: a copy of provided value if it is a numpy array, the value itself otherwise
+    """
+    return np.copy(value) if isinstance(value, np.ndarray) else value
+
+
+def _is_same(value1, value2) -> bool:
+    """
+    :return: True if provided values are identical or equal
+    """
+    if value1 is value2:
+        return True
+    try:
+        return np.shape(value1) == np.shape(value2) and bool(np.array_equal(value1, value2))
+    except (TypeError, ValueError):
+        return False
@@ -0,0 +1,309 @@
+"""
+Tabulated surrogate for propulsion models.
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2022 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import RegularGridInterpolator
+from scipy.ndimage import map_coordinates
+
+from .flight_point import FlightPoint
+from .propulsion import IPropulsion
+
+_LOGGER = logging.getLogger(__name__)  # Logger for this module
+
+DEFAULT_MACH_VALUES = np.linspace(0.0, 0.9, 10)
+DEFAULT_ALTITUDE_VALUES = np.linspace(0.0, 13000.0, 14)
+DEFAULT_THRUST_RATE_VALUES = np.linspace(0.05, 1.0, 20)
+
+
+class TabulatedPropulsion(IPropulsion):
+    def __init__(
+        self,
+        propulsion: IPropulsion,
+        mach_values: Sequence[float] = DEFAULT_MACH_VALUES,
+        altitude_values: Sequence[float] = DEFAULT_ALTITUDE_VALUES,
+        thrust_rate_values: Sequence[float] = DEFAULT_THRUST_RATE_VALUES,
+        method: str = "linear",
+        estimate_errors: bool = False,
+    ):
+        """
+        Surrogate of a propulsion model, based on tables of thrust and SFC.
+
+        For each engine setting, the wrapped model is computed once over the grid defined by
+        `mach_values`, `altitude_values` and `thrust_rate_values` (using
+        :meth:`~fastoad.model_base.propulsion.IPropulsion.compute_flight_points_batch`).
+        Tables are built the first time the engine setting is needed.
+
+        Flight points are then computed by interpolation in these tables. When thrust is
+        regulated, thrust rate is obtained by inverse lookup of thrust along the thrust rate
+        axis, which assumes thrust increases with thrust rate.
+        Outside of the grid, values are extrapolated.
+
+        If `estimate_errors` is True, the wrapped model is also computed at the centers of
+        grid cells when building tables, and the maximum relative errors of the surrogate at
+        these points are available in :attr:`error_estimates`. It doubles the number of
+        computations of the wrapped model.
+
+        .. note::
+
+            The surrogate does not accept complex values.
+
+        :param propulsion: the wrapped propulsion model
+        :param mach_values: grid values for Mach number
+        :param altitude_values: grid values for altitude, in meters
+        :param thrust_rate_values: grid values for thrust rate
+        :param method: "linear" for multilinear interpolation, or "spline" for cubic spline
+                       interpolation (done in grid index space, so grid values should be
+                       evenly spaced)
+        :param estimate_errors: if True, surrogate errors are estimated when building tables
+        """
+        self.propulsion = propulsion
+        self.mach_values = np.asarray(mach_values, dtype=float)
+        self.altitude_values = np.asarray(altitude_values, dtype=float)
+        self.thrust_rate_values = np.asarray(thrust_rate_values, dtype=float)
+        if method not in INTERPOLATORS:
+            raise ValueError(f'Unknown interpolation method "{method}".')
+        self.method = method
+        self.estimate_errors = estimate_errors
+
+        #: Maximum relative errors of the surrogate at centers of grid cells, as
+        #: {engine setting: {"thrust": error, "sfc": error}}
+        self.error_estimates: Dict = {}
+
+        # Interpolators of thrust and SFC, with engine setting as key
+        self._tables: Dict = {}
+
+    def compute_flight_points(self, flight_points: Union[FlightPoint, pd.DataFrame]):
+        shape = np.broadcast(
+            *[
+                np.asarray(value)
+                for value in (
+                    flight_points.mach,
+                    flight_points.altitude,
+                    flight_points.thrust_is_regulated,
+                    flight_points.thrust_rate,
+                    flight_points.thrust,
+                )
+                if value is not None
+            ]
+        ).shape
+        engine_settings = np.broadcast_to(
+            np.asarray(flight_points.engine_setting, dtype=object), shape
+        )
+
+        thrust_rate, thrust, sfc = (np.zeros(shape) for _ in range(3))
+        for engine_setting in set(engine_settings.flat):
+            indices = np.asarray(engine_settings == engine_setting)
+            thrust_rate[indices], thrust[indices], sfc[indices] = self._compute(
+                flight_points, engine_setting, indices
+            )
+
+        if shape == ():
+            thrust_rate, thrust, sfc = thrust_rate.item(), thrust.item(), sfc.item()
+        flight_points.thrust_rate = thrust_rate
+        flight_points.thrust = thrust
+        flight_points.sfc = sfc
+
+    def get_consumed_mass(self, flight_point: FlightPoint, time_step: float) -> float:
+        return self.propulsion.get_consumed_mass(flight_point, time_step)
+
+    def _compute(self, flight_points: FlightPoint, engine_setting, indices: np.ndarray):
+        """
+        Computes flight points at provided indices, that share provided engine setting.
+
+        :return: thrust rate, thrust and SFC as 1D arrays
+        """
+        thrust_table, sfc_table = self._get_tables(engine_setting)
+
+        def get_values(value):
+            return np.broadcast_to(value, indices.shape)[indices]
+
+        mach = get_values(flight_points.mach)
+        altitude = get_values(flight_points.altitude)
+        thrust_is_regulated = flight_points.thrust_is_regulated
+        if thrust_is_regulated is None:
+            thrust_is_regulated = flight_points.thrust_rate is None
+        thrust_is_regulated = get_values(thrust_is_regulated).astype(bool)
+
+        thrust_rate = np.zeros(mach.shape)
+        if not np.all(thrust_is_regulated):
+            thrust_rate[~thrust_is_regulated] = get_values(flight_points.thrust_rate)[
+                ~thrust_is_regulated
+            ]
+        if np.any(thrust_is_regulated):
+            thrust_rate[thrust_is_regulated] = self._get_thrust_rate(
+                thrust_table,
+                mach[thrust_is_regulated],
+                altitude[thrust_is_regulated],
+                get_values(flight_points.thrust)[thrust_is_regulated],
+            )
+
+        points = np.stack([mach, altitude, thrust_rate], axis=-1)
+        return thrust_rate, thrust_table(points), sfc_table(points)
+
+    def _get_thrust_rate(self, thrust_table, mach, altitude, thrust) -> np.ndarray:
+        """
+        Inverse lookup of thrust rate for provided thrust values.
+
+        :return: thrust rate values
+        """
+        rates = self.thrust_rate_values
+        mach, altitude, thrust = np.broadcast_arrays(mach, altitude, thrust)
+        points = np.stack(
+            np.broadcast_arrays(mach[:, None], altitude[:, None], rates[None, :]), axis=-1
+        )
+        thrust_values = thrust_table(points)
+
+        # Piecewise linear inversion between grid values, that is exact for multilinear
+        # interpolation.
+        j = np.clip(np.sum(thrust_values <= thrust[:, None], axis=1), 1, len(rates) - 1)
+        i = np.arange(len(thrust))
+        thrust_rate = rates[j - 1] + (thrust - thrust_values[i, j - 1]) * (
+            rates[j] - rates[j - 1]
+        ) / (thrust_values[i, j] - thrust_values[i, j - 1])
+
+        if self.method != "linear":
+            # A few secant iterations from the linear estimate
+            previous_rate = rates[j - 1]
+            previous_delta = thrust_values[i, j - 1] - thrust
+            for _ in range(5):
+                delta = thrust_table(np.stack([mach, altitude, thrust_rate], axis=-1)) - thrust
+                inverse_slope = np.divide(
+                    thrust_rate - previous_rate,
+                    delta - previous_delta,
+                    out=np.zeros_like(delta),
+                    where=delta != previous_delta,
+                )
+                previous_rate, previous_delta = thrust_rate, delta
+                thrust_rate = thrust_rate - delta * inverse_slope
+
+        return thrust_rate
+
+    def _get_tables(self, engine_setting):
+        """
+        :return: the (thrust, SFC) interpolators for provided engine setting, that are built if
+                 needed
+        """
+        if engine_setting not in self._tables:
+            grid = (self.mach_values, self.altitude_values, self.thrust_rate_values)
+            thrust, sfc = self._sample(engine_setting, *np.meshgrid(*grid, indexing="ij"))
+            self._tables[engine_setting] = tuple(
+                INTERPOLATORS[self.method](grid, values) for values in (thrust, sfc)
+            )
+            if self.estimate_errors:
+                self.error_estimates[engine_setting] = self._estimate_errors(engine_setting)
+                _LOGGER.debug(
+                    "Propulsion surrogate for engine setting %s: max relative errors %s",
+                    engine_setting,
+                    self.error_estimates[engine_setting],
+                )
+
+        return self._tables[engine_setting]
+
+    def _sample(self, engine_setting, mach, altitude, thrust_rate):
+        """
+        Computes the wrapped model for provided values.
+
+        :return: thrust and SFC, with same shape as provided values
+        """
+        flight_points = FlightPoint(
+            mach=mach.ravel(),
+            altitude=altitude.ravel(),
+            engine_setting=engine_setting,
+            thrust_is_regulated=False,
+            thrust_rate=thrust_rate.ravel(),
+            thrust=np.zeros(mach.size),
+        )
+        self.propulsion.compute_flight_points_batch(flight_points)
+        return (
+            np.reshape(flight_points.thrust, mach.shape),
+            np.reshape(flight_points.sfc, mach.shape),
+        )
+
+    def _estimate_errors(self, engine_setting) -> Optional[Dict[str, float]]:
+        """
+        Compares surrogate and wrapped model at centers of grid cells.
+
+        :return: maximum relative errors for thrust and SFC
+        """
+        grid = [
+            (values[1:] + values[:-1]) / 2.0
+            for values in (self.mach_values, self.altitude_values, self.thrust_rate_values)
+        ]
+        if any(values.size == 0 for values in grid):
+            return None
+
+        centers = np.meshgrid(*grid, indexing="ij")
+        points = np.stack(centers, axis=-1)
+        errors = {}
+        for name, table, expected in zip(
+            ["thrust", "sfc"],
+            self._tables[engine_setting],
+            self._sample(engine_setting, *centers),
+        ):
+            error = np.abs(table(points) - expected) / np.maximum(np.abs(expected), 1.0e-30)
+            errors[name] = float(np.nanmax(error))
+        return errors
+
+
+def _get_linear_interpolator(grid, values) -> RegularGridInterpolator:
+    """
+    :return: a multilinear interpolator with linear extrapolation outside of the grid
+    """
+    return RegularGridInterpolator(grid, values, bounds_error=False, fill_value=None)
+
+
+class _SplineInterpolator:
+    def __init__(self, grid, values):
+        """
+        Cubic spline interpolator on a rectilinear grid.
+
+        Interpolation is done in grid index space. Outside of the grid, values are
+        extrapolated linearly.
+
+        :param grid: the values of each axis
+        :param values: the values at grid nodes
+        """
+        self._grid = grid
+        self._values = values
+        self._linear_interpolator = _get_linear_interpolator(grid, values)
+
+    def __call__(self, points) -> np.ndarray:
+        points = np.asarray(points, dtype=float)
+        shape = points.shape[:-1]
+        points = np.reshape(points, (-1, len(self._grid)))
+
+        coordinates = np.array(
+            [
+                np.interp(points[:, i], axis_values, np.arange(len(axis_values)))
+                for i, axis_values in enumerate(self._grid)
+            ]
+        )
+        values = map_coordinates(self._values, coordinates, order=3, mode="nearest")
+
+        outside = np.zeros(len(points), dtype=bool)
+        for i, axis_values in enumerate(self._grid):
+            outside |= (points[:, i] < axis_values[0]) | (points[:, i] > axis_values[-1])
+        if np.any(outside):
+            values[outside] = self._linear_interpolator(points[outside])
+
+        return np.reshape(values, shape)
+
+
+INTERPOLATORS = {"linear": _get_linear_interpolator, "spline": _SplineInterpolator}
@@ -0,0 +1,232 @@
+"""
+Test module for propulsion.py
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2022 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Union
+
+import numpy as np
+import openmdao.api as om
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose
+
+from ..flight_point import FlightPoint
+from ..propulsion import (
+    AbstractFuelPropulsion,
+    BaseOMPropulsionComponent,
+    BatchPropulsionAdapter,
+    FuelEngineSet,
+    IOMPropulsionWrapper,
+)
+
+FLIGHT_POINT_COUNT = 20
+
+
+class _SimpleEngine(AbstractFuelPropulsion):
+    call_count = 0
+
+    def __init__(self, max_thrust):
+        self.max_thrust = max_thrust
+
+    def compute_flight_points(self, flight_points: Union[FlightPoint, pd.DataFrame]):
+        _SimpleEngine.call_count += 1
+        max_thrust = self.max_thrust * (1.0 - 2.0e-5 * flight_points.altitude)
+        flight_points.thrust_rate = np.where(
+            flight_points.thrust_is_regulated,
+            flight_points.thrust / max_thrust,
+            flight_points.thrust_rate,
+        )
+        flight_points.thrust = flight_points.thrust_rate * max_thrust
+        flight_points.sfc = 1.0e-5 * (1.0 + 0.5 * flight_points.mach) / flight_points.thrust_rate
+
+    def compute_weight(self) -> float:
+        return 0.0
+
+    def compute_dimensions(self) -> (float, float, float, float):
+        return 0.0, 0.0, 0.0, 0.0
+
+    def compute_drag(self, mach, unit_reynolds, wing_mac):
+        return 0.0
+
+    def get_consumed_mass(self, flight_point: FlightPoint, time_step: float) -> float:
+        return 0.0
+
+
+class _ScalarEngine(_SimpleEngine):
+    is_vectorized = False
+
+    def compute_flight_points(self, flight_points: Union[FlightPoint, pd.DataFrame]):
+        assert np.ndim(flight_points.mach) == 0
+        super().compute_flight_points(flight_points)
+
+
+class _SimpleEngineWrapper(IOMPropulsionWrapper):
+    def setup(self, component: om.ExplicitComponent):
+        component.add_input("data:propulsion:max_thrust", np.nan, units="N")
+
+    @staticmethod
+    def get_model(inputs) -> _SimpleEngine:
+        return _SimpleEngine(inputs["data:propulsion:max_thrust"])
+
+
+class _SimpleEngineComponent(BaseOMPropulsionComponent):
+    def setup(self):
+        super().setup()
+        self.get_wrapper().setup(self)
+
+    @staticmethod
+    def get_wrapper() -> _SimpleEngineWrapper:
+        return _SimpleEngineWrapper()
+
+
+class _EngineComponentWithOwnInitialize(_SimpleEngineComponent):
+    def initialize(self):
+        # super().initialize() is not called
+        self.options.declare("dummy_option", default=None)
+
+
+def _get_problem(component_class=_SimpleEngineComponent, **options) -> om.Problem:
+    ivc = om.IndepVarComp()
+    ivc.add_output("data:propulsion:mach", np.linspace(0.2, 0.8, FLIGHT_POINT_COUNT))
+    ivc.add_output(
+        "data:propulsion:altitude", np.linspace(0.0, 10000.0, FLIGHT_POINT_COUNT), units="m"
+    )
+    ivc.add_output("data:propulsion:engine_setting", np.ones(FLIGHT_POINT_COUNT))
+    ivc.add_output("data:propulsion:use_thrust_rate", np.arange(FLIGHT_POINT_COUNT) % 2)
+    ivc.add_output(
+        "data:propulsion:required_thrust_rate", np.linspace(0.5, 0.9, FLIGHT_POINT_COUNT)
+    )
+    ivc.add_output(
+        "data:propulsion:required_thrust",
+        np.linspace(3.0e4, 8.0e4, FLIGHT_POINT_COUNT),
+        units="N",
+    )
+    ivc.add_output("data:propulsion:max_thrust", 1.2e5, units="N")
+
+    problem = om.Problem()
+    problem.model.add_subsystem("ivc", ivc, promotes=["*"])
+    problem.model.add_subsystem("engine", component_class(**options), promotes=["*"])
+    problem.setup()
+    problem.run_model()
+    return problem
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"use_coloring": True},
+        {"partials_method": "cs"},
+        {"fd_workers": 2},
+    ],
+)
+def test_propulsion_component_partials(options):
+    problem = _get_problem(**options)
+
+    _SimpleEngine.call_count = 0
+    totals = problem.compute_totals(
+        ["data:propulsion:SFC", "data:propulsion:thrust"],
+        ["data:propulsion:mach", "data:propulsion:altitude", "data:propulsion:max_thrust"],
+    )
+    if options.get("use_coloring"):
+        # One call for reference point, one per flight input, one for max_thrust
+        assert _SimpleEngine.call_count == 8
+
+    altitude = problem["data:propulsion:altitude"]
+    max_thrust = problem["data:propulsion:max_thrust"] * (1.0 - 2.0e-5 * altitude)
+    thrust_rate = problem["data:propulsion:thrust_rate"]
+    regulated = np.arange(FLIGHT_POINT_COUNT) % 2 == 0
+
+    assert_allclose(
+        totals["data:propulsion:SFC", "data:propulsion:mach"],
+        np.diag(0.5e-5 / thrust_rate),
+        rtol=1.0e-4,
+        atol=1.0e-12,
+    )
+    assert_allclose(
+        np.diag(totals["data:propulsion:thrust", "data:propulsion:altitude"]),
+        np.where(regulated, 0.0, -2.0e-5 * problem["data:propulsion:max_thrust"] * thrust_rate),
+        rtol=1.0e-4,
+        atol=1.0e-4,
+    )
+    assert_allclose(
+        totals["data:propulsion:thrust", "data:propulsion:max_thrust"].ravel(),
+        np.where(regulated, 0.0, max_thrust / problem["data:propulsion:max_thrust"] * thrust_rate),
+        rtol=1.0e-4,
+        atol=1.0e-4,
+    )
+
+    problem.cleanup()
+    assert problem.model.engine._parallel_fd is None
+
+
+def test_propulsion_component_without_base_initialize():
+    problem = _get_problem(_EngineComponentWithOwnInitialize)
+    totals = problem.compute_totals(["data:propulsion:thrust"], ["data:propulsion:max_thrust"])
+    assert totals["data:propulsion:thrust", "data:propulsion:max_thrust"].shape == (
+        FLIGHT_POINT_COUNT,
+        1,
+    )
+    problem.cleanup()
+
+
+def _get_batch() -> FlightPoint:
+    return FlightPoint(
+        mach=np.linspace(0.2, 0.8, FLIGHT_POINT_COUNT),
+        altitude=np.linspace(0.0, 10000.0, FLIGHT_POINT_COUNT),
+        thrust_is_regulated=np.arange(FLIGHT_POINT_COUNT) % 2 == 0,
+        thrust_rate=np.linspace(0.5, 0.9, FLIGHT_POINT_COUNT),
+        thrust=np.linspace(3.0e4, 8.0e4, FLIGHT_POINT_COUNT),
+        name="batch",
+    )
+
+
+def test_compute_flight_points_batch():
+    vectorized_points = _get_batch()
+    _SimpleEngine.call_count = 0
+    FuelEngineSet(_SimpleEngine(1.2e5), 2).compute_flight_points_batch(vectorized_points)
+    assert _SimpleEngine.call_count == 1
+
+    scalar_points = _get_batch()
+    _SimpleEngine.call_count = 0
+    FuelEngineSet(_ScalarEngine(1.2e5), 2).compute_flight_points_batch(scalar_points)
+    assert _SimpleEngine.call_count == FLIGHT_POINT_COUNT
+
+    for name in ["thrust", "thrust_rate", "sfc"]:
+        assert np.shape(getattr(scalar_points, name)) == (FLIGHT_POINT_COUNT,)
+        assert_allclose(getattr(scalar_points, name), getattr(vectorized_points, name))
+    assert scalar_points.name == "batch"
+
+
+def test_batch_propulsion_adapter():
+    propulsion = BatchPropulsionAdapter(FuelEngineSet(_ScalarEngine(1.2e5), 2))
+
+    # Scalar flight points are directly sent to the model
+    flight_point = FlightPoint(
+        mach=0.5, altitude=0.0, thrust_is_regulated=False, thrust_rate=0.5, thrust=0.0
+    )
+    _SimpleEngine.call_count = 0
+    propulsion.compute_flight_points(flight_point)
+    assert _SimpleEngine.call_count == 1
+    assert_allclose(flight_point.thrust, 1.2e5)
+
+    # Array flight points are processed point by point by the non-vectorized model
+    flight_points = _get_batch()
+    _SimpleEngine.call_count = 0
+    propulsion.compute_flight_points(flight_points)
+    assert _SimpleEngine.call_count == FLIGHT_POINT_COUNT
+    assert_allclose(
+        propulsion.get_consumed_mass(flight_points, 1.0), flight_points.sfc * flight_points.thrust
+    )
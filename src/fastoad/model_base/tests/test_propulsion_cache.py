@@ -0,0 +1,103 @@
+"""
+Test module for propulsion_cache.py
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2022 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from copy import deepcopy
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from .test_propulsion import _SimpleEngine, _SimpleEngineWrapper, _get_batch
+from ..flight_point import FlightPoint
+from ..propulsion import FuelEngineSet
+from ..propulsion_cache import CachedPropulsion, cached_propulsion
+
+
+def test_cached_propulsion():
+    propulsion = CachedPropulsion(FuelEngineSet(_SimpleEngine(1.2e5), 2), max_size=2)
+    _SimpleEngine.call_count = 0
+
+    def compute(**kwargs):
+        values = dict(mach=0.5, altitude=3000.0, thrust=0.0, thrust_rate=0.0)
+        values.update(kwargs)
+        flight_point = FlightPoint(**values)
+        propulsion.compute_flight_points(flight_point)
+        return flight_point
+
+    reference = compute(thrust_is_regulated=True, thrust=1.0e5)
+    assert _SimpleEngine.call_count == 1
+
+    # A nearly identical flight point uses stored results, but keeps its thrust
+    flight_point = compute(thrust_is_regulated=True, thrust=1.0e5 + 1.0e-4)
+    assert _SimpleEngine.call_count == 1
+    assert flight_point.thrust == 1.0e5 + 1.0e-4
+    assert flight_point.thrust_rate == reference.thrust_rate
+    assert flight_point.sfc == reference.sfc
+
+    # Stored values are not affected by modifications of flight points
+    flight_point.sfc = 0.0
+    assert compute(thrust_is_regulated=True, thrust=1.0e5).sfc == reference.sfc
+
+    assert propulsion.hits == 2
+    assert propulsion.misses == 1
+    assert_allclose(propulsion.hit_rate, 2.0 / 3.0)
+
+    # Thrust rate is the key when thrust is not regulated
+    compute(thrust_is_regulated=False, thrust_rate=0.5)
+    compute(thrust_is_regulated=False, thrust_rate=0.5, thrust=2.0e5)
+    assert _SimpleEngine.call_count == 2
+
+    # Eviction of least recently used entry
+    assert len(propulsion) == 2
+    compute(thrust_is_regulated=False, thrust_rate=0.6)
+    assert len(propulsion) == 2
+    compute(thrust_is_regulated=True, thrust=1.0e5)
+    assert _SimpleEngine.call_count == 4
+
+    # Array values are not stored
+    flight_points = _get_batch()
+    expected = deepcopy(flight_points)
+    FuelEngineSet(_SimpleEngine(1.2e5), 2).compute_flight_points(expected)
+    propulsion.compute_flight_points(flight_points)
+    assert_allclose(flight_points.sfc, expected.sfc)
+    assert len(propulsion) == 2
+
+    propulsion.clear()
+    assert len(propulsion) == 0
+    assert propulsion.hit_rate == 0.0
+
+    # Output values are stored even if the model did not change them
+    reference = compute(thrust_is_regulated=False, thrust_rate=0.5)
+    propulsion.clear()
+    compute(thrust_is_regulated=False, thrust_rate=0.5, thrust=reference.thrust, sfc=reference.sfc)
+    flight_point = compute(thrust_is_regulated=False, thrust_rate=0.5)
+    assert propulsion.hits == 1
+    assert flight_point.thrust == reference.thrust
+    assert flight_point.sfc == reference.sfc
+
+
+def test_cached_propulsion_decorator():
+    @cached_propulsion(max_size=10)
+    class _CachedWrapper(_SimpleEngineWrapper):
+        pass
+
+    model = _CachedWrapper.get_model({"data:propulsion:max_thrust": 1.2e5})
+    assert isinstance(model, CachedPropulsion)
+    assert isinstance(model.propulsion, _SimpleEngine)
+    assert model.max_size == 10
+
+    with pytest.raises(TypeError):
+        cached_propulsion()(_SimpleEngine)
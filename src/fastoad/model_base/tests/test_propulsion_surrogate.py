@@ -0,0 +1,93 @@
+"""
+Test module for propulsion_surrogate.py
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2022 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from copy import deepcopy
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from fastoad.constants import EngineSetting
+from .test_propulsion import _SimpleEngine, _get_batch
+from ..flight_point import FlightPoint
+from ..propulsion import FuelEngineSet
+from ..propulsion_surrogate import TabulatedPropulsion
+
+
+@pytest.mark.parametrize("method", ["linear", "spline"])
+def test_tabulated_propulsion(method):
+    propulsion = FuelEngineSet(_SimpleEngine(1.2e5), 2)
+    surrogate = TabulatedPropulsion(
+        propulsion,
+        thrust_rate_values=np.linspace(0.1, 1.0, 37),
+        method=method,
+        estimate_errors=True,
+    )
+    # Thrust is multilinear with respect to flight conditions and thrust rate
+    rtol = 1.0e-6 if method == "linear" else 1.0e-2
+
+    # Scalar flight points, with regulated thrust or not
+    for flight_point in [
+        FlightPoint(
+            mach=0.5, altitude=3000.0, thrust_is_regulated=True, thrust=1.0e5, thrust_rate=0.0
+        ),
+        FlightPoint(
+            mach=0.5, altitude=3000.0, thrust_is_regulated=False, thrust=0.0, thrust_rate=0.7
+        ),
+    ]:
+        expected = deepcopy(flight_point)
+        propulsion.compute_flight_points(expected)
+        surrogate.compute_flight_points(flight_point)
+        assert np.ndim(flight_point.thrust_rate) == 0
+        assert_allclose(flight_point.thrust_rate, expected.thrust_rate, rtol=rtol)
+        assert_allclose(flight_point.thrust, expected.thrust, rtol=rtol)
+        assert_allclose(flight_point.sfc, expected.sfc, rtol=2.0e-2)
+
+    # Several flight points and engine settings
+    flight_points = _get_batch()
+    flight_points.engine_setting = np.where(
+        np.arange(len(flight_points.mach)) < 5, EngineSetting.CLIMB, EngineSetting.CRUISE
+    )
+    expected = deepcopy(flight_points)
+    propulsion.compute_flight_points(expected)
+    _SimpleEngine.call_count = 0
+    surrogate.compute_flight_points(flight_points)
+    # Sampling and error estimate for each new engine setting
+    assert _SimpleEngine.call_count == 4
+    assert_allclose(flight_points.thrust_rate, expected.thrust_rate, rtol=rtol)
+    assert_allclose(flight_points.thrust, expected.thrust, rtol=rtol)
+    assert_allclose(flight_points.sfc, expected.sfc, rtol=2.0e-2)
+    assert_allclose(
+        surrogate.get_consumed_mass(flight_points, 1.0), flight_points.sfc * flight_points.thrust
+    )
+
+    # Tables are reused
+    _SimpleEngine.call_count = 0
+    surrogate.compute_flight_points(flight_points)
+    assert _SimpleEngine.call_count == 0
+
+    assert set(surrogate.error_estimates) == {None, EngineSetting.CLIMB, EngineSetting.CRUISE}
+    errors = surrogate.error_estimates[EngineSetting.CRUISE]
+    if method == "linear":
+        assert errors["thrust"] < 1.0e-10
+    assert 0.0 < errors["sfc"] < 5.0e-2
+
+    # By default, errors are not estimated
+    surrogate = TabulatedPropulsion(propulsion, method=method)
+    _SimpleEngine.call_count = 0
+    surrogate.compute_flight_points(flight_points)
+    assert _SimpleEngine.call_count == 2
+    assert surrogate.error_estimates == {}
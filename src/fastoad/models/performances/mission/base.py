@@ -13,12 +13,14 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from abc import ABC, abstractmethod
+from copy import deepcopy
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List, Tuple
 
 import pandas as pd
 
 from fastoad.model_base import FlightPoint
+from .trajectory import TrajectoryBuffer
 
 
 class IFlightPart(ABC):
@@ -37,46 +39,140 @@ class IFlightPart(ABC):
                  :class:`~fastoad.model_base.flight_point.FlightPoint`
         """
 
+    def compute_into(self, start: FlightPoint, trajectory: TrajectoryBuffer):
+        """
+        Computes a flight sequence from provided start point, and appends obtained flight
+        points to `trajectory`.
+
+        If `trajectory` is not empty, `start` is expected to be a copy of its last flight
+        point. In such case, the computed start point is not appended again, but it is used
+        for completing values that are missing in this last flight point (simplistic flight
+        parts may provide more information about the start point).
+
+        This implementation uses :meth:`compute_from`. Flight parts that can write their
+        flight points directly into `trajectory` should overload it.
+
+        :param start: the initial flight point (see :meth:`compute_from`)
+        :param trajectory: the buffer where flight points are appended
+        """
+        _append_flight_points(self.compute_from(start), trajectory)
+
 
 @dataclass
 class FlightSequence(IFlightPart):
     """
     Defines and computes a flight sequence.
+
+    Flight parts of the sequence are computed into one shared
+    :class:`~fastoad.models.performances.mission.trajectory.TrajectoryBuffer`, so that
+    nested sequences do not have to assemble intermediate DataFrames.
     """
 
     def __post_init__(self):
         self._flight_sequence = []
+        self._part_boundaries = {}
 
     def compute_from(self, start: FlightPoint) -> pd.DataFrame:
-        parts = []
-        part_start = start
-        for part in self.flight_sequence:
-            flight_points = part.compute_from(part_start)
-            if len(parts) > 0 and len(flight_points) > 1:
-                # First point of the segment is omitted, as it is the last of previous segment.
-                #
-                # But sometimes (especially in the case of simplistic segments), the new first
-                # point may contain more information than the previous last one. In such case,
-                # it is interesting to complete the previous last one.
-                last_flight_points = parts[-1]
-                last_index = last_flight_points.index[-1]
-                for name in flight_points.columns:
-                    value = last_flight_points.loc[last_index, name]
-                    if not value:
-                        last_flight_points.loc[last_index, name] = flight_points.loc[0, name]
-
-                parts.append(flight_points.iloc[1:])
+        trajectory = TrajectoryBuffer()
+        self.compute_into(start, trajectory)
+        if len(trajectory) > 0:
+            return trajectory.to_dataframe()
 
-            else:
-                # But it is kept if the computed segment is the first one.
-                parts.append(flight_points)
+    def compute_into(self, start: FlightPoint, trajectory: TrajectoryBuffer):
+        self._part_boundaries = {}
+        self._compute_parts(
+            self.flight_sequence, start, trajectory, self._get_start_row(trajectory)
+        )
 
-            part_start = FlightPoint.create(flight_points.iloc[-1])
+    @property
+    def part_boundaries(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Row indices of first and last flight points of each named flight part in the result of
+        last computation, with flight part names as keys. Sub-parts of sub-parts are included.
 
-        if parts:
-            return pd.concat(parts).reset_index(drop=True)
+        Row 0 is the start point of the sequence, and the first flight point of a flight part
+        is the last one of the previous flight part.
+        Boundaries of flight parts that have the same name (e.g. segments that get the name
+        of their phase) are merged.
+        """
+        return self._part_boundaries
+
+    def _add_part_boundaries(self, name: str, start: int, end: int):
+        """Adds boundaries of a flight part, merged with the ones of same-named parts."""
+        if name in self._part_boundaries:
+            previous_start, previous_end = self._part_boundaries[name]
+            start, end = min(start, previous_start), max(end, previous_end)
+        self._part_boundaries[name] = (start, end)
+
+    def _compute_parts(
+        self,
+        flight_parts: List[IFlightPart],
+        start: FlightPoint,
+        trajectory: TrajectoryBuffer,
+        start_row: int,
+    ):
+        """
+        Computes provided flight parts sequentially into `trajectory`, and adds their
+        boundaries to :attr:`part_boundaries`.
+
+        :param flight_parts: the IFlightPart instances to compute
+        :param start: the start point of first flight part
+        :param trajectory: the buffer where flight points are appended
+        :param start_row: index in `trajectory` of the start point of the sequence, that is
+                          row 0 in :attr:`part_boundaries`
+        """
+        part_start = start
+        for part in flight_parts:
+            size = len(trajectory)
+            part_start_row = self._get_start_row(trajectory) - start_row
+            trajectory.keep(part_start_row + start_row)
+            if isinstance(part, IFlightPart):
+                part.compute_into(part_start, trajectory)
+            else:
+                # Flight parts that do not derive from IFlightPart may provide only
+                # compute_from().
+                _append_flight_points(part.compute_from(part_start), trajectory)
+
+            if 0 < size == len(trajectory) and part is not self.flight_sequence[0]:
+                # The flight part provided only its start point. It is kept as a separate
+                # flight point, unless the flight part is the first one of the sequence.
+                flight_point = deepcopy(trajectory[-1])
+                if getattr(part, "name", ""):
+                    flight_point.name = part.name
+                trajectory.append(flight_point)
+            part_end_row = len(trajectory) - 1 - start_row
+            trajectory.keep(part_end_row + start_row)
+
+            if isinstance(part, FlightSequence):
+                for name, (sub_start, sub_end) in part.part_boundaries.items():
+                    self._add_part_boundaries(
+                        name, sub_start + part_start_row, sub_end + part_start_row
+                    )
+            if getattr(part, "name", ""):
+                self._add_part_boundaries(part.name, part_start_row, part_end_row)
+
+            part_start = deepcopy(trajectory[-1])
+
+    @staticmethod
+    def _get_start_row(trajectory: TrajectoryBuffer) -> int:
+        """
+        :return: index in `trajectory` of the start point of next computed flight part
+        """
+        return max(len(trajectory) - 1, 0)
 
     @property
     def flight_sequence(self) -> List[IFlightPart]:
         """List of IFlightPart instances that should be run sequentially."""
         return self._flight_sequence
+
+
+def _append_flight_points(flight_points: pd.DataFrame, trajectory: TrajectoryBuffer):
+    """
+    Appends flight points of a flight part to `trajectory`, as described in
+    :meth:`IFlightPart.compute_into`.
+    """
+    if len(trajectory) > 0:
+        trajectory.complete(-1, FlightPoint.create(flight_points.iloc[0]))
+        trajectory.append_dataframe(flight_points.iloc[1:])
+    else:
+        trajectory.append_dataframe(flight_points)
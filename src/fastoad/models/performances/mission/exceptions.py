@@ -31,3 +31,9 @@ class FastFlightSegmentIncompleteFlightPoint(FastError):
     """
     Raised when a segment computation encounters a FlightPoint instance without needed parameters.
     """
+
+
+class FastMissionDependencyError(FastError):
+    """
+    Raised when missions that should be computed concurrently need outputs of each other.
+    """
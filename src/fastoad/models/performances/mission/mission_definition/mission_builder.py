@@ -15,8 +15,9 @@ Mission generator.
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from collections import OrderedDict
-from copy import deepcopy
-from typing import Dict, List, Mapping, Optional, Tuple, Union
+from copy import copy, deepcopy
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 
 import openmdao.api as om
 import pandas as pd
@@ -50,6 +51,7 @@ BASE_UNITS = {
     "range": "m",
     "time": "s",
     "ground_distance": "m",
+    "maximum_time_step": "s",
 }
 
 
@@ -71,6 +73,11 @@ class MissionBuilder:
                                set before calling :meth:`build`
         """
         super().__init__()
+
+        # When not None, built flight segments and routes are recorded here (see compile())
+        self._segment_slots: Optional[List[SegmentSlots]] = None
+        self._route_slots: Optional[List[Tuple[RangedRoute, Optional[str]]]] = None
+
         self.definition = mission_definition
         self._base_kwargs = {"reference_area": reference_area, "propulsion": propulsion}
 
@@ -92,6 +99,9 @@ class MissionBuilder:
 
         self._structure = self._build_structure()
 
+        # Compiled missions (see get_mission()), with mission names as keys.
+        self._templates: Dict[str, MissionTemplate] = {}
+
     @property
     def propulsion(self) -> IPropulsion:
         """Propulsion model for performance computation."""
@@ -127,6 +137,51 @@ class MissionBuilder:
         self._propagate_name(mission, mission.name)
         return mission
 
+    def compile(
+        self, inputs: Optional[Mapping] = None, mission_name: str = None
+    ) -> "MissionTemplate":
+        """
+        Builds the flight sequence from definition file, and keeps track of the parameters
+        that come from `inputs`.
+
+        The returned template provides the same flight sequence instance for other inputs
+        (see :meth:`MissionTemplate.bind`), without processing the mission definition again.
+
+        :param inputs: if provided, any input parameter that is a string which matches
+                       a key of `inputs` will be replaced by the corresponding value
+        :param mission_name: mission name (can be omitted if only one mission is defined)
+        :return: the MissionTemplate instance
+        """
+        self._segment_slots = []
+        self._route_slots = []
+        try:
+            mission = self.build(inputs, mission_name)
+            return MissionTemplate(mission, self._segment_slots, self._route_slots)
+        finally:
+            self._segment_slots = None
+            self._route_slots = None
+
+    def get_mission(self, inputs: Mapping, mission_name: str = None) -> FlightSequence:
+        """
+        Provides the flight sequence for provided inputs, as :meth:`build` does, but the
+        mission is compiled only once (see :meth:`compile`). Next calls only bind the new
+        input values to the same flight sequence instance.
+
+        :param inputs: any input parameter that is a string which matches a key of `inputs`
+                       will be replaced by the corresponding value
+        :param mission_name: mission name (can be omitted if only one mission is defined)
+        :return: the flight sequence, that is valid until next call
+        """
+        if mission_name is None:
+            mission_name = self.get_unique_mission_name()
+
+        template = self._templates.get(mission_name)
+        if template is None:
+            template = self._templates[mission_name] = self.compile(inputs, mission_name)
+            return template.mission
+
+        return template.bind(inputs, **self._base_kwargs)
+
     def get_route_ranges(
         self, inputs: Optional[Mapping] = None, mission_name: str = None
     ) -> List[float]:
@@ -140,13 +195,22 @@ class MissionBuilder:
         routes = self.build(inputs, mission_name).flight_sequence
         return [route.flight_distance for route in routes if isinstance(route, RangedRoute)]
 
-    def get_reserve(self, flight_points: pd.DataFrame, mission_name: str = None) -> float:
+    def get_reserve(
+        self,
+        flight_points: pd.DataFrame,
+        mission_name: str = None,
+        part_boundaries: Optional[Mapping[str, Tuple[int, int]]] = None,
+    ) -> float:
         """
         Computes the reserve fuel according to definition in mission input file.
 
         :param flight_points: the dataframe returned by compute_from() method of the
                               instance returned by :meth:`build`
         :param mission_name: mission name (can be omitted if only one mission is defined)
+        :param part_boundaries: row indices of first and last points of flight parts in
+                                `flight_points` (see FlightSequence.part_boundaries). If not
+                                provided, flight points of the reference part are identified
+                                by their name.
         :return: the reserve fuel mass in kg, or 0.0 if no reserve is defined.
         """
 
@@ -158,10 +222,13 @@ class MissionBuilder:
             ref_name = last_part_spec[RESERVE_TAG]["ref"]
             multiplier = last_part_spec[RESERVE_TAG]["multiplier"]
 
-            route_points = flight_points.loc[
-                flight_points.name.str.contains("%s:%s" % (mission_name, ref_name))
-            ]
-            consumed_mass = route_points.mass.iloc[0] - route_points.mass.iloc[-1]
+            ref_part_name = "%s:%s" % (mission_name, ref_name)
+            if part_boundaries is not None:
+                start, end = part_boundaries[ref_part_name]
+                consumed_mass = flight_points.mass.iloc[start] - flight_points.mass.iloc[end]
+            else:
+                route_points = flight_points.loc[flight_points.name.str.contains(ref_part_name)]
+                consumed_mass = route_points.mass.iloc[0] - route_points.mass.iloc[-1]
             return consumed_mass * multiplier
 
         return 0.0
@@ -376,6 +443,11 @@ class MissionBuilder:
             route = RangedRoute(
                 climb_phases, cruise_phase, descent_phases, flight_distance=flight_range
             )
+            if self._route_slots is not None:
+                range_input = route_structure["range"]
+                self._route_slots.append(
+                    (route, range_input if isinstance(range_input, str) else None)
+                )
         else:
             route = FlightSequence()
             route.flight_sequence.extend(climb_phases)
@@ -419,15 +491,21 @@ class MissionBuilder:
             {name: value for name, value in segment_definition.items() if name != tag}
         )
         part_kwargs.update(self._base_kwargs)
+        polar_definition = target_inputs = None
         for key, value in part_kwargs.items():
             if key == "polar":
                 polar = {}
                 for coeff in ["CL", "CD"]:
                     polar[coeff] = value[coeff]
+                if self._get_used_inputs(polar, inputs):
+                    polar_definition = dict(polar)
                 self._replace_by_inputs(polar, inputs)
                 value = Polar(polar["CL"], polar["CD"])
             elif key == "target":
                 if not isinstance(value, FlightPoint):
+                    # A copy is used, as the definition must keep the input names
+                    value = dict(value)
+                    target_inputs = self._get_used_inputs(value, inputs)
                     self._replace_by_inputs(value, inputs)
                     value = FlightPoint(**value)
 
@@ -436,9 +514,26 @@ class MissionBuilder:
         if "engine_setting" in part_kwargs:
             part_kwargs["engine_setting"] = EngineSetting.convert(part_kwargs["engine_setting"])
 
+        field_inputs = self._get_used_inputs(part_kwargs, inputs)
         self._replace_by_inputs(part_kwargs, inputs)
 
+        # The target is kept as built, because segments modify it.
+        target = copy(part_kwargs.get("target"))
         segment = segment_class(**part_kwargs)
+
+        if self._segment_slots is not None:
+            if not (field_inputs or target_inputs or polar_definition):
+                # The segment will not have to be re-initialized.
+                target = copy(segment.target)
+            self._segment_slots.append(
+                SegmentSlots(
+                    segment,
+                    target=target,
+                    field_inputs=field_inputs,
+                    target_inputs=target_inputs or {},
+                    polar_definition=polar_definition,
+                )
+            )
         return segment
 
     def _propagate_name(self, part: IFlightPart, new_name: str):
@@ -496,3 +591,113 @@ class MissionBuilder:
             for key, value in parameter_definition.items():
                 if isinstance(value, str) and value in inputs:
                     parameter_definition[key] = inputs[value]
+
+    @staticmethod
+    def _get_used_inputs(parameter_definition: dict, inputs: Optional[Mapping]) -> Dict[str, str]:
+        """
+        :param parameter_definition:
+        :param inputs:
+        :return: the keys of `parameter_definition` whose value will be replaced by
+                 :meth:`_replace_by_inputs`, with the matching input names as values
+        """
+        if not inputs:
+            return {}
+        return {
+            key: value
+            for key, value in parameter_definition.items()
+            if isinstance(value, str) and value in inputs
+        }
+
+
+@dataclass
+class SegmentSlots:
+    """
+    Parameters of a built flight segment that come from inputs.
+    """
+
+    #: The flight segment instance.
+    segment: FlightSegment
+
+    #: The segment target as it was before computation. If the segment has parameters that
+    #: come from inputs, it is the target as it was before segment instantiation.
+    target: Optional[FlightPoint] = None
+
+    #: Segment fields that are set from inputs, with input names as values.
+    field_inputs: Dict[str, str] = field(default_factory=dict)
+
+    #: Target fields that are set from inputs, with input names as values.
+    target_inputs: Dict[str, str] = field(default_factory=dict)
+
+    #: Definition of polar ("CL" and "CD" as keys, values or input names as values), if
+    #: the polar depends on inputs.
+    polar_definition: Optional[Dict[str, Any]] = None
+
+    def bind(self, inputs: Mapping, base_kwargs: Mapping):
+        """
+        Sets the segment parameters from provided inputs, and resets the segment target.
+
+        :param inputs: values of inputs, with input names as keys
+        :param base_kwargs: values of other parameters that are common to all segments
+                            (propulsion, reference area)
+        """
+        segment = self.segment
+        if self.target is not None:
+            target = copy(self.target)
+            for name, input_name in self.target_inputs.items():
+                setattr(target, name, inputs[input_name])
+            segment.target = target
+        for name, input_name in self.field_inputs.items():
+            setattr(segment, name, inputs[input_name])
+        if self.polar_definition is not None:
+            polar = dict(self.polar_definition)
+            MissionBuilder._replace_by_inputs(polar, inputs)
+            segment.polar = Polar(polar["CL"], polar["CD"])
+        for name, value in base_kwargs.items():
+            setattr(segment, name, value)
+
+        if self.field_inputs or self.target_inputs or self.polar_definition:
+            # Some segments adapt their target, according to their parameters, at
+            # instantiation.
+            segment.__post_init__()
+
+
+@dataclass
+class MissionTemplate:
+    """
+    A built mission, along with its parameters that come from inputs.
+
+    Instances are provided by :meth:`MissionBuilder.compile`.
+    """
+
+    #: The flight sequence of the mission.
+    mission: FlightSequence
+
+    #: Input-dependent parameters of flight segments.
+    segment_slots: List[SegmentSlots] = field(default_factory=list)
+
+    #: RangedRoute instances, with the name of the input that provides their flight
+    #: distance (None if flight distance is a constant).
+    route_slots: List[Tuple[RangedRoute, Optional[str]]] = field(default_factory=list)
+
+    def bind(
+        self, inputs: Mapping, *, propulsion: IPropulsion = None, reference_area: float = None
+    ) -> FlightSequence:
+        """
+        Sets provided input values in the flight sequence.
+
+        Segment targets are reset.
+
+        :param inputs: values of inputs, with input names as keys
+        :param propulsion: propulsion model for all segments
+        :param reference_area: reference area for aerodynamic polar of all segments
+        :return: the flight sequence (:attr:`mission`)
+        """
+        base_kwargs = {"propulsion": propulsion, "reference_area": reference_area}
+        for slots in self.segment_slots:
+            slots.bind(inputs, base_kwargs)
+
+        for route, range_input in self.route_slots:
+            if range_input is not None:
+                route.flight_distance = inputs[range_input]
+
+        return self.mission
@@ -14,11 +14,17 @@ Schema for mission definition files.
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import hashlib
 import json
+import os
+import os.path as pth
+import pickle
 from collections import OrderedDict
-from importlib.resources import open_text
+from copy import deepcopy
+from functools import lru_cache
+from importlib.resources import read_text
 from os import PathLike
-from typing import Union
+from typing import Dict, Optional, Tuple, Union
 
 from ensure import Ensure
 from jsonschema import validate
@@ -42,9 +48,16 @@ ROUTE_DEFINITIONS_TAG = "routes"
 PHASE_DEFINITIONS_TAG = "phases"
 POLAR_TAG = "polar"
 
+# Validated file contents, with (file path, modification time, content hash) as keys.
+_DEFINITION_CACHE: Dict[Tuple[str, int, str], dict] = {}
+
 
 class MissionDefinition(dict):
-    def __init__(self, file_path: Union[str, PathLike] = None):
+    def __init__(
+        self,
+        file_path: Union[str, PathLike] = None,
+        cache_folder: Optional[Union[str, PathLike]] = None,
+    ):
         """
         Class for reading a mission definition from a YAML file.
 
@@ -52,31 +65,113 @@ class MissionDefinition(dict):
         :meth:`load`.
 
         :param file_path: path of YAML file to read.
+        :param cache_folder: if provided, validated file contents are also stored in this
+                             folder (see :meth:`load`).
         """
         super().__init__()
         if file_path:
-            self.load(file_path)
+            self.load(file_path, cache_folder)
 
-    def load(self, file_path: Union[str, PathLike]):
+    def load(
+        self,
+        file_path: Union[str, PathLike],
+        cache_folder: Optional[Union[str, PathLike]] = None,
+    ):
         """
         Loads a mission definition from provided file path.
 
         Any existing definition will be overwritten.
 
+        Parsing and validation of a file are done only once per process, as long as the
+        file is not modified: validated contents are kept in memory, with file path,
+        modification time and content hash as key.
+
+        If `cache_folder` is provided, validated contents are also stored in this folder,
+        so that they can be reused in other processes. Files in this folder are identified
+        by the hash of file content and of the JSON schema.
+
         :param file_path: path of YAML file to read.
+        :param cache_folder: folder for storing validated file contents.
         """
         self.clear()
+
+        file_path = pth.abspath(file_path)
+        modification_time = os.stat(file_path).st_mtime_ns
+        with open(file_path, "rb") as yaml_file:
+            content = yaml_file.read()
+        content_hash = hashlib.sha256(content).hexdigest()
+
+        key = (file_path, modification_time, content_hash)
+        data = _DEFINITION_CACHE.get(key)
+        if data is None:
+            cache_file_path = None
+            if cache_folder:
+                cache_file_path = self._get_cache_file_path(cache_folder, content_hash)
+                data = self._read_cache_file(cache_file_path)
+            if data is None:
+                data = self._parse(content)
+                if cache_file_path:
+                    self._write_cache_file(cache_file_path, data)
+
+            for previous_key in [item for item in _DEFINITION_CACHE if item[0] == file_path]:
+                del _DEFINITION_CACHE[previous_key]
+            _DEFINITION_CACHE[key] = data
+
+        # A copy is used so that modifications of this instance do not alter the cache.
+        self.update(deepcopy(data))
+
+    @classmethod
+    def _parse(cls, content: bytes) -> dict:
+        """
+        Parses and validates provided YAML content.
+
+        :param content: file content
+        :return: the validated content
+        """
         yaml = YAML()
+        data = yaml.load(content)
+
+        validate(data, _get_json_schema())
+
+        cls._validate(data)
+
+        # Content is converted to plain Python containers, that are much faster to copy.
+        return _to_builtin_types(data)
 
-        with open(file_path) as yaml_file:
-            data = yaml.load(yaml_file)
+    @staticmethod
+    def _get_cache_file_path(cache_folder: Union[str, PathLike], content_hash: str) -> str:
+        """
+        :return: path of the file that stores validated content in `cache_folder`
+        """
+        schema_hash = hashlib.sha256(read_text(resources, JSON_SCHEMA_NAME).encode()).hexdigest()
+        return pth.join(cache_folder, f"{content_hash[:32]}_{schema_hash[:16]}.pickle")
+
+    @staticmethod
+    def _read_cache_file(cache_file_path: str) -> Optional[dict]:
+        """
+        :return: content stored in provided file, or None if file cannot be read
+        """
+        if not pth.isfile(cache_file_path):
+            return None
+        try:
+            with open(cache_file_path, "rb") as cache_file:
+                return pickle.load(cache_file)
+        except (OSError, pickle.PickleError, EOFError, AttributeError, ImportError):
+            return None
 
-        with open_text(resources, JSON_SCHEMA_NAME) as json_file:
-            json_schema = json.loads(json_file.read())
-        validate(data, json_schema)
+    @staticmethod
+    def _write_cache_file(cache_file_path: str, data: dict):
+        """
+        Stores provided content in provided file.
 
-        self._validate(data)
-        self.update(data)
+        The file is written under a temporary name and then renamed, so that processes
+        that share the cache folder never read an incomplete file.
+        """
+        os.makedirs(pth.dirname(cache_file_path), exist_ok=True)
+        temp_file_path = f"{cache_file_path}.{os.getpid()}.tmp"
+        with open(temp_file_path, "wb") as cache_file:
+            pickle.dump(data, cache_file)
+        os.replace(temp_file_path, cache_file_path)
 
     @classmethod
     def _validate(cls, content: dict):
@@ -135,3 +230,23 @@ class MissionDefinition(dict):
             polar_def = struct[POLAR_TAG]
             if isinstance(polar_def, str) and ":" in polar_def:
                 struct[POLAR_TAG] = OrderedDict({"CL": polar_def + ":CL", "CD": polar_def + ":CD"})
+
+
+@lru_cache(maxsize=None)
+def _get_json_schema() -> dict:
+    """
+    :return: the JSON schema for mission definition files
+    """
+    return json.loads(read_text(resources, JSON_SCHEMA_NAME))
+
+
+def _to_builtin_types(item):
+    """
+    :return: provided item where dicts and lists (e.g. provided by YAML parser) are
+             recursively converted to dict and list instances
+    """
+    if isinstance(item, dict):
+        return {key: _to_builtin_types(value) for key, value in item.items()}
+    if isinstance(item, list):
+        return [_to_builtin_types(value) for value in item]
+    return item
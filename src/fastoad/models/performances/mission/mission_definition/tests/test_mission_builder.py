@@ -192,3 +192,55 @@ def test_get_flight_ranges():
 
     assert_allclose(mission_builder.get_route_ranges(inputs, "sizing"), [8000.0e3, 926.0e3])
     assert_allclose(mission_builder.get_route_ranges(inputs, "operational"), [500.0e3])
+
+
+def test_get_mission():
+    mission_definition = MissionDefinition(pth.join(DATA_FOLDER_PATH, "mission.yml"))
+    mission_builder = MissionBuilder(
+        mission_definition, propulsion=Mock(IPropulsion), reference_area=100.0
+    )
+
+    cl = np.linspace(0.0, 1.0, 11)
+    cd = 0.5 * cl ** 2
+
+    inputs = {
+        "data:TLAR:cruise_mach": 0.78,
+        "data:mission:sizing:main:range": 8000.0e3,
+        "data:mission:sizing:diversion:range": 926.0e3,
+        "data:aerodynamics:aircraft:cruise:CD": cd,
+        "data:aerodynamics:aircraft:cruise:CL": cl,
+        "data:aerodynamics:aircraft:takeoff:CD": cd,
+        "data:aerodynamics:aircraft:takeoff:CL": cl,
+        "data:mission:sizing:holding:duration": 2000.0,
+        "data:mission:sizing:taxi_in:duration": 300.0,
+        "data:mission:sizing:taxi_in:thrust_rate": 0.5,
+    }
+    mission = mission_builder.get_mission(inputs, "sizing")
+    main_route = mission.flight_sequence[0]
+    climb2 = main_route.flight_sequence[0].flight_sequence[2]
+    taxi_in = mission.flight_sequence[3].flight_sequence[0]
+    constant_polar = main_route.flight_sequence[0].flight_sequence[0].polar
+
+    # Targets can be modified by computation
+    climb2.target.altitude = 1000.0
+
+    new_inputs = dict(inputs)
+    new_inputs["data:mission:sizing:main:range"] = 5000.0e3
+    new_inputs["data:aerodynamics:aircraft:takeoff:CD"] = 2.0 * cd
+    new_inputs["data:mission:sizing:taxi_in:duration"] = 200.0
+    new_inputs["data:mission:sizing:taxi_in:thrust_rate"] = 0.3
+    new_propulsion = Mock(IPropulsion)
+    mission_builder.propulsion = new_propulsion
+
+    assert mission_builder.get_mission(new_inputs, "sizing") is mission
+    built_mission = mission_builder.build(new_inputs, "sizing")
+    built_climb2 = built_mission.flight_sequence[0].flight_sequence[0].flight_sequence[2]
+    built_taxi_in = built_mission.flight_sequence[3].flight_sequence[0]
+
+    assert main_route.flight_distance == 5000.0e3
+    assert climb2.target == built_climb2.target
+    assert climb2.propulsion is new_propulsion
+    assert_allclose(climb2.polar.cd(), 2.0 * cd)
+    assert taxi_in.target == built_taxi_in.target
+    assert taxi_in.thrust_rate == 0.3
+    assert main_route.flight_sequence[0].flight_sequence[0].polar is constant_polar
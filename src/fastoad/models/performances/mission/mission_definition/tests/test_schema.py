@@ -13,7 +13,9 @@
 
 import os.path as pth
 from collections import OrderedDict
+from shutil import copyfile
 
+from .. import schema
 from ..schema import MissionDefinition
 
 DATA_FOLDER_PATH = pth.join(pth.dirname(__file__), "data")
@@ -239,3 +241,44 @@ def _get_expected_dict():
             },
         },
     }
+
+
+def test_schema_cache(tmp_path, monkeypatch):
+    file_path = tmp_path / "mission.yml"
+    copyfile(pth.join(DATA_FOLDER_PATH, "mission.yml"), file_path)
+    cache_folder = tmp_path / "cache"
+
+    parse_count = 0
+    original_parse = MissionDefinition._parse
+
+    def _parse(cls, content):
+        nonlocal parse_count
+        parse_count += 1
+        return original_parse(content)
+
+    monkeypatch.setattr(MissionDefinition, "_parse", classmethod(_parse))
+
+    definition = MissionDefinition(file_path, cache_folder)
+    assert parse_count == 1
+    assert len(list(cache_folder.iterdir())) == 1
+
+    # Loaded again from memory. Modifying a definition does not alter the cache.
+    definition["phases"].clear()
+    assert MissionDefinition(file_path) == MissionDefinition(
+        pth.join(DATA_FOLDER_PATH, "mission.yml")
+    )
+    assert MissionDefinition(file_path)["phases"]
+    assert parse_count == 1
+
+    # Loaded again from cache folder
+    schema._DEFINITION_CACHE.clear()
+    parse_count = 0
+    assert MissionDefinition(file_path, cache_folder)["phases"]
+    assert parse_count == 0
+
+    # Modified file is loaded again
+    with open(file_path, "a") as yaml_file:
+        yaml_file.write("\n# Modified\n")
+    MissionDefinition(file_path, cache_folder)
+    assert parse_count == 1
+    assert len(list(cache_folder.iterdir())) == 2
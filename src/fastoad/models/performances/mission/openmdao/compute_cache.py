@@ -0,0 +1,214 @@
+"""
+Cache for results of mission computations.
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2022 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import atexit
+import hashlib
+import logging
+import os
+import os.path as pth
+import pickle
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+_LOGGER = logging.getLogger(__name__)  # Logger for this module
+
+# Caches with a file path, to be saved when the interpreter exits.
+_CACHES_TO_SAVE = weakref.WeakSet()
+
+
+@atexit.register
+def _save_caches():
+    for cache in list(_CACHES_TO_SAVE):
+        cache.save()
+
+
+@dataclass
+class CacheEntry:
+    """Stored result of a computation."""
+
+    #: The input vector of the computation.
+    input_values: np.ndarray
+
+    #: Output values, with variable names as keys.
+    outputs: Dict[str, np.ndarray]
+
+    #: Computed flight points.
+    flight_points: pd.DataFrame
+
+
+class ComputeCache:
+    def __init__(
+        self,
+        max_size: int,
+        tolerance: float = 0.0,
+        file_path: str = None,
+        signature: Hashable = None,
+        save_interval: int = 0,
+    ):
+        """
+        Least-recently-used storage of computation results, with input vector as key.
+
+        Input vectors are identified by a hash of their values. If :attr:`tolerance` is
+        not zero, a stored entry is also used if its input values match the requested ones
+        with this relative tolerance.
+
+        If a file path is provided, the cache is loaded from this file, if it exists. New
+        entries are written in the file by :meth:`save`, that is called when the interpreter
+        exits, and also after each `save_interval` added entries, if `save_interval` is not
+        zero. Only the process that has created the cache writes the file (processes that get
+        a copy of the cache, e.g. for parallel finite differences, do not).
+
+        :param max_size: maximum number of stored entries. When exceeded, the least recently
+                         used entry is removed.
+        :param tolerance: relative tolerance for matching input values
+        :param file_path: path of the file for storing the cache between runs
+        :param signature: any value that identifies the computation. If the loaded file has
+                          another signature, its content is ignored.
+        :param save_interval: if not zero, the file is updated each time this number of
+                              entries has been added since last save
+        """
+        self.max_size = max_size
+        self.tolerance = tolerance
+        self.file_path = file_path
+        self.signature = signature
+        self.save_interval = save_interval
+
+        #: Number of requests that found a stored entry.
+        self.hits = 0
+        #: Number of requests that found no stored entry.
+        self.misses = 0
+
+        self._entries: Dict[str, CacheEntry] = OrderedDict()
+
+        # Number of entries added since last save or load
+        self._unsaved_count = 0
+        self._owner_pid = os.getpid()
+
+        if self.file_path:
+            if pth.exists(self.file_path):
+                self.load()
+            _CACHES_TO_SAVE.add(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, input_values: np.ndarray, use_tolerance=True) -> Optional[CacheEntry]:
+        """
+        Provides the stored entry that matches provided input values.
+
+        :param input_values: the input vector
+        :param use_tolerance: if False, only an exact match is searched
+        :return: the stored entry, or None if there is no match
+        """
+        key = self._get_key(input_values)
+        entry = self._entries.get(key)
+
+        if entry is None and use_tolerance and self.tolerance > 0.0:
+            for candidate_key, candidate in reversed(self._entries.items()):
+                if candidate.input_values.shape == input_values.shape and np.allclose(
+                    input_values, candidate.input_values, rtol=self.tolerance, atol=0.0
+                ):
+                    key, entry = candidate_key, candidate
+                    break
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(
+        self,
+        input_values: np.ndarray,
+        outputs: Dict[str, np.ndarray],
+        flight_points: pd.DataFrame,
+    ):
+        """
+        Stores a computation result.
+
+        Provided values are copied.
+
+        :param input_values: the input vector
+        :param outputs: output values, with variable names as keys
+        :param flight_points: computed flight points
+        """
+        key = self._get_key(input_values)
+        self._entries[key] = CacheEntry(
+            np.array(input_values),
+            {name: np.array(value) for name, value in outputs.items()},
+            flight_points.copy(),
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+        self._unsaved_count += 1
+        if 0 < self.save_interval <= self._unsaved_count:
+            self.save()
+
+    def clear(self):
+        """Removes all stored entries and resets counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def save(self):
+        """
+        Writes stored entries in :attr:`file_path`, if entries have been added since last
+        save and if current process is the one that has created the cache.
+
+        The file is written under a temporary name and then renamed, so that the file is
+        never incomplete.
+        """
+        if not self.file_path or self._unsaved_count == 0 or os.getpid() != self._owner_pid:
+            return
+
+        os.makedirs(pth.dirname(pth.abspath(self.file_path)), exist_ok=True)
+        temp_file_path = f"{self.file_path}.{os.getpid()}.tmp"
+        with open(temp_file_path, "wb") as cache_file:
+            pickle.dump((self.signature, list(self._entries.values())), cache_file)
+        os.replace(temp_file_path, self.file_path)
+        self._unsaved_count = 0
+
+    def load(self):
+        """Reads stored entries from :attr:`file_path`."""
+        try:
+            with open(self.file_path, "rb") as cache_file:
+                signature, entries = pickle.load(cache_file)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError) as exc:
+            _LOGGER.warning('Could not read computation cache "%s": %s', self.file_path, exc)
+            return
+
+        if signature != self.signature:
+            _LOGGER.info('Ignored computation cache "%s" (not the same model).', self.file_path)
+            return
+
+        self._entries.clear()
+        for entry in entries[-self.max_size :]:
+            self._entries[self._get_key(entry.input_values)] = entry
+        self._unsaved_count = 0
+
+    @staticmethod
+    def _get_key(input_values: np.ndarray) -> str:
+        values = np.ascontiguousarray(input_values, dtype=float)
+        return hashlib.sha1(values.tobytes()).hexdigest()
@@ -17,19 +17,24 @@ OpenMDAO component for time-step computation of missions.
 import logging
 import os.path as pth
 from collections import namedtuple
+from functools import partial
 from importlib.resources import path
 from os import makedirs
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import openmdao.api as om
 import pandas as pd
 from scipy.constants import foot
 
+from fastoad._utils.parallel_fd import ParallelFiniteDifference
 from fastoad.model_base import FlightPoint
-from fastoad.model_base.propulsion import IOMPropulsionWrapper
+from fastoad.model_base.propulsion import IOMPropulsionWrapper, IPropulsion
+from fastoad.model_base.propulsion_surrogate import TabulatedPropulsion
 from fastoad.module_management.constants import ModelDomain
 from fastoad.module_management.service_registry import RegisterOpenMDAOSystem, RegisterPropulsion
 from . import resources
+from .compute_cache import ComputeCache
 from .mission_wrapper import MissionWrapper
 from ..mission_definition.schema import MissionDefinition
 from ..polar import Polar
@@ -77,6 +82,14 @@ class Mission(om.Group):
             allow_none=True,
             desc="The mission name. Required if mission file defines several missions.",
         )
+        self.options.declare(
+            "definition_cache_folder",
+            default=None,
+            types=str,
+            allow_none=True,
+            desc="If provided, validated contents of mission files are stored in this folder\n"
+            "and reused in next runs, as long as mission files are not modified.",
+        )
         self.options.declare(
             "use_initializer_iteration",
             default=True,
@@ -123,6 +136,68 @@ class Mission(om.Group):
             types=str,
             desc="Defines the name of the variable for providing aircraft reference surface area.",
         )
+        self.options.declare(
+            "cache_size",
+            default=0,
+            types=int,
+            desc="If not zero, results of mission computations are stored for this number of\n"
+            "input sets, and reused when mission is computed again with the same inputs.",
+        )
+        self.options.declare(
+            "cache_tolerance",
+            default=0.0,
+            types=float,
+            desc="Relative tolerance on input values for reusing stored results.\n"
+            "Not used for finite-difference computations. Not used if cache_size is zero.",
+        )
+        self.options.declare(
+            "cache_file",
+            default="",
+            types=str,
+            desc="If provided, stored results will be saved in this file and reused in next runs.\n"
+            "The file is written at cleanup of the problem and when Python exits.\n"
+            "Not used if cache_size is zero.",
+        )
+        self.options.declare(
+            "separate_taxi_takeoff_partials",
+            default=False,
+            types=bool,
+            desc="If True, approximation of partials on mission computation is not done for\n"
+            "taxi-out and takeoff inputs that are not used in mission definition. Their\n"
+            "partials are computed separately, and only for outputs that depend on them.",
+        )
+        self.options.declare(
+            "partials_method",
+            default="fd",
+            values=["fd", "cs"],
+            desc='Method for approximating partials of mission computation: "fd" for finite\n'
+            'differences, "cs" for complex step (needs a complex-safe propulsion model).',
+        )
+        self.options.declare(
+            "fd_workers",
+            default=0,
+            types=int,
+            desc="If greater than 1, finite differences of mission computation are computed in\n"
+            "parallel with this number of processes. Not used if partials_method is not fd.",
+        )
+        self.options.declare(
+            "summary_only",
+            default=False,
+            types=bool,
+            desc="If True, only first and last flight points of each flight part are stored\n"
+            "during computations. The full list of flight points is computed again only\n"
+            "when flight_points property is accessed, or to write out_file at cleanup.",
+        )
+        self.options.declare(
+            "propulsion_surrogate",
+            default=None,
+            types=dict,
+            allow_none=True,
+            desc="If provided, the propulsion model is replaced by a tabulated surrogate\n"
+            "(an empty dict activates it with default settings). Possible keys are\n"
+            "mach_values, altitude_values, thrust_rate_values, method and estimate_errors (see\n"
+            "fastoad.model_base.propulsion_surrogate.TabulatedPropulsion).",
+        )
 
     def setup(self):
         if "::" in self.options["mission_file_path"]:
@@ -132,8 +207,15 @@ class Mission(om.Group):
             i = self.options["mission_file_path"].index("::")
             file_name = self.options["mission_file_path"][i + 2 :] + ".yml"
             with path(resources, file_name) as mission_input_file:
-                self.options["mission_file_path"] = MissionDefinition(mission_input_file)
-        mission_wrapper = MissionWrapper(self.options["mission_file_path"])
+                self.options["mission_file_path"] = MissionDefinition(
+                    mission_input_file, self.options["definition_cache_folder"]
+                )
+        mission_definition = self.options["mission_file_path"]
+        if not isinstance(mission_definition, MissionDefinition):
+            mission_definition = MissionDefinition(
+                mission_definition, self.options["definition_cache_folder"]
+            )
+        mission_wrapper = MissionWrapper(mission_definition)
         if self.options["mission_name"] is None:
             self.options["mission_name"] = mission_wrapper.get_unique_mission_name()
 
@@ -161,6 +243,7 @@ class Mission(om.Group):
         del mission_options["compute_TOW"]
         del mission_options["add_solver"]
         del mission_options["mission_file_path"]
+        del mission_options["definition_cache_folder"]
         mission_options["mission_wrapper"] = mission_wrapper
         mission_options["mission_name"] = mission_name
         self.add_subsystem(
@@ -254,6 +337,19 @@ _MissionVariables = namedtuple(
     ],
 )
 
+#: Data that is needed, in addition to inputs and propulsion model, for computing a mission
+#: outside of :class:`MissionComponent` (see :func:`_compute_mission`).
+_MissionSettings = namedtuple(
+    "_MissionSettings",
+    [
+        "mission_name",
+        "is_sizing",
+        "reference_area_variable",
+        "mission_wrapper",
+        "mission_vars",
+    ],
+)
+
 
 class MissionComponent(om.ExplicitComponent):
     def __init__(self, **kwargs):
@@ -275,12 +371,52 @@ class MissionComponent(om.ExplicitComponent):
                        considered equal to design payload.
           - reference_area_variable: Defines the name of the variable for providing aircraft
                                      reference surface area.
+          - cache_size: if not zero, results of mission computations are stored for this number
+                        of input sets, and reused when mission is computed again with the same
+                        inputs.
+          - cache_tolerance: relative tolerance on input values for reusing stored results (not
+                             used for finite-difference computations).
+          - cache_file: if provided, stored results will be saved in this file (at cleanup of
+                        the problem and when Python exits) and reused in next runs.
+          - separate_taxi_takeoff_partials: if True, approximation of partials on mission
+                                           computation is not done for taxi-out and takeoff
+                                           inputs that are not used in mission definition.
+                                           Their partials are computed separately, and only
+                                           for outputs that depend on them. Partials with
+                                           respect to other inputs are still approximated on
+                                           the whole mission computation.
+          - partials_method: "fd" for finite differences (default) or "cs" for complex step.
+                             Complex step needs a propulsion model that accepts complex values.
+          - fd_workers: if greater than 1, finite differences of mission computation are
+                        computed in parallel with this number of processes.
+          - summary_only: if True, only first and last flight points of each flight part are
+                          stored during computations. The full list of flight points is
+                          computed again only when :attr:`flight_points` is accessed, or
+                          to write out_file at problem cleanup.
+          - propulsion_surrogate: if provided, the propulsion model is replaced by a tabulated
+                                  surrogate, with items of this dict as keyword arguments (see
+                                  :class:`~fastoad.model_base.propulsion_surrogate.TabulatedPropulsion`).
+                                  Not used for complex-step computations.
         """
         super().__init__(**kwargs)
-        self.flight_points = None
+        self._flight_points = None
+        # Inputs of last computation if only its summary has been kept (see flight_points)
+        self._summary_inputs = None
         self._engine_wrapper = None
+        # Names of inputs that are added by the engine wrapper
+        self._propulsion_input_names: List[str] = []
+        # Surrogate of the propulsion model, if option "propulsion_surrogate" is set, and the
+        # values of propulsion inputs it has been built for
+        self._propulsion_surrogate: Optional[TabulatedPropulsion] = None
+        self._surrogate_inputs = {}
         self._mission_wrapper: MissionWrapper = None
         self._mission_vars: _MissionVariables = None
+        self.compute_cache: Optional[ComputeCache] = None
+        self._parallel_fd: Optional[ParallelFiniteDifference] = None
+        # Input and output values of last mission computation, reused as reference point
+        # for finite differences
+        self._last_computation: Optional[Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]] = None
+        self._used_inputs = {}
 
     def initialize(self):
         self.options.declare("propulsion_id", default="", types=str)
@@ -292,12 +428,45 @@ class MissionComponent(om.ExplicitComponent):
         self.options.declare(
             "reference_area_variable", default="data:geometry:wing:area", types=str
         )
+        self.options.declare("cache_size", default=0, types=int)
+        self.options.declare("cache_tolerance", default=0.0, types=float)
+        self.options.declare("cache_file", default="", types=str)
+        self.options.declare("separate_taxi_takeoff_partials", default=False, types=bool)
+        self.options.declare("partials_method", default="fd", values=["fd", "cs"])
+        self.options.declare("fd_workers", default=0, types=int)
+        self.options.declare("summary_only", default=False, types=bool)
+        self.options.declare("propulsion_surrogate", default=None, types=dict, allow_none=True)
+
+    @property
+    def flight_points(self) -> pd.DataFrame:
+        """
+        Dataframe that lists all computed flight point data.
+
+        If option "summary_only" is True, the full list of flight points is computed
+        (and written to out_file) at first access after a mission computation, or at
+        cleanup.
+        """
+        if self._summary_inputs is not None:
+            inputs, self._summary_inputs = self._summary_inputs, None
+            outputs = {name: np.nan for name in self.get_io_metadata("output", metadata_keys=[])}
+            self._compute_mission(inputs, outputs)
+        return self._flight_points
 
     def setup(self):
         self._engine_wrapper = self._get_engine_wrapper()
-        self._engine_wrapper.setup(self)
+        recorder = _InputNameRecorder(self)
+        self._engine_wrapper.setup(recorder)
+        self._propulsion_input_names = recorder.input_names
+        self._propulsion_surrogate = None
         self._mission_wrapper = self.options["mission_wrapper"]
         self._mission_wrapper.setup(self, self.options["mission_name"])
+        if self.compute_cache is not None:
+            self.compute_cache.save()
+        self.compute_cache = None
+        if self._parallel_fd is not None:
+            self._parallel_fd.shutdown()
+            self._parallel_fd = None
+        self._used_inputs = self._mission_wrapper.get_input_variables(self.options["mission_name"])
 
         mission_name = self.options["mission_name"]
 
@@ -377,7 +546,154 @@ class MissionComponent(om.ExplicitComponent):
             self.add_output("data:weight:aircraft:sizing_onboard_fuel_at_takeoff", units="kg")
 
     def setup_partials(self):
-        self.declare_partials(["*"], ["*"], method="fd")
+        mission_inputs = self._get_mission_inputs()
+        if self._use_parallel_fd():
+            # Partials are computed in compute_partials()
+            self.declare_partials(["*"], mission_inputs)
+        else:
+            self.declare_partials(["*"], mission_inputs, method=self.options["partials_method"])
+
+        if not self.options["separate_taxi_takeoff_partials"]:
+            return
+
+        taxi_out_inputs = self._get_taxi_out_inputs()
+        takeoff_inputs = self._get_takeoff_inputs()
+
+        block_fuel_outputs = self._get_block_fuel_outputs()
+        if taxi_out_inputs:
+            self.declare_partials(
+                [self._mission_vars.TAXI_OUT_DISTANCE, self._mission_vars.TAXI_OUT_FUEL]
+                + block_fuel_outputs,
+                taxi_out_inputs,
+            )
+        if takeoff_inputs:
+            self.declare_partials(block_fuel_outputs, takeoff_inputs, val=1.0)
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+        if self._use_parallel_fd():
+            if self._parallel_fd is None:
+                self._parallel_fd = ParallelFiniteDifference(
+                    partial(
+                        _evaluate_mission,
+                        self._get_settings(),
+                        self._engine_wrapper,
+                        self.options["propulsion_surrogate"],
+                        list(self.get_io_metadata("output", metadata_keys=[])),
+                    ),
+                    self.options["fd_workers"],
+                )
+            input_values = {name: np.array(inputs[name]) for name in inputs.keys()}
+            self._parallel_fd.compute_partials(
+                input_values,
+                list(self.get_io_metadata("output", metadata_keys=[])),
+                self._get_mission_inputs(),
+                partials,
+                outputs=self._get_last_outputs(input_values),
+            )
+
+        taxi_out_inputs = self._get_taxi_out_inputs()
+        if not self.options["separate_taxi_takeoff_partials"] or not taxi_out_inputs:
+            return
+
+        # Taxi-out segment is cheap enough for a local finite-difference computation.
+        propulsion_model = self._get_propulsion_model(inputs)
+        reference_inputs = {name: inputs[name] for name in inputs.keys()}
+        reference_outputs = {}
+        _compute_taxi_out(self._mission_vars, reference_inputs, reference_outputs, propulsion_model)
+
+        for input_name in taxi_out_inputs:
+            step = 1.0e-6 * max(1.0, np.abs(inputs[input_name]).item())
+            perturbed_inputs = dict(reference_inputs)
+            perturbed_inputs[input_name] = inputs[input_name] + step
+            perturbed_outputs = {}
+            _compute_taxi_out(
+                self._mission_vars, perturbed_inputs, perturbed_outputs, propulsion_model
+            )
+
+            for output_name, value in perturbed_outputs.items():
+                partials[output_name, input_name] = (value - reference_outputs[output_name]) / step
+            for output_name in self._get_block_fuel_outputs():
+                partials[output_name, input_name] = partials[
+                    self._mission_vars.TAXI_OUT_FUEL, input_name
+                ]
+
+    def cleanup(self):
+        """
+        Saves stored results of mission computations, if a cache file is used, and stops
+        worker processes for finite differences.
+
+        If option "summary_only" is True, full flight points of last mission computation are
+        computed and written to out_file, if they have not been yet.
+        """
+        super().cleanup()
+        if self.options["out_file"] and self._summary_inputs is not None:
+            _ = self.flight_points
+        if self.compute_cache is not None:
+            self.compute_cache.save()
+        if self._parallel_fd is not None:
+            self._parallel_fd.shutdown()
+            self._parallel_fd = None
+
+    def _get_settings(self) -> _MissionSettings:
+        return _MissionSettings(
+            mission_name=self.options["mission_name"],
+            is_sizing=self.options["is_sizing"],
+            reference_area_variable=self.options["reference_area_variable"],
+            mission_wrapper=self._mission_wrapper,
+            mission_vars=self._mission_vars,
+        )
+
+    def _get_last_outputs(self, inputs: Dict[str, np.ndarray]) -> Optional[Dict[str, np.ndarray]]:
+        """
+        :param inputs: input values
+        :return: outputs of last mission computation if it has been done with provided
+                 input values, None otherwise
+        """
+        if self._last_computation is None:
+            return None
+        last_inputs, last_outputs = self._last_computation
+        if inputs.keys() == last_inputs.keys() and all(
+            np.array_equal(value, last_inputs[name]) for name, value in inputs.items()
+        ):
+            return last_outputs
+        return None
+
+    def _use_parallel_fd(self) -> bool:
+        """True if finite differences of mission computation are computed in parallel."""
+        return self.options["partials_method"] == "fd" and self.options["fd_workers"] > 1
+
+    def _get_mission_inputs(self) -> List[str]:
+        """Inputs for which partials are obtained by differentiating mission computation."""
+        input_names = list(self.get_io_metadata("input", metadata_keys=[]))
+        if not self.options["separate_taxi_takeoff_partials"]:
+            return input_names
+
+        # Taxi-out and takeoff inputs are only used for computing fuel quantities that are
+        # added to mission fuel, so their partials are computed separately and
+        # they are excluded from the differentiation of the mission.
+        excluded_inputs = self._get_taxi_out_inputs() + self._get_takeoff_inputs()
+        return [name for name in input_names if name not in excluded_inputs]
+
+    def _get_takeoff_inputs(self) -> List[str]:
+        """Takeoff inputs that are not used in mission definition."""
+        return [name for name in [self._mission_vars.TAKEOFF_FUEL] if name not in self._used_inputs]
+
+    def _get_taxi_out_inputs(self) -> List[str]:
+        """Taxi-out inputs that are not used in mission definition."""
+        return [
+            name
+            for name in [
+                self._mission_vars.TAXI_OUT_DURATION,
+                self._mission_vars.TAXI_OUT_THRUST_RATE,
+            ]
+            if name not in self._used_inputs
+        ]
+
+    def _get_block_fuel_outputs(self) -> List[str]:
+        """Outputs that are equal to needed block fuel."""
+        if self.options["is_sizing"]:
+            return [self._mission_vars.NEEDED_BLOCK_FUEL, "data:weight:aircraft:sizing_block_fuel"]
+        return [self._mission_vars.NEEDED_BLOCK_FUEL]
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
         iter_count = self.iter_count_without_approx
@@ -387,7 +703,60 @@ class MissionComponent(om.ExplicitComponent):
             self._compute_breguet(inputs, outputs)
         else:
             _LOGGER.info(message_prefix + "Using mission definition.")
-            self._compute_mission(inputs, outputs)
+            summary_only = self.options["summary_only"]
+            # Stored results are real values, so they cannot be used for complex step.
+            if self.options["cache_size"] > 0 and not self.under_complex_step:
+                self._compute_mission_with_cache(inputs, outputs)
+            else:
+                self._compute_mission(inputs, outputs, summary_only)
+
+            # Full flight points are useless for derivative approximations.
+            if summary_only and not self.under_approx:
+                self._summary_inputs = {name: np.array(inputs[name]) for name in inputs.keys()}
+
+    def _compute_mission_with_cache(self, inputs, outputs):
+        """
+        Provides stored results if inputs match a previous computation. Otherwise,
+        computes mission and stores results.
+
+        :param inputs: OpenMDAO input vector
+        :param outputs: OpenMDAO output vector
+        """
+        if self.compute_cache is None:
+            signature = (
+                self.options["mission_name"],
+                self.options["propulsion_id"],
+                repr(self._mission_wrapper.definition),
+                tuple(inputs.keys()),
+                self.options["summary_only"],
+                self.options["propulsion_surrogate"],
+            )
+            self.compute_cache = ComputeCache(
+                self.options["cache_size"],
+                tolerance=self.options["cache_tolerance"],
+                file_path=self.options["cache_file"] or None,
+                signature=str(signature),
+            )
+
+        input_values = inputs.asarray()
+        # Matching with tolerance would spoil finite-difference computations.
+        entry = self.compute_cache.get(input_values, use_tolerance=not self.under_approx)
+        if entry is None:
+            self._compute_mission(inputs, outputs, self.options["summary_only"])
+            self.compute_cache.put(
+                input_values,
+                {name: outputs[name] for name in outputs.keys()},
+                self._flight_points,
+            )
+            return
+
+        _LOGGER.info("Mission computation - Using stored results.")
+        for name, value in entry.outputs.items():
+            outputs[name] = value
+        self._flight_points = entry.flight_points.copy()
+        if self.options["out_file"] and not self.options["summary_only"]:
+            makedirs(pth.dirname(self.options["out_file"]), exist_ok=True)
+            self._flight_points.to_csv(self.options["out_file"])
 
     def _compute_breguet(self, inputs, outputs):
         """
@@ -399,7 +768,7 @@ class MissionComponent(om.ExplicitComponent):
         :param inputs: OpenMDAO input vector
         :param outputs: OpenMDAO output vector
         """
-        propulsion_model = self._engine_wrapper.get_model(inputs)
+        propulsion_model = self._get_propulsion_model(inputs)
 
         high_speed_polar = self._get_initial_polar(inputs)
         distance = np.sum(
@@ -449,95 +818,67 @@ class MissionComponent(om.ExplicitComponent):
 
         return high_speed_polar
 
-    def _compute_mission(self, inputs, outputs):
+    def _compute_mission(self, inputs, outputs, summary_only: bool = False):
         """
         Computes mission using time-step integration.
 
         :param inputs: OpenMDAO input vector
         :param outputs: OpenMDAO output vector
+        :param summary_only: if True, only first and last points of each flight part are stored
+                             and out_file is not written
         """
-        propulsion_model = self._engine_wrapper.get_model(inputs)
-        reference_area = inputs[self.options["reference_area_variable"]]
-
-        self._mission_wrapper.propulsion = propulsion_model
-        self._mission_wrapper.reference_area = reference_area
-
-        self._compute_taxi_out(inputs, outputs, propulsion_model)
-        end_of_takeoff = FlightPoint(
-            time=0.0,
-            mass=inputs[self._mission_vars.TOW],
-            true_airspeed=inputs[self._mission_vars.TAKEOFF_V2],
-            altitude=inputs[self._mission_vars.TAKEOFF_ALTITUDE] + 35 * foot,
-            ground_distance=0.0,
-        )
-
-        self.flight_points = self._mission_wrapper.compute(inputs, outputs, end_of_takeoff)
-
-        # Final ================================================================
-        end_of_mission = FlightPoint.create(self.flight_points.iloc[-1])
-        reserve = self._mission_wrapper.get_reserve(
-            self.flight_points, self.options["mission_name"]
-        )
-        zfw = end_of_mission.mass - reserve
-        reserve_name = self._mission_wrapper.get_reserve_variable_name()
-        if reserve_name in outputs:
-            outputs[reserve_name] = reserve
-        outputs[self._mission_vars.NEEDED_BLOCK_FUEL] = (
-            inputs[self._mission_vars.TOW]
-            + inputs[self._mission_vars.TAKEOFF_FUEL]
-            + outputs[self._mission_vars.TAXI_OUT_FUEL]
-            - zfw
-        )
-        outputs[self._mission_vars.NEEDED_FUEL_AT_TAKEOFF] = (
-            outputs[self._mission_vars.NEEDED_BLOCK_FUEL]
-            - inputs[self._mission_vars.TAKEOFF_FUEL]
-            - outputs[self._mission_vars.TAXI_OUT_FUEL]
+        propulsion_model = self._get_propulsion_model(inputs)
+        self._flight_points = _compute_mission(
+            self._get_settings(), inputs, outputs, propulsion_model, summary_only
         )
-        if self.options["is_sizing"]:
-            outputs["data:weight:aircraft:sizing_block_fuel"] = outputs[
-                self._mission_vars.NEEDED_BLOCK_FUEL
-            ]
-            outputs["data:weight:aircraft:sizing_onboard_fuel_at_takeoff"] = outputs[
-                self._mission_vars.NEEDED_FUEL_AT_TAKEOFF
-            ]
+        if not self.under_complex_step:
+            # Reference point for finite differences (see compute_partials())
+            self._last_computation = (
+                {name: np.array(inputs[name]) for name in inputs.keys()},
+                {name: np.array(outputs[name]) for name in outputs.keys()},
+            )
 
         def as_scalar(value):
             if isinstance(value, np.ndarray):
                 return value.item()
             return value
 
-        self.flight_points = self.flight_points.applymap(as_scalar)
+        # The "name" column is kept as categorical.
+        value_columns = self._flight_points.columns.drop("name")
+        self._flight_points[value_columns] = self._flight_points[value_columns].applymap(as_scalar)
         rename_dict = {
             field_name: f"{field_name} [{unit}]"
             for field_name, unit in FlightPoint.get_units().items()
         }
-        self.flight_points.rename(columns=rename_dict, inplace=True)
+        self._flight_points.rename(columns=rename_dict, inplace=True)
 
-        if self.options["out_file"]:
+        if self.options["out_file"] and not summary_only:
             makedirs(pth.dirname(self.options["out_file"]), exist_ok=True)
-            self.flight_points.to_csv(self.options["out_file"])
+            self._flight_points.to_csv(self.options["out_file"])
 
-    def _compute_taxi_out(self, inputs, outputs, propulsion_model):
+    def _get_propulsion_model(self, inputs) -> IPropulsion:
         """
-        Computes the taxi-out segment.
+        :param inputs: OpenMDAO input vector
+        :return: the propulsion model, wrapped in a tabulated surrogate if option
+                 "propulsion_surrogate" is set. The surrogate is built again only if
+                 propulsion inputs have changed.
         """
-        start_of_taxi_out = FlightPoint(
-            altitude=inputs[self._mission_vars.TAKEOFF_ALTITUDE],
-            true_airspeed=0.0,
-            # start mass is irrelevant here as long it does not get negative during computation.
-            mass=inputs[self._mission_vars.TOW],
-        )
-        taxi_segment = TaxiSegment(
-            target=FlightPoint(time=inputs[self._mission_vars.TAXI_OUT_DURATION]),
-            thrust_rate=inputs[self._mission_vars.TAXI_OUT_THRUST_RATE],
-            propulsion=propulsion_model,
-        )
-        flight_points = taxi_segment.compute_from(start_of_taxi_out)
-        end_of_taxi_out = flight_points.iloc[-1]
-        outputs[self._mission_vars.TAXI_OUT_DISTANCE] = (
-            end_of_taxi_out.ground_distance - start_of_taxi_out.ground_distance
-        )
-        outputs[self._mission_vars.TAXI_OUT_FUEL] = start_of_taxi_out.mass - end_of_taxi_out.mass
+        surrogate_options = self.options["propulsion_surrogate"]
+        # The surrogate does not accept complex values.
+        if surrogate_options is None or self.under_complex_step:
+            return self._engine_wrapper.get_model(inputs)
+
+        propulsion_inputs = {name: np.array(inputs[name]) for name in self._propulsion_input_names}
+        if self._propulsion_surrogate is None or not all(
+            np.array_equal(value, self._surrogate_inputs[name])
+            for name, value in propulsion_inputs.items()
+        ):
+            self._propulsion_surrogate = TabulatedPropulsion(
+                self._engine_wrapper.get_model(inputs), **surrogate_options
+            )
+            self._surrogate_inputs = propulsion_inputs
+
+        return self._propulsion_surrogate
 
     def _get_engine_wrapper(self) -> IOMPropulsionWrapper:
         """
@@ -549,3 +890,141 @@ class MissionComponent(om.ExplicitComponent):
         :return: the engine wrapper instance
         """
         return RegisterPropulsion.get_provider(self.options["propulsion_id"])
+
+
+class _InputNameRecorder:
+    """
+    Forwards calls to an OpenMDAO component, and records the names of inputs that are added
+    through it.
+    """
+
+    def __init__(self, component: om.ExplicitComponent):
+        self._component = component
+        #: Names of added inputs
+        self.input_names: List[str] = []
+
+    def add_input(self, name, *args, **kwargs):
+        self.input_names.append(name)
+        return self._component.add_input(name, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._component, name)
+
+
+def _compute_mission(
+    settings: _MissionSettings,
+    inputs,
+    outputs,
+    propulsion_model: IPropulsion,
+    summary_only: bool = False,
+) -> pd.DataFrame:
+    """
+    Computes mission using time-step integration.
+
+    :param settings: mission data that is not in inputs
+    :param inputs: OpenMDAO input vector, or dictionary of input values
+    :param outputs: OpenMDAO output vector, or dictionary of output values
+    :param propulsion_model: the propulsion model
+    :param summary_only: if True, only first and last points of each flight part are stored
+    :return: the computed flight points
+    """
+    mission_vars = settings.mission_vars
+    mission_wrapper = settings.mission_wrapper
+    mission_wrapper.propulsion = propulsion_model
+    mission_wrapper.reference_area = inputs[settings.reference_area_variable]
+
+    _compute_taxi_out(mission_vars, inputs, outputs, propulsion_model)
+    end_of_takeoff = FlightPoint(
+        time=0.0,
+        mass=inputs[mission_vars.TOW],
+        true_airspeed=inputs[mission_vars.TAKEOFF_V2],
+        altitude=inputs[mission_vars.TAKEOFF_ALTITUDE] + 35 * foot,
+        ground_distance=0.0,
+    )
+
+    flight_points = mission_wrapper.compute(
+        inputs, outputs, end_of_takeoff, summary_only=summary_only
+    )
+
+    # Final ================================================================
+    end_of_mission = FlightPoint.create(flight_points.iloc[-1])
+    reserve = mission_wrapper.get_reserve(
+        flight_points,
+        settings.mission_name,
+        mission_wrapper.part_boundaries,
+    )
+    zfw = end_of_mission.mass - reserve
+    reserve_name = mission_wrapper.get_reserve_variable_name()
+    if reserve_name in outputs:
+        outputs[reserve_name] = reserve
+    outputs[mission_vars.NEEDED_BLOCK_FUEL] = (
+        inputs[mission_vars.TOW]
+        + inputs[mission_vars.TAKEOFF_FUEL]
+        + outputs[mission_vars.TAXI_OUT_FUEL]
+        - zfw
+    )
+    outputs[mission_vars.NEEDED_FUEL_AT_TAKEOFF] = (
+        outputs[mission_vars.NEEDED_BLOCK_FUEL]
+        - inputs[mission_vars.TAKEOFF_FUEL]
+        - outputs[mission_vars.TAXI_OUT_FUEL]
+    )
+    if settings.is_sizing:
+        outputs["data:weight:aircraft:sizing_block_fuel"] = outputs[mission_vars.NEEDED_BLOCK_FUEL]
+        outputs["data:weight:aircraft:sizing_onboard_fuel_at_takeoff"] = outputs[
+            mission_vars.NEEDED_FUEL_AT_TAKEOFF
+        ]
+
+    return flight_points
+
+
+def _compute_taxi_out(mission_vars: _MissionVariables, inputs, outputs, propulsion_model):
+    """
+    Computes the taxi-out segment.
+    """
+    start_of_taxi_out = FlightPoint(
+        altitude=inputs[mission_vars.TAKEOFF_ALTITUDE],
+        true_airspeed=0.0,
+        # start mass is irrelevant here as long it does not get negative during computation.
+        mass=inputs[mission_vars.TOW],
+    )
+    taxi_segment = TaxiSegment(
+        target=FlightPoint(time=inputs[mission_vars.TAXI_OUT_DURATION]),
+        thrust_rate=inputs[mission_vars.TAXI_OUT_THRUST_RATE],
+        propulsion=propulsion_model,
+    )
+    flight_points = taxi_segment.compute_from(start_of_taxi_out)
+    end_of_taxi_out = flight_points.iloc[-1]
+    outputs[mission_vars.TAXI_OUT_DISTANCE] = (
+        end_of_taxi_out.ground_distance - start_of_taxi_out.ground_distance
+    )
+    outputs[mission_vars.TAXI_OUT_FUEL] = start_of_taxi_out.mass - end_of_taxi_out.mass
+
+
+def _evaluate_mission(
+    settings: _MissionSettings,
+    engine_wrapper: IOMPropulsionWrapper,
+    surrogate_options: Optional[dict],
+    output_names: List[str],
+    inputs: Dict[str, np.ndarray],
+) -> Dict[str, np.ndarray]:
+    """
+    Computes mission outputs from input values, with no file written.
+
+    Used through :func:`functools.partial` for computing finite differences in other
+    processes.
+
+    :param settings: mission data that is not in inputs
+    :param engine_wrapper: provides the propulsion model
+    :param surrogate_options: if not None, the propulsion model is replaced by a tabulated
+                              surrogate, with these keyword arguments
+    :param output_names: names of mission outputs
+    :param inputs: input values, with variable names as keys
+    :return: output values, with variable names as keys
+    """
+    propulsion_model = engine_wrapper.get_model(inputs)
+    if surrogate_options is not None:
+        propulsion_model = TabulatedPropulsion(propulsion_model, **surrogate_options)
+
+    outputs = {name: np.nan for name in output_names}
+    _compute_mission(settings, inputs, outputs, propulsion_model, summary_only=True)
+    return outputs
@@ -33,6 +33,7 @@ from ..mission_definition.schema import (
     ROUTE_DEFINITIONS_TAG,
     ROUTE_TAG,
 )
+from ..trajectory import BoundaryTrajectoryBuffer, TrajectoryBuffer
 
 BASE_UNITS = {
     "altitude": "m",
@@ -55,6 +56,11 @@ class MissionWrapper(MissionBuilder):
         super().__init__(*args, **kwargs)
         self.mission_name = None
 
+        #: Row indices of first and last flight points of each flight part (mission, routes,
+        #: phases and named segments) in the DataFrame returned by last call to :meth:`compute`,
+        #: with flight part names as keys.
+        self.part_boundaries: Dict[str, Tuple[int, int]] = {}
+
     def setup(self, component: om.ExplicitComponent, mission_name: str = None):
         """
         To be used during setup() of provided OpenMDAO component.
@@ -83,22 +89,30 @@ class MissionWrapper(MissionBuilder):
             component.add_output(name, units=units, desc=desc)
 
     def compute(
-        self, inputs: Vector, outputs: Vector, start_flight_point: FlightPoint
+        self,
+        inputs: Vector,
+        outputs: Vector,
+        start_flight_point: FlightPoint,
+        summary_only: bool = False,
     ) -> pd.DataFrame:
         """
         To be used during compute() of an OpenMDAO component.
 
-        Builds the mission from input file, and computes it. `outputs` vector is
+        Gets the mission from input file, and computes it. The mission is built at first
+        call only: next calls only update its input parameters. `outputs` vector is
         filled with duration, burned fuel and covered ground distance for each
         part of the flight.
 
         :param inputs: the input vector of the OpenMDAO component
         :param outputs: the output vector of the OpenMDAO component
         :param start_flight_point: the starting flight point just after takeoff
+        :param summary_only: if True, only first and last flight points of each flight part
+                             are stored during computation and returned (they are enough for
+                             computing outputs)
         :return: a pandas DataFrame where columns names match fields of
                  :class:`~fastoad.model_base.flight_point.FlightPoint`
         """
-        mission = self.build(inputs, self.mission_name)
+        mission = self.get_mission(inputs, self.mission_name)
 
         def _compute_vars(name_root, start: FlightPoint, end: FlightPoint):
             """Computes duration, burned fuel and covered distance."""
@@ -109,28 +123,43 @@ class MissionWrapper(MissionBuilder):
             if name_root + ":distance" in outputs:
                 outputs[name_root + ":distance"] = end.ground_distance - start.ground_distance
 
-        flight_points = mission.compute_from(start_flight_point)
-        flight_points.loc[0, "name"] = flight_points.loc[1, "name"]
-
-        nb_levels = np.max([len(n.split(":")) for n in flight_points["name"]])
-        for i in range(nb_levels):
-            flight_points["name2"] = [":".join(n.split(":")[: i + 1]) for n in flight_points.name]
-            grouped_points = flight_points.groupby("name2")
-
-            part_names = pd.unique(flight_points.name2)
-            for part_name1, part_name2 in zip(part_names[:-1], part_names[1:]):
-                part1 = grouped_points.get_group(part_name1)
-                part2 = grouped_points.get_group(part_name2)
-                _compute_vars(f"data:mission:{part_name2}", part1.iloc[-1], part2.iloc[-1])
-
-            start_part_name = part_names[0]
-            start_part = grouped_points.get_group(start_part_name)
+        if summary_only:
+            trajectory = BoundaryTrajectoryBuffer()
+            # The name of first flight point is taken from the second one.
+            trajectory.keep(1)
+        else:
+            trajectory = TrajectoryBuffer()
+        mission.compute_into(start_flight_point, trajectory)
+        flight_points = trajectory.to_dataframe()
+        # Positions in flight_points of the stored flight points, with their indices as keys
+        positions = {row: position for position, row in enumerate(trajectory.rows)}
+
+        flight_points.loc[0, "name"] = flight_points.loc[positions[1], "name"]
+        flight_points["name"] = flight_points["name"].astype("category")
+
+        part_boundaries = dict(mission.part_boundaries)
+        part_boundaries[mission.name] = (0, len(trajectory) - 1)
+        for part_name, (start, end) in part_boundaries.items():
             _compute_vars(
-                f"data:mission:{start_part_name}", start_part.iloc[0], start_part.iloc[-1]
+                f"data:mission:{part_name}",
+                flight_points.iloc[positions[start]],
+                flight_points.iloc[positions[end]],
             )
 
-        del flight_points["name2"]
+        if summary_only:
+            kept_rows = sorted(
+                {row for boundaries in part_boundaries.values() for row in boundaries}
+            )
+            new_rows = {row: new_row for new_row, row in enumerate(kept_rows)}
+            part_boundaries = {
+                part_name: (new_rows[start], new_rows[end])
+                for part_name, (start, end) in part_boundaries.items()
+            }
+            flight_points = flight_points.iloc[[positions[row] for row in kept_rows]].reset_index(
+                drop=True
+            )
 
+        self.part_boundaries = part_boundaries
         return flight_points
 
     def get_reserve_variable_name(self) -> str:
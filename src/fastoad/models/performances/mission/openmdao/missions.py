@@ -0,0 +1,361 @@
+"""
+OpenMDAO group for computing several missions concurrently.
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2022 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import openmdao.api as om
+import pandas as pd
+from openmdao.recorders.recording_iteration_stack import Recording
+
+from fastoad.module_management.constants import ModelDomain
+from fastoad.module_management.service_registry import RegisterOpenMDAOSystem
+from .mission import Mission
+from ..exceptions import FastMissionDependencyError
+
+_LOGGER = logging.getLogger(__name__)  # Logger for this module
+
+# Options of the missions that are computed in a worker process, with mission names as keys.
+_worker_options: Dict[str, dict] = {}
+
+# OpenMDAO problems of the missions that have been computed in a worker process.
+_worker_problems: Dict[str, om.Problem] = {}
+
+
+@RegisterOpenMDAOSystem("fastoad.performances.missions", domain=ModelDomain.PERFORMANCE)
+class Missions(om.ParallelGroup):
+    """
+    Computes several missions concurrently.
+
+    Each item of option "missions" defines a :class:`~.mission.Mission` subsystem, with the
+    item key as subsystem name and the item value as options.
+
+    When run under MPI with several processes, missions are distributed among processes as
+    in any OpenMDAO ParallelGroup. They must then be independent, otherwise a
+    :class:`~fastoad.models.performances.mission.exceptions.FastMissionDependencyError` is
+    raised.
+
+    Otherwise, missions are run by groups of independent missions, where a mission that
+    needs outputs of other missions comes after them. If option "max_workers" is greater
+    than 1, each mission is computed in a worker process, where it keeps its own OpenMDAO
+    problem from one run to the next, and missions of the same group are computed
+    concurrently. Outputs and flight points are then gathered back in the current process,
+    where the iteration is recorded for each mission as if it had been computed locally.
+
+    In any case, partial derivatives are computed in the current process.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        #: Names of missions, by groups of independent missions, in computation order.
+        self.waves: List[List[str]] = []
+
+        self._mission_variables: Dict[str, _MissionVariables] = {}
+
+    def initialize(self):
+        self.options.declare(
+            "missions",
+            types=dict,
+            desc="Definition of missions: subsystem names as keys and options of\n"
+            "fastoad.performances.mission as values.",
+        )
+        self.options.declare(
+            "max_workers",
+            default=0,
+            types=int,
+            desc="If greater than 1, missions are computed in this number of worker processes.\n"
+            "Not used when running under MPI.",
+        )
+
+    def setup(self):
+        for name, mission_options in self.options["missions"].items():
+            self.add_subsystem(name, Mission(**mission_options), promotes=["*"])
+
+        if not self._is_distributed():
+            self.nonlinear_solver = _MissionsRunOnce()
+
+    def configure(self):
+        self._mission_variables = {
+            subsystem.name: _MissionVariables.create(subsystem)
+            for subsystem in self.system_iter(recurse=False)
+        }
+        if self._is_distributed():
+            all_variables = {}
+            for variables in self.comm.allgather(self._mission_variables):
+                all_variables.update(variables)
+            waves = self._get_waves(all_variables)
+            if len(waves) > 1:
+                raise FastMissionDependencyError(
+                    "Missions %s need outputs of other missions, so they cannot be distributed "
+                    "among MPI processes." % sorted(name for wave in waves[1:] for name in wave)
+                )
+            self.waves = [list(self._mission_variables)]
+        else:
+            self.waves = self._get_waves()
+        _LOGGER.debug("Missions will be computed in this order: %s", self.waves)
+
+    @property
+    def flight_points(self) -> Dict[str, pd.DataFrame]:
+        """Dataframes that list all computed flight point data, with mission names as keys."""
+        return {name: getattr(self, name).flight_points for name in self._mission_variables}
+
+    def shutdown(self):
+        """Stops worker processes, if any. They will be started again if needed."""
+        if isinstance(self.nonlinear_solver, _MissionsRunOnce):
+            self.nonlinear_solver.shutdown()
+
+    def _is_distributed(self) -> bool:
+        return self.comm.size > 1
+
+    def _get_waves(
+        self, mission_variables: Optional[Dict[str, "_MissionVariables"]] = None
+    ) -> List[List[str]]:
+        """
+        :param mission_variables: variables of missions, with mission names as keys (default
+                                  is the ones of the missions of current process)
+        :return: names of missions, by groups of missions that do not need outputs of
+                 each other, in an order where each mission comes after the missions it needs
+        """
+        if mission_variables is None:
+            mission_variables = self._mission_variables
+        dependencies = {
+            name: {
+                other_name
+                for other_name, other_variables in mission_variables.items()
+                if other_name != name
+                and not variables.input_names.isdisjoint(other_variables.output_names)
+            }
+            for name, variables in mission_variables.items()
+        }
+
+        waves = []
+        done = set()
+        while len(done) < len(dependencies):
+            wave = [
+                name
+                for name, needed_names in dependencies.items()
+                if name not in done and needed_names <= done
+            ]
+            if not wave:
+                raise FastMissionDependencyError(
+                    "Missions %s need outputs of each other." % sorted(set(dependencies) - done)
+                )
+            waves.append(wave)
+            done.update(wave)
+
+        return waves
+
+
+@dataclass
+class _MissionVariables:
+    """
+    Variables of a mission subsystem, as seen from its parent group.
+    """
+
+    #: Inputs that do not come from the mission subsystem itself, as
+    #: {promoted name: (relative name, units)}.
+    inputs: Dict[str, Tuple[str, Optional[str]]] = field(default_factory=dict)
+
+    #: Promoted names of outputs.
+    output_names: List[str] = field(default_factory=list)
+
+    #: True if the mission computation keeps only a summary of flight points.
+    summary_only: bool = False
+
+    @property
+    def input_names(self) -> set:
+        """Promoted names of inputs."""
+        return set(self.inputs)
+
+    @classmethod
+    def create(cls, mission: Mission) -> "_MissionVariables":
+        """
+        :param mission: a mission subsystem, after its setup
+        :return: the variables of provided mission
+        """
+        output_names = [
+            metadata["prom_name"] for metadata in mission.get_io_metadata("output", []).values()
+        ]
+        inputs = {}
+        for name, metadata in mission.get_io_metadata("input", ["units"]).items():
+            if metadata["prom_name"] not in output_names:
+                inputs.setdefault(metadata["prom_name"], (name, metadata["units"]))
+
+        return cls(inputs, output_names, mission.options["summary_only"])
+
+    def remove_connected_inputs(self, mission: Mission):
+        """
+        Removes inputs that are connected to outputs of the mission subsystem itself
+        (e.g. with explicit connections, that are not known before final setup).
+
+        :param mission: the mission subsystem, after final setup
+        """
+        prefix = mission.pathname + "."
+        self.inputs = {
+            promoted_name: (relative_name, units)
+            for promoted_name, (relative_name, units) in self.inputs.items()
+            if not mission.get_source(prefix + relative_name).startswith(prefix)
+        }
+
+
+class _MissionsRunOnce(om.NonlinearRunOnce):
+    """
+    Runs each mission of a :class:`Missions` group once, group of independent missions after
+    group of independent missions.
+
+    If option "max_workers" of the group is greater than 1, each mission is computed in
+    the same worker process at each run.
+    """
+
+    SOLVER = "NL: MissionsRunOnce"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Executors of worker processes, with mission names as keys
+        self._executors: Dict[str, ProcessPoolExecutor] = {}
+
+    def solve(self):
+        system: Missions = self._system()
+        use_workers = system.options["max_workers"] > 1
+        if use_workers and not self._executors:
+            self._start_workers(system)
+
+        for wave in system.waves:
+            # As in OpenMDAO solvers, inputs of subsystems are updated before computing them.
+            system._transfer("nonlinear", "fwd")
+            if use_workers:
+                self._compute_in_workers(system, wave)
+            else:
+                for name in wave:
+                    getattr(system, name)._solve_nonlinear()
+
+    def shutdown(self):
+        """Stops worker processes. They will be started again if needed."""
+        for executor in set(self._executors.values()):
+            executor.shutdown()
+        self._executors = {}
+
+    def _start_workers(self, system: Missions):
+        """
+        Starts worker processes and assigns missions to them.
+        """
+        names = [name for wave in system.waves for name in wave]
+        for name in names:
+            system._mission_variables[name].remove_connected_inputs(getattr(system, name))
+
+        worker_count = min(system.options["max_workers"], len(names))
+        for i in range(worker_count):
+            worker_names = names[i::worker_count]
+            mission_options = {
+                name: dict(getattr(system, name).options.items()) for name in worker_names
+            }
+            executor = ProcessPoolExecutor(
+                1, initializer=_initialize_worker, initargs=(mission_options,)
+            )
+            self._executors.update({name: executor for name in worker_names})
+
+    def _compute_in_workers(self, system: Missions, names: List[str]):
+        """
+        Computes provided missions in their worker processes and gets results back.
+
+        For each mission, the iteration is recorded as if the mission had been computed in
+        current process, which also increments iteration counters (so that local computations,
+        e.g. for partial derivatives, do not use the initializer iteration).
+        """
+        futures = {}
+        for name in names:
+            mission = getattr(system, name)
+            variables = system._mission_variables[name]
+            input_values = {
+                promoted_name: (np.array(mission.get_val(promoted_name, units=units)), units)
+                for promoted_name, (_, units) in variables.inputs.items()
+            }
+            futures[name] = self._executors[name].submit(_run_mission, name, input_values)
+
+        for name, future in futures.items():
+            outputs, flight_points = future.result()
+            mission = getattr(system, name)
+            component = mission.mission_computation
+            with Recording(mission.pathname + "._solve_nonlinear", mission.iter_count, mission):
+                for promoted_name, value in outputs.items():
+                    mission.set_val(promoted_name, value)
+                mission._transfer("nonlinear", "fwd")
+
+                with Recording(
+                    component.pathname + "._solve_nonlinear", component.iter_count, component
+                ):
+                    component._flight_points = flight_points
+                    if system._mission_variables[name].summary_only:
+                        component._summary_inputs = {
+                            input_name: np.array(component.get_val(input_name))
+                            for input_name in component.get_io_metadata("input", [])
+                        }
+
+
+def _initialize_worker(mission_options: Dict[str, dict]):
+    """Stores options of the missions to compute in a worker process."""
+    global _worker_options, _worker_problems  # pylint: disable=global-statement
+    _worker_options = mission_options
+    _worker_problems = {}
+
+
+def _run_mission(
+    name: str, input_values: Dict[str, Tuple[np.ndarray, Optional[str]]]
+) -> Tuple[Dict[str, np.ndarray], pd.DataFrame]:
+    """
+    Computes a mission in a worker process.
+
+    The OpenMDAO problem of the mission is set up at first call, with provided inputs as
+    independent variables, and reused afterwards.
+
+    :param name: the mission subsystem name
+    :param input_values: input values and units, with promoted names as keys
+    :return: output values, with promoted names as keys, and flight points
+    """
+    problem = _worker_problems.get(name)
+    if problem is None:
+        problem = om.Problem()
+        # Inputs are explicitly defined so that their shapes are known (some mission inputs
+        # get their shape from their connection).
+        input_component = om.IndepVarComp()
+        for promoted_name, (value, units) in input_values.items():
+            input_component.add_output(promoted_name, value, units=units)
+        problem.model.add_subsystem("inputs", input_component, promotes=["*"])
+        problem.model.add_subsystem(name, Mission(**_worker_options[name]), promotes=["*"])
+        problem.setup()
+        _worker_problems[name] = problem
+
+    for promoted_name, (value, units) in input_values.items():
+        problem.set_val(promoted_name, value, units=units)
+    problem.run_model()
+
+    mission = getattr(problem.model, name)
+    outputs = {
+        metadata["prom_name"]: np.array(problem.get_val(metadata["prom_name"]))
+        for metadata in mission.get_io_metadata("output", []).values()
+    }
+    component = mission.mission_computation
+    # With summary_only option, full flight points are computed in main process, if needed.
+    if mission.options["summary_only"]:
+        flight_points = component._flight_points
+    else:
+        flight_points = component.flight_points
+
+    return outputs, flight_points
@@ -0,0 +1,104 @@
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2022 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from os import listdir
+
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose
+from pandas.testing import assert_frame_equal
+
+from ..compute_cache import ComputeCache
+
+
+def _put(cache, value):
+    cache.put(
+        np.array([value, 1.0]),
+        {"out": np.array([2.0 * value])},
+        pd.DataFrame({"mass": [value, value - 1.0]}),
+    )
+
+
+def test_compute_cache():
+    cache = ComputeCache(2)
+    _put(cache, 10.0)
+    _put(cache, 20.0)
+
+    entry = cache.get(np.array([10.0, 1.0]))
+    assert_allclose(entry.outputs["out"], 20.0)
+    assert_frame_equal(entry.flight_points, pd.DataFrame({"mass": [10.0, 9.0]}))
+    assert cache.get(np.array([10.0, 1.0 + 1.0e-12])) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Least recently used entry (20.0) is removed
+    _put(cache, 30.0)
+    assert len(cache) == 2
+    assert cache.get(np.array([20.0, 1.0])) is None
+    assert cache.get(np.array([10.0, 1.0])) is not None
+    assert cache.get(np.array([30.0, 1.0])) is not None
+    assert (cache.hits, cache.misses) == (3, 2)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_compute_cache_tolerance():
+    cache = ComputeCache(5, tolerance=1.0e-6)
+    _put(cache, 10.0)
+
+    assert_allclose(cache.get(np.array([10.000001, 1.0])).outputs["out"], 20.0)
+    assert cache.get(np.array([10.000001, 1.0]), use_tolerance=False) is None
+    assert cache.get(np.array([10.001, 1.0])) is None
+    assert cache.get(np.array([10.0, 1.0, 1.0])) is None
+
+
+def test_compute_cache_file(tmp_path):
+    file_path = str(tmp_path / "cache" / "cache.pkl")
+    cache = ComputeCache(5, file_path=file_path, signature="model")
+    _put(cache, 10.0)
+    _put(cache, 20.0)
+    assert not tmp_path.joinpath("cache").exists()
+    cache.save()
+    assert listdir(tmp_path / "cache") == ["cache.pkl"]
+
+    cache = ComputeCache(1, file_path=file_path, signature="model")
+    assert len(cache) == 1
+    assert_allclose(cache.get(np.array([20.0, 1.0])).outputs["out"], 40.0)
+
+    # Not the same signature
+    cache = ComputeCache(5, file_path=file_path, signature="other model")
+    assert len(cache) == 0
+
+    # Unreadable file
+    with open(file_path, "w") as cache_file:
+        cache_file.write("nonsense")
+    cache = ComputeCache(5, file_path=file_path, signature="model")
+    assert len(cache) == 0
+
+
+def test_compute_cache_save_interval(tmp_path, monkeypatch):
+    file_path = str(tmp_path / "cache.pkl")
+    cache = ComputeCache(5, file_path=file_path, signature="model", save_interval=2)
+    _put(cache, 10.0)
+    assert len(ComputeCache(5, file_path=file_path, signature="model")) == 0
+    _put(cache, 20.0)
+    assert len(ComputeCache(5, file_path=file_path, signature="model")) == 2
+
+    # A copy of the cache in another process (e.g. a worker for parallel finite differences)
+    # does not write the file.
+    monkeypatch.setattr("os.getpid", lambda: -1)
+    _put(cache, 30.0)
+    _put(cache, 40.0)
+    cache.save()
+    assert len(ComputeCache(5, file_path=file_path, signature="model")) == 2
@@ -15,8 +15,11 @@
 import os.path as pth
 from shutil import rmtree
 
+import numpy as np
+import pandas as pd
 import pytest
 from numpy.testing import assert_allclose
+from pandas.testing import assert_frame_equal
 from scipy.constants import foot, knot
 
 from fastoad._utils.testing import run_system
@@ -138,6 +141,68 @@ def test_mission_component(cleanup, with_dummy_plugin_2):
         problem["data:mission:operational:main_route:descent:distance"], 264451.0, atol=1.0
     )
 
+    flight_points = problem.model.component.flight_points
+    assert flight_points.name.dtype == "category"
+    part_boundaries = problem.model.component._mission_wrapper.part_boundaries
+    assert part_boundaries["operational"] == (0, len(flight_points) - 1)
+    assert part_boundaries["operational:main_route"] == (0, len(flight_points) - 1)
+    phase_names = ["initial_climb", "climb", "cruise", "descent"]
+    previous_end = 0
+    for phase_name in phase_names:
+        start, end = part_boundaries["operational:main_route:" + phase_name]
+        assert start == previous_end
+        assert (
+            flight_points.name.iloc[start + 1 : end + 1] == "operational:main_route:" + phase_name
+        ).all()
+        previous_end = end
+
+
+def test_mission_component_step_climb_cruise(cleanup, with_dummy_plugin_2, tmp_path):
+    input_file_path = pth.join(DATA_FOLDER_PATH, "test_mission.xml")
+    ivc = DataFile(input_file_path).to_ivc()
+
+    # Same mission as in test_mission.yml, with step climbs during cruise.
+    with open(pth.join(DATA_FOLDER_PATH, "test_mission.yml")) as mission_file:
+        mission_definition = mission_file.read()
+    cruise_definition = "      segment: cruise\n      engine_setting: cruise\n"
+    assert cruise_definition in mission_definition
+    mission_file_path = pth.join(tmp_path, "test_step_climb_mission.yml")
+    with open(mission_file_path, "w") as mission_file:
+        mission_file.write(
+            mission_definition.replace(
+                cruise_definition,
+                "      segment: step_climb_cruise\n"
+                "      engine_setting: cruise\n"
+                "      maximum_flight_level: 410.\n"
+                "      flight_level_step: 20.\n"
+                "      slice_count: 5\n",
+            )
+        )
+
+    problem = run_system(
+        MissionComponent(
+            propulsion_id="test.wrapper.propulsion.dummy_engine",
+            use_initializer_iteration=False,
+            mission_wrapper=MissionWrapper(mission_file_path),
+            mission_name="operational",
+            reference_area_variable="data:geometry:aircraft:reference_area",
+        ),
+        ivc,
+    )
+    flight_points = problem.model.component.flight_points
+    cruise_points = flight_points.loc[flight_points.name == "operational:main_route:cruise"]
+    cruise_altitudes = cruise_points["altitude [m]"].to_numpy()
+
+    assert_allclose(
+        problem["data:mission:operational:main_route:cruise:distance"], 3392590.0, rtol=1.0e-2
+    )
+    assert np.all(np.diff(cruise_altitudes) >= -1.0e-6)
+    assert np.max(cruise_altitudes) > cruise_altitudes[0] + 500.0
+    assert np.max(cruise_altitudes) <= 41000.0 * foot + 1.0e-6
+    assert np.all(cruise_points["thrust_rate [-]"] <= 1.0)
+    # Step climbs save fuel
+    assert problem["data:mission:operational:needed_block_fuel"] < 6590.0
+
 
 def test_mission_component_breguet(cleanup, with_dummy_plugin_2):
 
@@ -179,6 +244,89 @@ def test_mission_component_breguet(cleanup, with_dummy_plugin_2):
     )
 
 
+def test_mission_component_cache(cleanup, with_dummy_plugin_2):
+
+    input_file_path = pth.join(DATA_FOLDER_PATH, "test_mission.xml")
+    ivc = DataFile(input_file_path).to_ivc()
+    cache_file_path = pth.join(RESULTS_FOLDER_PATH, "mission_cache.pkl")
+
+    def get_component():
+        return MissionComponent(
+            propulsion_id="test.wrapper.propulsion.dummy_engine",
+            use_initializer_iteration=False,
+            mission_wrapper=MissionWrapper(pth.join(DATA_FOLDER_PATH, "test_mission.yml")),
+            mission_name="operational",
+            reference_area_variable="data:geometry:aircraft:reference_area",
+            cache_size=2,
+            cache_file=cache_file_path,
+        )
+
+    problem = run_system(get_component(), ivc)
+    compute_cache = problem.model.component.compute_cache
+    assert (compute_cache.hits, compute_cache.misses) == (0, 1)
+    needed_block_fuel = problem["data:mission:operational:needed_block_fuel"].copy()
+    flight_points = problem.model.component.flight_points
+
+    problem.run_model()
+    assert (compute_cache.hits, compute_cache.misses) == (1, 1)
+    assert_allclose(problem["data:mission:operational:needed_block_fuel"], needed_block_fuel)
+
+    problem["data:mission:operational:TOW"] += 100.0
+    problem.run_model()
+    assert (compute_cache.hits, compute_cache.misses) == (1, 2)
+    assert problem["data:mission:operational:needed_block_fuel"] > needed_block_fuel
+
+    # Stored results are saved at cleanup and reused in a new problem
+    problem.cleanup()
+    problem = run_system(get_component(), ivc)
+    compute_cache = problem.model.component.compute_cache
+    assert (compute_cache.hits, compute_cache.misses) == (1, 0)
+    assert_allclose(problem["data:mission:operational:needed_block_fuel"], needed_block_fuel)
+    assert_frame_equal(problem.model.component.flight_points, flight_points)
+
+
+def test_mission_component_separate_taxi_takeoff_partials(cleanup, with_dummy_plugin_2):
+
+    input_file_path = pth.join(DATA_FOLDER_PATH, "test_mission.xml")
+    ivc = DataFile(input_file_path).to_ivc()
+
+    problem = run_system(
+        MissionComponent(
+            propulsion_id="test.wrapper.propulsion.dummy_engine",
+            use_initializer_iteration=False,
+            mission_wrapper=MissionWrapper(pth.join(DATA_FOLDER_PATH, "test_mission.yml")),
+            mission_name="operational",
+            reference_area_variable="data:geometry:aircraft:reference_area",
+            separate_taxi_takeoff_partials=True,
+        ),
+        ivc,
+    )
+    component = problem.model.component
+    inputs = {name: problem[name] for name in component.get_io_metadata("input", [])}
+    partials = {}
+    component.compute_partials(inputs, partials)
+
+    taxi_out_fuel = problem["data:mission:operational:taxi_out:fuel"]
+    taxi_out_duration = problem["data:mission:operational:taxi_out:duration"]
+    for name in [
+        "data:mission:operational:taxi_out:fuel",
+        "data:mission:operational:needed_block_fuel",
+    ]:
+        assert_allclose(
+            partials[name, "data:mission:operational:taxi_out:duration"],
+            taxi_out_fuel / taxi_out_duration,
+            rtol=1.0e-4,
+        )
+        assert partials[name, "data:mission:operational:taxi_out:thrust_rate"] > 0.0
+    assert_allclose(
+        partials[
+            "data:mission:operational:taxi_out:distance",
+            "data:mission:operational:taxi_out:duration",
+        ],
+        0.0,
+    )
+
+
 def test_mission_group_without_loop(cleanup, with_dummy_plugin_2):
     input_file_path = pth.join(DATA_FOLDER_PATH, "test_mission.xml")
     ivc = DataFile(input_file_path).to_ivc()
@@ -317,3 +465,166 @@ def test_mission_group_breguet_with_loop(cleanup, with_dummy_plugin_2):
     assert_allclose(
         problem["data:mission:operational:needed_onboard_fuel_at_takeoff"], 5430.0, atol=1.0
     )
+
+
+def test_mission_component_complex_step(cleanup, with_dummy_plugin_2):
+    input_file_path = pth.join(DATA_FOLDER_PATH, "test_mission.xml")
+    ivc = DataFile(input_file_path).to_ivc()
+
+    problem = run_system(
+        MissionComponent(
+            propulsion_id="test.wrapper.propulsion.dummy_engine",
+            use_initializer_iteration=False,
+            mission_wrapper=MissionWrapper(pth.join(DATA_FOLDER_PATH, "test_mission.yml")),
+            mission_name="operational",
+            reference_area_variable="data:geometry:aircraft:reference_area",
+            partials_method="cs",
+        ),
+        ivc,
+    )
+    input_name = "data:propulsion:dummy_engine:max_sfc"
+    output_name = "data:mission:operational:needed_block_fuel"
+    max_sfc = problem[input_name].copy()
+
+    # Finite differences
+    step = 1.0e-3 * max_sfc
+    fuel = []
+    for value in [max_sfc + step, max_sfc - step]:
+        problem[input_name] = value
+        problem.run_model()
+        fuel.append(problem[output_name].copy())
+    finite_difference_derivative = (fuel[0] - fuel[1]) / (2.0 * step)
+
+    # Complex step
+    problem.set_complex_step_mode(True)
+    problem[input_name] = max_sfc + 1.0e-30j
+    problem.run_model()
+    complex_step_derivative = np.imag(problem[output_name]) / 1.0e-30
+    problem.set_complex_step_mode(False)
+
+    assert_allclose(complex_step_derivative, finite_difference_derivative, rtol=1.0e-3)
+
+
+def test_mission_component_parallel_fd(cleanup, with_dummy_plugin_2, monkeypatch):
+
+    input_file_path = pth.join(DATA_FOLDER_PATH, "test_mission.xml")
+    ivc = DataFile(input_file_path).to_ivc()
+
+    problem = run_system(
+        MissionComponent(
+            propulsion_id="test.wrapper.propulsion.dummy_engine",
+            use_initializer_iteration=False,
+            mission_wrapper=MissionWrapper(pth.join(DATA_FOLDER_PATH, "test_mission.yml")),
+            mission_name="operational",
+            reference_area_variable="data:geometry:aircraft:reference_area",
+            fd_workers=2,
+        ),
+        ivc,
+    )
+    component = problem.model.component
+    tow_name = "data:mission:operational:TOW"
+    fuel_name = "data:mission:operational:needed_block_fuel"
+
+    # Differentiating w.r.t. all inputs (including polar arrays) would be too long for a test.
+    monkeypatch.setattr(component, "_get_mission_inputs", lambda: [tow_name])
+    inputs = {name: problem[name] for name in component.get_io_metadata("input", [])}
+    # Outputs of run_model() are used as reference point.
+    assert component._get_last_outputs(inputs)[fuel_name] == problem[fuel_name]
+    partials = {}
+    try:
+        component.compute_partials(inputs, partials)
+    finally:
+        # Worker processes are stopped at cleanup.
+        problem.cleanup()
+        assert component._parallel_fd is None
+
+    step = 10.0
+    problem[tow_name] += step
+    problem.run_model()
+    upper_fuel = problem[fuel_name].copy()
+    problem[tow_name] -= 2.0 * step
+    problem.run_model()
+    lower_fuel = problem[fuel_name].copy()
+
+    assert_allclose(
+        partials[fuel_name, tow_name].item(),
+        (upper_fuel - lower_fuel).item() / (2.0 * step),
+        rtol=1.0e-2,
+    )
+
+
+def test_mission_component_summary_only(cleanup, with_dummy_plugin_2):
+
+    input_file_path = pth.join(DATA_FOLDER_PATH, "test_mission.xml")
+    ivc = DataFile(input_file_path).to_ivc()
+
+    def get_problem(summary_only, out_file):
+        return run_system(
+            MissionComponent(
+                propulsion_id="test.wrapper.propulsion.dummy_engine",
+                out_file=out_file,
+                use_initializer_iteration=False,
+                mission_wrapper=MissionWrapper(pth.join(DATA_FOLDER_PATH, "test_mission.yml")),
+                mission_name="operational",
+                reference_area_variable="data:geometry:aircraft:reference_area",
+                summary_only=summary_only,
+            ),
+            ivc,
+        )
+
+    full_out_file = pth.join(RESULTS_FOLDER_PATH, "full.csv")
+    full_problem = get_problem(False, full_out_file)
+    problem = get_problem(True, "")
+
+    for name in full_problem.model.component.get_io_metadata("output", []):
+        assert_allclose(problem[name], full_problem[name], err_msg=name)
+
+    component = problem.model.component
+    summary_points = component._flight_points
+    assert len(summary_points) < len(full_problem.model.component.flight_points) / 5
+
+    # Full flight points are computed on request
+    assert_frame_equal(component.flight_points, full_problem.model.component.flight_points)
+
+    # Full flight points are not computed at each computation for writing out_file, ...
+    out_file = pth.join(RESULTS_FOLDER_PATH, "summary_only.csv")
+    problem = get_problem(True, out_file)
+    problem.run_model()
+    assert not pth.exists(out_file)
+
+    # ... but only once, at cleanup
+    problem.cleanup()
+    assert pth.exists(out_file)
+    assert_frame_equal(
+        pd.read_csv(out_file, index_col=0),
+        pd.read_csv(full_out_file, index_col=0),
+    )
+
+
+def test_mission_component_propulsion_surrogate(cleanup, with_dummy_plugin_2):
+    input_file_path = pth.join(DATA_FOLDER_PATH, "test_mission.xml")
+    ivc = DataFile(input_file_path).to_ivc()
+
+    problem = run_system(
+        MissionComponent(
+            propulsion_id="test.wrapper.propulsion.dummy_engine",
+            use_initializer_iteration=False,
+            mission_wrapper=MissionWrapper(pth.join(DATA_FOLDER_PATH, "test_mission.yml")),
+            mission_name="operational",
+            reference_area_variable="data:geometry:aircraft:reference_area",
+            propulsion_surrogate={"thrust_rate_values": np.linspace(0.0, 1.0, 11)},
+        ),
+        ivc,
+    )
+    # Dummy engine is linear with respect to thrust rate, so the surrogate is exact.
+    assert_allclose(problem["data:mission:operational:needed_block_fuel"], 6590.0, atol=1.0)
+
+    # The surrogate is built again only if propulsion inputs change.
+    component = problem.model.component
+    surrogate = component._propulsion_surrogate
+    problem["data:mission:operational:TOW"] = problem["data:mission:operational:TOW"] - 100.0
+    problem.run_model()
+    assert component._propulsion_surrogate is surrogate
+    problem["data:propulsion:dummy_engine:max_thrust"] = 1.1e5
+    problem.run_model()
+    assert component._propulsion_surrogate is not surrogate
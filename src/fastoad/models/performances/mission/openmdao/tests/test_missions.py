@@ -0,0 +1,201 @@
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2022 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os.path as pth
+from unittest.mock import Mock
+
+import openmdao.api as om
+import pytest
+from numpy.testing import assert_allclose
+from pandas.testing import assert_frame_equal
+
+from fastoad._utils.testing import run_system
+from fastoad.io import DataFile
+from fastoad.openmdao.variables import Variable
+from ..missions import Missions, _MissionVariables
+from ...exceptions import FastMissionDependencyError
+
+DATA_FOLDER_PATH = pth.join(pth.dirname(__file__), "data")
+
+
+def _get_inputs(without_tow=False):
+    """
+    :return: inputs of test_mission.xml, where inputs of "operational" mission are also
+             provided for "unused" mission
+    """
+    variables = DataFile(pth.join(DATA_FOLDER_PATH, "test_mission.xml"))
+    if without_tow:
+        del variables["data:mission:operational:TOW"]
+    for variable in list(variables):
+        if variable.name.startswith("data:mission:operational:"):
+            variables.append(
+                Variable(
+                    variable.name.replace(":operational:", ":unused:"),
+                    **variable.metadata,
+                )
+            )
+    return variables.to_ivc()
+
+
+def _get_missions_definition(**kwargs):
+    common_options = dict(
+        propulsion_id="test.wrapper.propulsion.dummy_engine",
+        mission_file_path=pth.join(DATA_FOLDER_PATH, "test_mission.yml"),
+        reference_area_variable="data:geometry:aircraft:reference_area",
+    )
+    common_options.update(kwargs)
+    return {
+        "operational_mission": dict(common_options, mission_name="operational"),
+        "unused_mission": dict(common_options, mission_name="unused"),
+    }
+
+
+@pytest.mark.parametrize("summary_only", [False, True])
+def test_missions(with_dummy_plugin_2, summary_only):
+    ivc = _get_inputs()
+
+    problems = []
+    for max_workers in [0, 2]:
+        group = Missions(
+            missions=_get_missions_definition(
+                use_initializer_iteration=False, adjust_fuel=False, summary_only=summary_only
+            ),
+            max_workers=max_workers,
+        )
+        try:
+            problems.append(run_system(group, ivc))
+            assert group.waves == [["operational_mission", "unused_mission"]]
+            flight_points = group.flight_points
+        finally:
+            group.shutdown()
+        assert set(flight_points) == {"operational_mission", "unused_mission"}
+        problems[-1].flight_points = flight_points
+
+    sequential_problem, parallel_problem = problems
+    assert_allclose(
+        parallel_problem["data:mission:operational:needed_block_fuel"], 6590.0, atol=1.0
+    )
+    for name in [
+        "data:mission:operational:needed_block_fuel",
+        "data:mission:operational:block_fuel",
+        "data:mission:unused:needed_block_fuel",
+        "data:mission:unused:taxi_out:fuel",
+    ]:
+        assert_allclose(parallel_problem[name], sequential_problem[name])
+    for name in ["operational_mission", "unused_mission"]:
+        assert_frame_equal(
+            parallel_problem.flight_points[name], sequential_problem.flight_points[name]
+        )
+
+
+def test_missions_with_loop(with_dummy_plugin_2):
+    ivc = _get_inputs(without_tow=True)
+
+    problems = []
+    for max_workers in [0, 2]:
+        group = Missions(
+            missions=_get_missions_definition(add_solver=True), max_workers=max_workers
+        )
+        try:
+            problems.append(run_system(group, ivc))
+        finally:
+            group.shutdown()
+
+    sequential_problem, parallel_problem = problems
+    for mission_name in ["operational", "unused"]:
+        assert_allclose(
+            parallel_problem[f"data:mission:{mission_name}:TOW"],
+            parallel_problem[f"data:mission:{mission_name}:ZFW"]
+            + parallel_problem[f"data:mission:{mission_name}:onboard_fuel_at_takeoff"],
+            atol=1.0,
+        )
+        for name in ["TOW", "needed_block_fuel", "needed_onboard_fuel_at_takeoff"]:
+            assert_allclose(
+                parallel_problem[f"data:mission:{mission_name}:{name}"],
+                sequential_problem[f"data:mission:{mission_name}:{name}"],
+            )
+    assert_allclose(
+        parallel_problem["data:mission:operational:needed_block_fuel"], 5683.0, atol=1.0
+    )
+
+
+def test_missions_recording(with_dummy_plugin_2, tmp_path):
+    ivc = _get_inputs()
+
+    results = []
+    for max_workers in [0, 2]:
+        group = Missions(
+            missions=_get_missions_definition(adjust_fuel=False), max_workers=max_workers
+        )
+        problem = om.Problem()
+        problem.model.add_subsystem("inputs", ivc, promotes=["*"])
+        problem.model.add_subsystem("missions", group, promotes=["*"])
+        problem.setup()
+        recorder_path = str(tmp_path / f"cases_{max_workers}.sql")
+        recorder = om.SqliteRecorder(recorder_path)
+        mission = group.operational_mission
+        component = mission.mission_computation
+        mission.add_recorder(recorder)
+        component.add_recorder(recorder)
+        try:
+            problem.run_model()
+        finally:
+            group.shutdown()
+        problem.cleanup()
+
+        # Option is not modified
+        assert component.options["use_initializer_iteration"]
+        cases = om.CaseReader(recorder_path).list_cases(out_stream=None)
+        results.append(
+            (
+                mission.iter_count,
+                component.iter_count_without_approx,
+                len(cases),
+                problem["data:mission:operational:needed_block_fuel"],
+            )
+        )
+
+    sequential_result, parallel_result = results
+    assert sequential_result[:3] == (1, 1, 2)
+    assert parallel_result[:3] == sequential_result[:3]
+    assert_allclose(parallel_result[3], sequential_result[3])
+
+
+def test_missions_under_mpi(with_dummy_plugin_2):
+    group = Missions(missions={})
+    variables = {
+        "a": _MissionVariables({"x": ("c.x", None)}, ["y1"]),
+        "b": _MissionVariables({"x": ("c.x", None)}, ["y2"]),
+    }
+    group.comm = Mock(size=2, allgather=lambda local_variables: [local_variables, variables])
+    group.configure()
+    assert group.waves == [[]]
+
+    variables["b"].inputs["y1"] = ("c.y1", None)
+    with pytest.raises(FastMissionDependencyError):
+        group.configure()
+
+
+def test_missions_order():
+    group = Missions(missions={})
+    group._mission_variables = {
+        "a": _MissionVariables({"x": ("c.x", None), "y2": ("c.y2", None)}, ["y1"]),
+        "b": _MissionVariables({"x": ("c.x", None)}, ["y2"]),
+        "c": _MissionVariables({"y1": ("c.y1", None)}, ["y3"]),
+        "d": _MissionVariables({"x": ("c.x", None)}, ["y4"]),
+    }
+    assert group._get_waves() == [["b", "d"], ["a"], ["c"]]
+
+    group._mission_variables["b"].inputs["y3"] = ("c.y3", None)
+    with pytest.raises(FastMissionDependencyError):
+        group._get_waves()
@@ -12,8 +12,13 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from bisect import bisect_right
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+
+import numpy as np
 from numpy import ndarray
-from scipy.interpolate import interp1d
+from scipy.interpolate import PPoly, make_interp_spline
 from scipy.optimize import fmin
 
 
@@ -28,17 +33,18 @@ class Polar:
 
         Once defined, for any CL value, CD can be obtained using :meth:`cd`.
 
+        CD is obtained by quadratic spline interpolation (with extrapolation outside of
+        definition range). The spline is stored as piecewise polynomial coefficients,
+        that are computed once for all Polar instances with same CL and CD values.
+
+        CL and CD values may be complex (as when using complex step). Imaginary parts are
+        then propagated analytically to polynomial coefficients and to optimal CL.
+
         :param cl: a N-elements array with CL values
         :param cd: a N-elements array with CD values that match CL
         """
         self._definition_CL = cl
-        self._cd = interp1d(cl, cd, kind="quadratic", fill_value="extrapolate")
-
-        def _negated_lift_drag_ratio(lift_coeff):
-            """Returns -CL/CD."""
-            return -lift_coeff / self.cd(lift_coeff)
-
-        self._optimal_CL = fmin(_negated_lift_drag_ratio, cl[0], disp=0)
+        self._compiled = _get_compiled_polar(cl, cd)
 
     @property
     def definition_cl(self):
@@ -48,7 +54,7 @@ class Polar:
     @property
     def optimal_cl(self):
         """The CL value that provides larger lift/drag ratio."""
-        return self._optimal_CL
+        return self._compiled.optimal_cl
 
     def cd(self, cl=None):
         """
@@ -59,5 +65,229 @@ class Polar:
         :return: CD values for each provide CL values
         """
         if cl is None:
-            return self._cd(self._definition_CL)
-        return self._cd(cl)
+            cl = self._definition_CL
+
+        compiled = self._compiled
+        # Complex polars are processed with numpy.
+        if isinstance(cl, float) and compiled.breakpoints.dtype == float:
+            # Scalar values are processed without numpy, which is much faster.
+            index = min(max(bisect_right(compiled.breakpoint_list, cl) - 1, 0), compiled.size - 1)
+            a, b, c = compiled.coefficient_lists[index]
+            delta = cl - compiled.breakpoint_list[index]
+            return (a * delta + b) * delta + c
+
+        cl = np.asarray(cl)
+        index = np.clip(
+            np.searchsorted(np.real(compiled.breakpoints), np.real(cl), side="right") - 1,
+            0,
+            compiled.size - 1,
+        )
+        a, b, c = compiled.coefficients[:, index]
+        delta = cl - compiled.breakpoints[index]
+        return (a * delta + b) * delta + c
+
+
+class _CompiledPolar(NamedTuple):
+    """Piecewise quadratic polynomials that define CD, and derived data."""
+
+    #: Start of each interval.
+    breakpoints: ndarray
+    #: Coefficients of polynomials (highest degree first, shape (3, size)), relative to
+    #: start of interval.
+    coefficients: ndarray
+    #: Same as breakpoints, as list.
+    breakpoint_list: list
+    #: Same as coefficients, as list of (a, b, c) tuples.
+    coefficient_lists: list
+    #: Number of intervals.
+    size: int
+    #: CL value for maximum lift/drag ratio.
+    optimal_cl: float
+
+
+def _get_compiled_polar(cl: ndarray, cd: ndarray) -> _CompiledPolar:
+    """
+    Provides the compiled polar for provided CL and CD values.
+
+    Compiled polars are cached with values of CL and CD as key.
+
+    If CL or CD values are complex, the returned polar has complex breakpoints and
+    coefficients, and is not cached.
+    """
+    cl = np.asarray(cl).ravel()
+    cd = np.asarray(cd).ravel()
+    real_cl = np.real(cl).astype(float)
+    real_cd = np.real(cd).astype(float)
+    compiled = _compile_polar(real_cl.tobytes(), real_cd.tobytes())
+    if not (np.iscomplexobj(cl) or np.iscomplexobj(cd)):
+        return compiled
+
+    imag_cl = np.imag(cl) * np.ones_like(real_cl)
+    imag_cd = np.imag(cd) * np.ones_like(real_cd)
+    if not (np.any(imag_cl) or np.any(imag_cd)):
+        return compiled
+
+    # Imaginary parts are propagated through the spline fitting with complex arithmetic.
+    cl = real_cl + 1j * imag_cl
+    cd = real_cd + 1j * imag_cd
+    breakpoints, coefficients = _get_spline_coefficients(cl, cd)
+    breakpoints = compiled.breakpoints + 1j * np.imag(breakpoints)
+    coefficients = compiled.coefficients + 1j * np.imag(coefficients)
+    return _CompiledPolar(
+        breakpoints=breakpoints,
+        coefficients=coefficients,
+        breakpoint_list=breakpoints.tolist(),
+        coefficient_lists=[tuple(column) for column in coefficients.T.tolist()],
+        size=compiled.size,
+        optimal_cl=_get_optimal_cl(
+            breakpoints,
+            coefficients,
+            cl[0],
+            cl[np.argmin(real_cl)],
+            cl[np.argmax(real_cl)],
+        ),
+    )
+
+
+def _get_spline_coefficients(cl: ndarray, cd: ndarray) -> Tuple[ndarray, ndarray]:
+    """
+    Computes, with complex arithmetic, the same piecewise polynomials as
+    :func:`_compile_polar`.
+
+    The quadratic spline has the knots of :func:`scipy.interpolate.make_interp_spline`:
+    first CL value and middles of CL intervals, except the first and last ones.
+    On each interval, polynomial coefficients are obtained by solving the equations of
+    interpolation of CD values, and of continuity of CD and of its derivative at knots.
+
+    :param cl: CL values
+    :param cd: CD values that match CL
+    :return: start of each interval, and polynomial coefficients with shape (3, size)
+    """
+    order = np.argsort(np.real(cl))
+    cl = cl[order]
+    cd = cd[order]
+    middles = (cl[1:] + cl[:-1]) / 2.0
+    breakpoints = np.concatenate([cl[:1], middles[1:-1]])
+    widths = np.diff(np.append(breakpoints, cl[-1]))
+    size = breakpoints.size
+
+    # Unknowns are (a, b, c) of each interval, for a * delta**2 + b * delta + c.
+    matrix = np.zeros((3 * size, 3 * size), dtype=complex)
+    rhs = np.zeros(3 * size, dtype=complex)
+
+    rows = np.arange(cl.size)
+    index = np.clip(
+        np.searchsorted(np.real(breakpoints), np.real(cl), side="right") - 1, 0, size - 1
+    )
+    delta = cl - breakpoints[index]
+    matrix[rows, 3 * index] = delta ** 2
+    matrix[rows, 3 * index + 1] = delta
+    matrix[rows, 3 * index + 2] = 1.0
+    rhs[rows] = cd
+
+    index = np.arange(size - 1)
+    rows = cl.size + 2 * index
+    matrix[rows, 3 * index] = widths[:-1] ** 2
+    matrix[rows, 3 * index + 1] = widths[:-1]
+    matrix[rows, 3 * index + 2] = 1.0
+    matrix[rows, 3 * index + 5] = -1.0
+    matrix[rows + 1, 3 * index] = 2.0 * widths[:-1]
+    matrix[rows + 1, 3 * index + 1] = 1.0
+    matrix[rows + 1, 3 * index + 4] = -1.0
+
+    coefficients = np.linalg.solve(matrix, rhs).reshape((size, 3)).T
+    return breakpoints, coefficients
+
+
+@lru_cache(maxsize=128)
+def _compile_polar(cl_bytes: bytes, cd_bytes: bytes) -> _CompiledPolar:
+    """
+    Computes the piecewise polynomials that define CD.
+
+    They are the same as the quadratic spline that is used by
+    :class:`scipy.interpolate.interp1d` with :code:`kind="quadratic"`.
+
+    :param cl_bytes: CL values as bytes of a float numpy array
+    :param cd_bytes: CD values as bytes of a float numpy array
+    """
+    cl = np.frombuffer(cl_bytes)
+    cd = np.frombuffer(cd_bytes)
+    order = np.argsort(cl)
+    spline = make_interp_spline(cl[order], cd[order], k=2)
+    piecewise_poly = PPoly.from_spline(spline)
+
+    # Knots of the spline are repeated at both ends. Null intervals are removed.
+    is_used = np.diff(piecewise_poly.x) > 0.0
+    breakpoints = piecewise_poly.x[:-1][is_used]
+    coefficients = piecewise_poly.c[:, is_used]
+
+    return _CompiledPolar(
+        breakpoints=breakpoints,
+        coefficients=coefficients,
+        breakpoint_list=breakpoints.tolist(),
+        coefficient_lists=[tuple(column) for column in coefficients.T.tolist()],
+        size=breakpoints.size,
+        optimal_cl=_get_optimal_cl(breakpoints, coefficients, cl[0], cl.min(), cl.max()),
+    )
+
+
+def _get_optimal_cl(
+    breakpoints: ndarray, coefficients: ndarray, first_cl: float, min_cl: float, max_cl: float
+) -> float:
+    """
+    Computes the CL value in [min_cl, max_cl] that gives the maximum lift/drag ratio.
+
+    On each interval, CD = A*CL**2 + B*CL + C, and d(CL/CD)/dCL = 0 when CL**2 = C/A.
+    Candidate values are these stationary points and the interval bounds.
+
+    Provided values may be complex. Candidates are then compared on their real part, and
+    the imaginary part of the chosen one is kept.
+
+    If the polar is degenerate, i.e. CD is not strictly positive or lift/drag ratio is
+    constant, the maximum is not well-defined. A local optimizer is then used from first_cl,
+    on real parts.
+    """
+    a, b, c = coefficients
+    # Polynomial coefficients relative to CL = 0.
+    global_b = b - 2.0 * a * breakpoints
+    global_c = (a * breakpoints - b) * breakpoints + c
+    interval_starts = np.real(breakpoints)
+    interval_ends = np.append(interval_starts[1:], np.real(max_cl))
+
+    def compute_cd(cl):
+        index = np.clip(
+            np.searchsorted(interval_starts, np.real(cl), side="right") - 1, 0, a.size - 1
+        )
+        return (a[index] * cl + global_b[index]) * cl + global_c[index]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        stationary_cl = np.sqrt(global_c / a)
+        cd_vertex_cl = -global_b / (2.0 * a)
+    is_stationary_inside = (
+        (np.real(a) > 0.0)
+        & (np.real(global_c) >= 0.0)
+        & (np.real(stationary_cl) >= interval_starts)
+        & (np.real(stationary_cl) <= interval_ends)
+    )
+    is_vertex_inside = (
+        (np.real(a) != 0.0)
+        & (np.real(cd_vertex_cl) >= interval_starts)
+        & (np.real(cd_vertex_cl) <= interval_ends)
+    )
+
+    bounds = np.concatenate([breakpoints, [max_cl]])
+    bounds = bounds[(np.real(bounds) >= np.real(min_cl)) & (np.real(bounds) <= np.real(max_cl))]
+    candidate_cl = np.concatenate([bounds, stationary_cl[is_stationary_inside]])
+    candidate_cd = compute_cd(candidate_cl)
+    minimum_cd = np.min(
+        np.real(compute_cd(np.concatenate([bounds, cd_vertex_cl[is_vertex_inside]])))
+    )
+
+    if minimum_cd > 0.0:
+        lift_drag_ratio = np.real(candidate_cl / candidate_cd)
+        if not np.allclose(lift_drag_ratio, lift_drag_ratio[0], rtol=1.0e-9):
+            return candidate_cl[np.argmax(lift_drag_ratio)].item()
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        optimal_cl = fmin(lambda cl: -cl / np.real(compute_cd(cl)), np.real(first_cl), disp=0)
+    return float(optimal_cl[0])
@@ -14,17 +14,17 @@ Classes for computation of routes (i.e. assemblies of climb, cruise and descent
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from dataclasses import dataclass
+from copy import deepcopy
+from dataclasses import astuple, dataclass
 from typing import List, Optional, Tuple
 
 import numpy as np
-import pandas as pd
-from scipy.optimize import root_scalar
 
 from fastoad.model_base import FlightPoint
 from fastoad.models.performances.mission.base import FlightSequence, IFlightPart
 from fastoad.models.performances.mission.segments.base import FlightSegment
 from fastoad.models.performances.mission.segments.cruise import CruiseSegment
+from fastoad.models.performances.mission.trajectory import TrajectoryBuffer
 
 
 @dataclass
@@ -100,16 +100,33 @@ class RangedRoute(SimpleRoute):
     #: Target ground distance for whole route
     flight_distance: float
 
-    #: Accuracy on actual total ground distance for the solver. In meters
+    #: Accuracy on cruise distance for the solver. In meters
     distance_accuracy: float = 0.5e3
 
+    #: Initial guess of cruise distance for the solver, e.g. the solution of a previous
+    #: computation (see :attr:`solved_cruise_distance`). If not provided, half and quarter of
+    #: :attr:`flight_distance` are used as starting points. In meters.
+    cruise_distance_guess: Optional[float] = None
+
+    #: Maximum number of iterations for the solver.
+    maximum_iterations: int = 50
+
     def __post_init__(self):
         super().__post_init__()
 
-        # We will use this to keep data along root_scalar process (see _solve_cruise_distance() )
-        self._flight_points = None
+        # We will use this to keep data along solver process (see _solve_cruise_distance() )
+        self._climb_end = None
+        self._solved_cruise_distance = None
 
-    def compute_from(self, start: FlightPoint) -> pd.DataFrame:
+    @property
+    def solved_cruise_distance(self) -> Optional[float]:
+        """
+        Cruise distance that has been obtained by the solver in last computation, or None if
+        the solver has not been used.
+        """
+        return self._solved_cruise_distance
+
+    def compute_into(self, start: FlightPoint, trajectory: TrajectoryBuffer):
         # In very simple cases, climb and descent phases can have fixed
         # covered ground distance. In that case, cruise distance is easy to
         # obtain from flight_distance.
@@ -119,10 +136,11 @@ class RangedRoute(SimpleRoute):
             climb_descent_distances.extend(self._get_ground_distances(phase))
 
         if 0.0 in climb_descent_distances:
-            return self._solve_cruise_distance(start)
+            self._solve_cruise_distance(start, trajectory)
+            return
 
         self.cruise_distance = self.flight_distance - np.sum(climb_descent_distances)
-        return super().compute_from(start)
+        super().compute_into(start, trajectory)
 
     @classmethod
     def _get_ground_distances(cls, phase: FlightSequence) -> list:
@@ -135,35 +153,158 @@ class RangedRoute(SimpleRoute):
 
         return ground_distances
 
-    def _solve_cruise_distance(self, start: FlightPoint) -> pd.DataFrame:
+    def _solve_cruise_distance(self, start: FlightPoint, trajectory: TrajectoryBuffer):
         """
         Adjusts cruise distance through a solver to have whole route that
         matches provided flight distance.
-        """
 
-        root_scalar(
-            self._compute_flight,
-            args=(start,),
-            x0=self.flight_distance * 0.5,
-            x1=self.flight_distance * 0.25,
-            xtol=0.5e3,
-            method="secant",
-        )
+        Climb phases do not depend on cruise distance, so their result is reused along
+        iterations, that compute only cruise and descent phases (see :meth:`_compute_climb`).
+
+        A secant method is used. It starts from half and quarter of :attr:`flight_distance`,
+        or, if :attr:`cruise_distance_guess` is provided, from this guess and from a second
+        point that assumes that a change of cruise distance gives the same change of total
+        distance. Iterations stop as soon as the cruise distance change is within
+        :attr:`distance_accuracy`.
 
-        return self._flight_points
+        Starting points do not depend on previous computations, so that the result only
+        depends on route inputs.
 
-    def _compute_flight(self, cruise_distance, start: FlightPoint):
+        Each iteration truncates `trajectory` back to the end of climb before computing
+        cruise and descent phases.
+        """
+        self._climb_end = None
+        base_size = len(trajectory)
+
+        # The solver works on real parts. With complex step, the imaginary part is processed
+        # afterwards, from the last computed flight.
+        cruise_distance = self.cruise_distance_guess
+        if cruise_distance is None:
+            cruise_distance = self.flight_distance * 0.5
+        distance_error = self._compute_flight(cruise_distance, start, trajectory, base_size)
+        secant_points = [(cruise_distance, np.real(distance_error))]
+
+        if self.cruise_distance_guess is None:
+            cruise_distance = self.flight_distance * 0.25
+        else:
+            cruise_distance = cruise_distance + np.real(distance_error)
+        distance_error = self._compute_flight(cruise_distance, start, trajectory, base_size)
+        secant_points.append((cruise_distance, np.real(distance_error)))
+
+        # As in scipy implementation of secant method, the point with the smallest error is
+        # used as first point.
+        secant_points.sort(key=lambda point: np.abs(point[1]))
+
+        for _ in range(self.maximum_iterations):
+            cruise_distance_0, distance_error_0 = secant_points[0]
+            cruise_distance_1, distance_error_1 = secant_points[1]
+            if distance_error_1 == distance_error_0:
+                break
+            step = (
+                distance_error_1
+                * (cruise_distance_0 - cruise_distance_1)
+                / (distance_error_1 - distance_error_0)
+            )
+            if np.abs(step) <= self.distance_accuracy:
+                break
+
+            cruise_distance = cruise_distance_1 + step
+            distance_error = self._compute_flight(cruise_distance, start, trajectory, base_size)
+            secant_points = [
+                (cruise_distance_1, distance_error_1),
+                (cruise_distance, np.real(distance_error)),
+            ]
+
+        if np.imag(distance_error) != 0.0:
+            # With complex step, the imaginary part of distance error is cancelled so that
+            # cruise distance carries the derivative of the solution. The first correction
+            # assumes a unit slope, and the second one uses the slope it reveals.
+            imaginary_step = 1j * np.imag(distance_error)
+            cruise_distance = cruise_distance + imaginary_step
+            previous_distance_error = distance_error
+            distance_error = self._compute_flight(cruise_distance, start, trajectory, base_size)
+            slope = (np.imag(previous_distance_error) - np.imag(distance_error)) / np.imag(
+                imaginary_step
+            )
+            if slope != 0.0:
+                cruise_distance = cruise_distance + 1j * np.imag(distance_error) / slope
+                self._compute_flight(cruise_distance, start, trajectory, base_size)
+
+        self._solved_cruise_distance = cruise_distance
+
+    def _compute_flight(
+        self, cruise_distance, start: FlightPoint, trajectory: TrajectoryBuffer, base_size: int
+    ):
         """
         Computes flight for provided cruise distance
 
         :param cruise_distance:
         :param start:
+        :param trajectory: the buffer where flight points are appended
+        :param base_size: the length of `trajectory` before computation of the route
         :return: difference between computes distance and self.flight_distance
         """
         self.cruise_distance = cruise_distance
-        self._flight_points = super().compute_from(start)
-        obtained_distance = (
-            self._flight_points.iloc[-1].ground_distance
-            - self._flight_points.iloc[0].ground_distance
+        start_row = max(base_size - 1, 0)
+
+        self._compute_climb(start, trajectory, base_size)
+        self._compute_parts(
+            [self.cruise_segment] + self.descent_phases,
+            deepcopy(trajectory[-1]),
+            trajectory,
+            start_row,
         )
+        obtained_distance = trajectory[-1].ground_distance - trajectory[start_row].ground_distance
         return self.flight_distance - obtained_distance
+
+    def _compute_climb(self, start: FlightPoint, trajectory: TrajectoryBuffer, base_size: int):
+        """
+        Computes climb phases into `trajectory`, or restores the result of previous computation.
+
+        In both cases, `trajectory` ends with the last climb flight point, and
+        :attr:`part_boundaries` contains only the ones of climb phases.
+
+        Some segments modify their target during computation (e.g. a climb to optimal flight
+        level keeps the obtained altitude as target), so they can give a different result
+        when computed again. Therefore, the climb result is kept only once a computation
+        leaves the segment targets unchanged.
+
+        :param start:
+        :param trajectory: the buffer where flight points are appended
+        :param base_size: the length of `trajectory` before computation of the route
+        """
+        if self._climb_end is not None:
+            climb_size, climb_end, climb_boundaries = self._climb_end
+            # The last climb flight point may have been completed when adding next parts, so
+            # it is restored from a copy.
+            trajectory.truncate(climb_size - 1)
+            trajectory.append(deepcopy(climb_end))
+            self._part_boundaries = dict(climb_boundaries)
+            return
+
+        trajectory.truncate(base_size)
+        self._part_boundaries = {}
+        targets = self._get_climb_targets()
+        self._compute_parts(self.climb_phases, start, trajectory, max(base_size - 1, 0))
+        if all(
+            np.array_equal(value, new_value)
+            for target, new_target in zip(targets, self._get_climb_targets())
+            for value, new_value in zip(target, new_target)
+        ):
+            self._climb_end = (
+                len(trajectory),
+                deepcopy(trajectory[-1]),
+                dict(self._part_boundaries),
+            )
+
+    def _get_climb_targets(self) -> List[tuple]:
+        """Field values of targets of all climb segments."""
+        segments = list(self.climb_phases)
+        targets = []
+        while segments:
+            segment = segments.pop(0)
+            if isinstance(segment, FlightSequence):
+                segments = segment.flight_sequence + segments
+            elif isinstance(segment, FlightSegment):
+                targets.append(astuple(segment.target))
+        return targets
@@ -17,9 +17,8 @@ from copy import copy
 from dataclasses import dataclass
 from typing import List, Tuple
 
-import pandas as pd
+import numpy as np
 from scipy.constants import foot, g
-from stdatm import AtmosphereSI
 
 from fastoad.model_base import FlightPoint
 from .base import ManualThrustSegment
@@ -80,7 +79,7 @@ class AltitudeChangeSegment(ManualThrustSegment, mission_file_keyword="altitude_
     #: with max lift/drag ratio.
     OPTIMAL_FLIGHT_LEVEL = "optimal_flight_level"  # pylint: disable=invalid-name # used as constant
 
-    def compute_from(self, start: FlightPoint) -> pd.DataFrame:
+    def _prepare_start(self, start: FlightPoint) -> FlightPoint:
         self.complete_flight_point(start)  # needed to ensure all speed values are computed.
 
         if self.target.altitude is not None:
@@ -98,7 +97,7 @@ class AltitudeChangeSegment(ManualThrustSegment, mission_file_keyword="altitude_
                 self.target.CL = None
                 self.interrupt_if_getting_further_from_target = True
 
-        atm = AtmosphereSI(start.altitude)
+        atm = self._get_atmosphere(start.altitude)
         if self.target.equivalent_airspeed == self.CONSTANT_VALUE:
             atm.equivalent_airspeed = start.equivalent_airspeed
             start.true_airspeed = atm.true_airspeed
@@ -106,16 +105,35 @@ class AltitudeChangeSegment(ManualThrustSegment, mission_file_keyword="altitude_
             atm.mach = start.mach
             start.true_airspeed = atm.true_airspeed
 
-        return super().compute_from(start)
+        return super()._prepare_start(start)
+
+    def _can_compute_batch(self) -> bool:
+        # Optimal altitude is computed with a scalar solver.
+        return super()._can_compute_batch() and not (
+            isinstance(self.target.altitude, str) or isinstance(self.target.CL, str)
+        )
 
     def get_distance_to_target(self, flight_points: List[FlightPoint]) -> float:
         current = flight_points[-1]
 
         # Max flight level is first priority
         max_authorized_altitude = self.maximum_flight_level * 100.0 * foot
-        if current.altitude >= max_authorized_altitude:
+        above_max_altitude = np.real(current.altitude) >= max_authorized_altitude
+        if np.all(above_max_altitude):
             return max_authorized_altitude - current.altitude
 
+        distance = self._get_distance_to_target(flight_points)
+        if np.any(above_max_altitude):
+            # Can happen only when several flight points are computed at once.
+            return np.where(
+                above_max_altitude, max_authorized_altitude - current.altitude, distance
+            )
+        return distance
+
+    def _get_distance_to_target(self, flight_points: List[FlightPoint]) -> float:
+        """Distance to target, without consideration of maximum flight level."""
+        current = flight_points[-1]
+
         if self.target.CL:
             # Optimal altitude is based on a target Mach number, though target speed
             # may be specified as TAS or EAS. If so, Mach number has to be computed
@@ -129,7 +147,7 @@ class AltitudeChangeSegment(ManualThrustSegment, mission_file_keyword="altitude_
                     setattr(target_speed, speed_param, getattr(flight_points[0], speed_param))
 
             # Now, let's compute target Mach number
-            atm = AtmosphereSI(max(self.target.altitude, current.altitude))
+            atm = self._get_atmosphere(max(self.target.altitude, current.altitude, key=np.real))
             if target_speed.equivalent_airspeed:
                 atm.equivalent_airspeed = target_speed.equivalent_airspeed
                 target_speed.true_airspeed = atm.true_airspeed
@@ -14,22 +14,30 @@
 
 import logging
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import List, Tuple
+from copy import copy, deepcopy
+from dataclasses import dataclass, fields
+from typing import List, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 from aenum import Enum, extend_enum
 from scipy.constants import g
-from scipy.optimize import root_scalar
+from scipy.optimize import brentq, root_scalar
 from stdatm import AtmosphereSI
+from stdatm.state_parameters import (
+    GAMMA,
+    SEA_LEVEL_PRESSURE,
+    SEA_LEVEL_TEMPERATURE,
+    TROPOPAUSE,
+)
 
 from fastoad.constants import EngineSetting
 from fastoad.model_base import FlightPoint
-from fastoad.model_base.propulsion import IPropulsion
+from fastoad.model_base.propulsion import BatchPropulsionAdapter, IPropulsion
 from fastoad.models.performances.mission.polar import Polar
 from ..base import IFlightPart
 from ..exceptions import FastFlightSegmentIncompleteFlightPoint
+from ..trajectory import TrajectoryBuffer, TrajectoryView
 
 _LOGGER = logging.getLogger(__name__)  # Logger for this module
 
@@ -130,6 +138,28 @@ class FlightSegment(IFlightPart):
     #: between two iterations (which can mean the provided thrust rate is not adapted).
     interrupt_if_getting_further_from_target: bool = True
 
+    #: If True, the time step is adapted at each iteration so that the estimated local
+    #: error on mass, altitude, ground distance and true airspeed stays within tolerance.
+    #: :attr:`time_step` is then used as initial time step.
+    adaptive_time_step: bool = False
+
+    #: Relative tolerance on local error, used if :attr:`adaptive_time_step` is True.
+    relative_tolerance: float = 1.0e-5
+
+    #: Absolute tolerance on local error (in SI units), used if :attr:`adaptive_time_step`
+    #: is True.
+    absolute_tolerance: float = 1.0
+
+    #: Maximum time step in seconds, used if :attr:`adaptive_time_step` is True.
+    maximum_time_step: float = 600.0
+
+    #: Atmosphere model: "isa" for ISA laws, or "tabulated" for linear interpolation of
+    #: ISA temperature and pressure in precomputed tables, which is faster.
+    atmosphere: str = "isa"
+
+    #: Temperature increment in K, applied to the whole temperature profile.
+    delta_isa: float = 0.0
+
     #: Using this value will tell to keep the associated parameter constant.
     CONSTANT_VALUE = "constant"  # pylint: disable=invalid-name # used as constant
 
@@ -157,45 +187,67 @@ class FlightSegment(IFlightPart):
         :return: a pandas DataFrame where columns names match fields of
                  :meth:`~fastoad.model_base.flight_point.FlightPoint`
         """
+        flight_points = TrajectoryBuffer()
+        self._integrate_into(start, flight_points)
+        return flight_points.to_dataframe()
+
+    def compute_into(self, start: FlightPoint, trajectory: TrajectoryBuffer):
+        """
+        Computes the flight path segment from provided start point, and appends obtained flight
+        points to `trajectory`.
+
+        Computed flight points are directly written in `trajectory`
+        (see :meth:`~fastoad.models.performances.mission.base.IFlightPart.compute_into`).
+
+        :param start: the initial flight point (see :meth:`compute_from`)
+        :param trajectory: the buffer where flight points are appended
+        """
+        if type(self).compute_from is not FlightSegment.compute_from:
+            # Segments that overload compute_from() are assembled from their result.
+            super().compute_into(start, trajectory)
+        else:
+            self._integrate_into(start, trajectory)
+
+    def _integrate_into(self, start: FlightPoint, trajectory: TrajectoryBuffer):
+        """
+        Does the time-step integration of the segment, with flight points directly written
+        in `trajectory`.
+
+        :param start: the initial flight point (see :meth:`compute_from`)
+        :param trajectory: the buffer where flight points are appended
+        """
         if start.time is None:
             start.time = 0.0
         if start.ground_distance is None:
             start.ground_distance = 0.0
 
+        start = self._prepare_start(start)
         self.complete_flight_point(start)
 
-        flight_points = [start]
+        is_first_part = len(trajectory) == 0
+        if is_first_part:
+            trajectory.append(start)
+        flight_points = trajectory.view(start)
 
         previous_point_to_target = self.get_distance_to_target(flight_points)
         tol = 1.0e-5  # Such accuracy is not needed, but ensures reproducibility of results.
+        time_step = next_time_step = self.time_step
         while np.abs(previous_point_to_target) > tol:
-            self._add_new_flight_point(flight_points, self.time_step)
+            if self.adaptive_time_step:
+                time_step, next_time_step = self._add_adapted_flight_point(
+                    flight_points, next_time_step
+                )
+            else:
+                self._add_new_flight_point(flight_points, time_step)
             last_point_to_target = self.get_distance_to_target(flight_points)
 
-            if last_point_to_target * previous_point_to_target < 0.0:
+            # Real parts are used for comparisons, as values may be complex (complex step).
+            if np.real(last_point_to_target * previous_point_to_target) < 0.0:
 
-                # Target has been exceeded. Let's look for the exact time step using root_scalar.
-                def replace_last_point(time_step):
-                    """
-                    Replaces last point of flight_points.
-
-                    :param time_step: time step for new point
-                    :return: new distance to target
-                    """
-
-                    if isinstance(time_step, np.ndarray):
-                        # root_scalar() will provide time_step ad (1,) array, resulting
-                        # in all parameters of the new flight point being also (1,) arrays.
-                        # We want to avoid that
-                        time_step = time_step.item()
-                    del flight_points[-1]
-                    self._add_new_flight_point(flight_points, time_step)
-                    return self.get_distance_to_target(flight_points)
-
-                root_scalar(
-                    replace_last_point, x0=self.time_step, x1=self.time_step / 2.0, rtol=tol
+                # Target has been exceeded. Let's look for the exact time step.
+                last_point_to_target = self._locate_target_crossing(
+                    flight_points, time_step, previous_point_to_target, tol
                 )
-                last_point_to_target = self.get_distance_to_target(flight_points)
             elif (
                 np.abs(last_point_to_target) > np.abs(previous_point_to_target)
                 # If self.target.CL is defined, it means that we look for an optimal altitude and
@@ -218,9 +270,223 @@ class FlightSegment(IFlightPart):
 
             previous_point_to_target = last_point_to_target
 
-        flight_points_df = pd.DataFrame(flight_points)
+        if not is_first_part:
+            trajectory.complete(len(trajectory) - len(flight_points), start)
+
+    def compute_from_batch(self, starts: Sequence[FlightPoint]) -> List[pd.DataFrame]:
+        """
+        Computes the flight path segment from several start points.
+
+        All trajectories are integrated together, using numpy arrays as values of
+        FlightPoint fields. Each trajectory is left aside as soon as its target is
+        reached, or as soon as computation has to be interrupted.
+
+        Segments that cannot be vectorized (e.g. segments that overload
+        :meth:`compute_from`) are computed sequentially from each start point.
+
+        In both cases, the segment instance is not modified.
+
+        :param starts: the initial flight points (see :meth:`compute_from`)
+        :return: a list of pandas DataFrame (one per start point), as would be
+                 returned by :meth:`compute_from`
+        """
+        if not self._can_compute_batch():
+            return [self._get_working_copy().compute_from(deepcopy(start)) for start in starts]
+
+        segment = self._get_working_copy()
+        # Propulsion is computed for all active trajectories at once.
+        segment.propulsion = BatchPropulsionAdapter(self.propulsion)
+        batch_size = len(starts)
+        start = _stack_flight_points([deepcopy(start) for start in starts])
+        if start.time is None:
+            start.time = 0.0
+        if start.ground_distance is None:
+            start.ground_distance = 0.0
+        start.time = np.broadcast_to(start.time, batch_size).astype(float)
+        start.ground_distance = np.broadcast_to(start.ground_distance, batch_size).astype(float)
+
+        start = segment._prepare_start(start)
+        segment.complete_flight_point(start)
+
+        # Each record is a (trajectory indices, flight point with array values) tuple.
+        records = [(np.arange(batch_size), start)]
+        target = segment.target
+
+        active = np.arange(batch_size)
+        starts_k = start
+        previous = start
+        previous_to_target = np.broadcast_to(
+            segment.get_distance_to_target([starts_k, previous]), batch_size
+        )
+        tol = 1.0e-5  # Same as in compute_from()
+
+        while True:
+            not_on_target = np.abs(previous_to_target) > tol
+            active = active[not_on_target]
+            if active.size == 0:
+                break
+            starts_k = _get_flight_point_subset(starts_k, not_on_target)
+            previous = _get_flight_point_subset(previous, not_on_target)
+            previous_to_target = previous_to_target[not_on_target]
+            segment.target = _get_flight_point_subset(target, active)
+
+            new_point = segment._compute_batch_point(
+                [starts_k, previous], np.full(active.size, segment.time_step)
+            )
+            last_to_target = np.broadcast_to(
+                segment.get_distance_to_target([starts_k, new_point]), active.size
+            ).copy()
+
+            exceeded = last_to_target * previous_to_target < 0.0
+            if np.any(exceeded):
+                # Target has been exceeded. Let's look for the exact time steps.
+                segment.target = _get_flight_point_subset(target, active[exceeded])
+                solved_point, solved_to_target = segment._solve_batch_time_step(
+                    _get_flight_point_subset(starts_k, exceeded),
+                    _get_flight_point_subset(previous, exceeded),
+                    previous_to_target[exceeded],
+                    last_to_target[exceeded],
+                    tol,
+                )
+                _set_flight_point_subset(new_point, exceeded, solved_point, active.size)
+                last_to_target[exceeded] = solved_to_target
+                segment.target = _get_flight_point_subset(target, active)
+
+            getting_further = np.zeros(active.size, dtype=bool)
+            if segment.interrupt_if_getting_further_from_target:
+                getting_further = ~exceeded & (np.abs(last_to_target) > np.abs(previous_to_target))
+                for _ in np.flatnonzero(getting_further):
+                    _LOGGER.warning(
+                        'Target cannot be reached in "%s". Segment computation interrupted.'
+                        "Please review the segment settings, especially thrust_rate.",
+                        self.name,
+                    )
+
+            kept = ~getting_further
+            new_point = _get_flight_point_subset(new_point, kept)
+            records.append((active[kept], new_point))
+
+            invalid = segment._check_batch_values(new_point)
+            for i in np.flatnonzero(invalid):
+                msg = segment._check_values(_get_flight_point_subset(new_point, i))
+                _LOGGER.warning(msg + ' Segment computation interrupted in "%s".', self.name)
+
+            # Interrupted trajectories are given a null distance to target, so
+            # they are removed at next iteration.
+            active = active[kept]
+            starts_k = _get_flight_point_subset(starts_k, kept)
+            previous = new_point
+            previous_to_target = np.where(invalid, 0.0, last_to_target[kept])
+
+        return _build_batch_dataframes(records, batch_size)
+
+    def _prepare_start(self, start: FlightPoint) -> FlightPoint:
+        """
+        Called at beginning of :meth:`compute_from`, before time-step integration.
 
-        return flight_points_df
+        Can be overloaded for preparing the start point and/or the target. Implementations
+        should call `super()._prepare_start()`.
+
+        The provided start point may have numpy arrays as field values (see
+        :meth:`compute_from_batch`). Implementations should be vectorized accordingly.
+
+        :param start: the initial flight point
+        :return: the initial flight point to be used for integration
+        """
+        return start
+
+    def _can_compute_batch(self) -> bool:
+        """
+        :return: True if time-step integration can be vectorized for this segment.
+        """
+        return type(self).compute_from is FlightSegment.compute_from and not self.adaptive_time_step
+
+    def _get_working_copy(self) -> "FlightSegment":
+        """
+        :return: a shallow copy of this segment, with its own copy of target
+        """
+        segment = copy(self)
+        segment.target = deepcopy(self.target)
+        return segment
+
+    def _compute_batch_point(
+        self, flight_points: List[FlightPoint], time_step: np.ndarray
+    ) -> FlightPoint:
+        """
+        Computes next flight points of several trajectories.
+
+        :param flight_points: start points and last points as FlightPoint instances with array
+                              values
+        :param time_step: time steps as numpy array
+        :return: the new flight points as a FlightPoint instance with array values
+        """
+        new_point = self.compute_next_flight_point(flight_points, time_step)
+        self.complete_flight_point(new_point)
+        return new_point
+
+    def _solve_batch_time_step(
+        self,
+        start: FlightPoint,
+        previous: FlightPoint,
+        previous_to_target: np.ndarray,
+        last_to_target: np.ndarray,
+        tol: float,
+    ) -> Tuple[FlightPoint, np.ndarray]:
+        """
+        Vectorized secant method for finding the time steps that put the new flight points
+        on target.
+
+        Iterations start from the already computed distances to target for a null time step
+        (i.e. the previous points) and for the time step that has exceeded target.
+
+        :param start: start points of concerned trajectories
+        :param previous: last points of concerned trajectories
+        :param previous_to_target: distances to target of previous points
+        :param last_to_target: distances to target for a time step equal to :attr:`time_step`
+        :param tol: tolerance on distance to target and relative tolerance on time steps
+        :return: the new flight points and their distances to target
+        """
+        flight_points = [start, previous]
+
+        def _get_point_and_distance(time_step):
+            point = self._compute_batch_point(flight_points, time_step)
+            return point, np.broadcast_to(
+                self.get_distance_to_target([start, point]), time_step.shape
+            )
+
+        x0, f0 = np.zeros(np.shape(previous.mass)), previous_to_target
+        x1, f1 = np.full(np.shape(previous.mass), self.time_step, dtype=float), last_to_target
+        converged = np.zeros(np.shape(x1), dtype=bool)
+        for _ in range(50):
+            delta = f1 - f0
+            converged |= delta == 0.0
+            x2 = np.where(converged, x1, x1 - f1 * (x1 - x0) / np.where(converged, 1.0, delta))
+            converged |= np.isclose(x2, x1, rtol=tol, atol=1.48e-8)
+            x0, f0 = x1, f1
+            x1 = x2
+            point, f1 = _get_point_and_distance(x1)
+            converged |= np.abs(f1) <= tol
+            if np.all(converged):
+                break
+
+        return point, f1
+
+    def _check_batch_values(self, flight_point: FlightPoint) -> np.ndarray:
+        """
+        Vectorized version of :meth:`_check_values`.
+
+        Should be overloaded consistently with :meth:`_check_values`.
+
+        :param flight_point: a FlightPoint instance with array values
+        :return: a boolean array that is True where values are not consistent
+        """
+        return ~(
+            (self.mach_bounds[0] <= flight_point.mach)
+            & (flight_point.mach <= self.mach_bounds[1])
+            & (self.altitude_bounds[0] <= flight_point.altitude)
+            & (flight_point.altitude <= self.altitude_bounds[1])
+            & (flight_point.mass > 0.0)
+        )
 
     def _check_values(self, flight_point: FlightPoint) -> str:
         """
@@ -232,24 +498,168 @@ class FlightSegment(IFlightPart):
         :return: None if Ok, or an error message otherwise
         """
 
-        if not self.mach_bounds[0] <= flight_point.mach <= self.mach_bounds[1]:
-            return "true_airspeed value %f.1m/s is out of bound." % flight_point.true_airspeed
-        if not self.altitude_bounds[0] <= flight_point.altitude <= self.altitude_bounds[1]:
-            return "Altitude value %.0fm is out of bound." % flight_point.altitude
-        if flight_point.mass <= 0.0:
+        # Real parts are used, as values may be complex (complex step).
+        mach = np.real(flight_point.mach)
+        altitude = np.real(flight_point.altitude)
+        if not self.mach_bounds[0] <= mach <= self.mach_bounds[1]:
+            return "true_airspeed value %f.1m/s is out of bound." % np.real(
+                flight_point.true_airspeed
+            )
+        if not self.altitude_bounds[0] <= altitude <= self.altitude_bounds[1]:
+            return "Altitude value %.0fm is out of bound." % altitude
+        if np.real(flight_point.mass) <= 0.0:
             return "Negative mass value."
 
-    def _add_new_flight_point(self, flight_points: List[FlightPoint], time_step):
+    def _add_new_flight_point(self, flight_points: TrajectoryView, time_step):
         """
         Appends a new flight point to provided flight point list.
 
-        :param flight_points: list of previous flight points, modified in place.
+        :param flight_points: previous flight points, modified in place.
         :param time_step: time step for new computed flight point.
         """
         new_point = self.compute_next_flight_point(flight_points, time_step)
         self.complete_flight_point(new_point)
         flight_points.append(new_point)
 
+    def _locate_target_crossing(
+        self,
+        flight_points: TrajectoryView,
+        time_step: float,
+        previous_point_to_target: float,
+        tol: float,
+    ) -> float:
+        """
+        Replaces the last flight point, that has exceeded target, by a flight point on target.
+
+        The crossing is first located by interpolating flight point values between the
+        two last flight points, which does not need any call to the propulsion model.
+        The flight point is then computed once for the obtained time step. If the distance
+        to target is not linear enough for this point to be on target, secant iterations
+        follow, starting from this point and the previous one.
+
+        :param flight_points: previous flight points, modified in place.
+        :param time_step: time step that has been used for last flight point
+        :param previous_point_to_target: distance to target of the flight point before last
+        :param tol: tolerance on distance to target and relative tolerance on time step
+        :return: distance to target of the new last flight point
+        """
+        start = flight_points[0]
+        previous = flight_points[-2]
+        last = flight_points[-1]
+
+        def get_interpolated_distance(ratio):
+            flight_point = _interpolate_flight_points(previous, last, ratio)
+            return np.real(np.asarray(self.get_distance_to_target([start, flight_point]))).item()
+
+        # With complex values (complex step), the crossing is located using real parts.
+        # Secant iterations are then done with complex values, so that the time step
+        # carries the derivative of the crossing time.
+        ratio = brentq(get_interpolated_distance, 0.0, 1.0)
+
+        def replace_last_point(new_time_step):
+            del flight_points[-1]
+            self._add_new_flight_point(flight_points, new_time_step)
+            return self.get_distance_to_target(flight_points)
+
+        # A null time step gives the flight point before last.
+        x0, f0 = 0.0, previous_point_to_target
+        x1 = ratio * time_step
+        f1 = replace_last_point(x1)
+        for _ in range(50):
+            if np.abs(f1) <= tol or f1 == f0:
+                break
+            x2 = x1 - f1 * (x1 - x0) / (f1 - f0)
+            x0, f0 = x1, f1
+            x1 = x2
+            f1 = replace_last_point(x1)
+            if np.isclose(x1, x0, rtol=tol, atol=0.0):
+                break
+
+        if np.imag(f1) != 0.0 and np.real(f1 - f0) != 0.0:
+            # With complex step, the imaginary part of the distance to target is cancelled
+            # by correcting the time step, which carries the derivative of crossing time.
+            x1 = x1 - 1j * np.imag(f1) * np.real((x1 - x0) / (f1 - f0))
+            f1 = replace_last_point(x1)
+        return f1
+
+    def _add_adapted_flight_point(
+        self, flight_points: TrajectoryView, time_step: float
+    ) -> Tuple[float, float]:
+        """
+        Appends a new flight point to provided flight point list, with a time step that
+        ensures the estimated local error is within tolerance.
+
+        Uses the embedded Euler-Heun pair: the explicit Euler step is corrected using
+        derivatives at both ends of the step, and the correction is used as error estimate.
+
+        :param flight_points: previous flight points, modified in place.
+        :param time_step: proposed time step
+        :return: the actually used time step and the proposed time step for next iteration
+        """
+        previous = flight_points[-1]
+        previous_derivatives = self._get_state_derivatives(previous)
+        minimum_time_step = 1.0e-3 * self.time_step
+        time_step = min(time_step, self.maximum_time_step)
+        while True:
+            new_point = self.compute_next_flight_point(flight_points, time_step)
+            euler_point = deepcopy(new_point)
+            self.complete_flight_point(euler_point)
+
+            corrections = (
+                0.5 * time_step * (self._get_state_derivatives(euler_point) - previous_derivatives)
+            )
+            new_point.mass = new_point.mass + corrections[0]
+            new_point.altitude = new_point.altitude + corrections[1]
+            new_point.ground_distance = new_point.ground_distance + corrections[2]
+            if new_point.true_airspeed is not None:
+                new_point.true_airspeed = new_point.true_airspeed + corrections[3]
+
+            scales = self.absolute_tolerance + self.relative_tolerance * np.abs(
+                self._get_states(previous)
+            )
+            error_ratio = np.max(np.abs(corrections) / scales)
+
+            # Error estimate is the one of the first-order method, hence the 1/2 exponent.
+            factor = 0.9 / np.sqrt(error_ratio) if error_ratio > 0.0 else 5.0
+            factor = min(5.0, max(0.2, factor))
+            if error_ratio <= 1.0 or time_step <= minimum_time_step:
+                self.complete_flight_point(new_point)
+                flight_points.append(new_point)
+                return time_step, min(time_step * factor, self.maximum_time_step)
+
+            time_step = max(time_step * factor, minimum_time_step)
+
+    @staticmethod
+    def _get_states(flight_point: FlightPoint) -> np.ndarray:
+        """
+        :return: mass, altitude, ground distance and true airspeed as numpy array
+        """
+        # Values may be 1-element arrays.
+        return np.concatenate(
+            [
+                np.ravel(value)
+                for value in [
+                    flight_point.mass,
+                    flight_point.altitude,
+                    flight_point.ground_distance,
+                    flight_point.true_airspeed,
+                ]
+            ]
+        )
+
+    def _get_state_derivatives(self, flight_point: FlightPoint) -> np.ndarray:
+        """
+        :return: time derivatives of mass, altitude, ground distance and true airspeed as
+                 numpy array
+        """
+        derivatives = [
+            -self.propulsion.get_consumed_mass(flight_point, 1.0),
+            flight_point.true_airspeed * np.sin(flight_point.slope_angle),
+            flight_point.true_airspeed * np.cos(flight_point.slope_angle),
+            flight_point.acceleration,
+        ]
+        return np.concatenate([np.ravel(value) for value in derivatives])
+
     def compute_next_flight_point(
         self, flight_points: List[FlightPoint], time_step: float
     ) -> FlightPoint:
@@ -296,9 +706,9 @@ class FlightSegment(IFlightPart):
         """
         flight_point.engine_setting = self.engine_setting
 
-        self._complete_speed_values(flight_point)
+        atm = self._get_atmosphere(flight_point.altitude)
+        self._complete_speed_values(flight_point, atm)
 
-        atm = AtmosphereSI(flight_point.altitude)
         reference_force = 0.5 * atm.density * flight_point.true_airspeed ** 2 * self.reference_area
 
         if self.polar:
@@ -313,12 +723,15 @@ class FlightSegment(IFlightPart):
             flight_point
         )
 
-    @staticmethod
-    def _complete_speed_values(flight_point: FlightPoint):
+    def _complete_speed_values(self, flight_point: FlightPoint, atm: AtmosphereSI = None):
         """
         Computes consistent values between TAS, EAS and Mach, assuming one of them is defined.
+
+        :param flight_point: the flight point that will be completed in-place
+        :param atm: if provided, must be the atmosphere at flight_point.altitude
         """
-        atm = AtmosphereSI(flight_point.altitude)
+        if atm is None:
+            atm = self._get_atmosphere(flight_point.altitude)
 
         if flight_point.true_airspeed is None:
             if flight_point.mach is not None:
@@ -337,6 +750,32 @@ class FlightSegment(IFlightPart):
         flight_point.mach = atm.mach
         flight_point.equivalent_airspeed = atm.equivalent_airspeed
 
+    def _get_atmosphere(self, altitude) -> AtmosphereSI:
+        """
+        Provides the atmosphere for computations of this segment, according to
+        :attr:`atmosphere` and :attr:`delta_isa`.
+
+        Complex altitudes (as when using complex step) are supported, and are always
+        computed with ISA laws.
+
+        Altitudes provided as 1-element arrays (as when values come from OpenMDAO inputs)
+        are processed as scalars, which are computed much faster.
+
+        :param altitude: altitude in meters
+        :return: the atmosphere instance
+        """
+        if self.atmosphere not in ATMOSPHERE_MODELS:
+            raise ValueError(
+                'Atmosphere model should be one of %s. Got "%s".'
+                % (list(ATMOSPHERE_MODELS), self.atmosphere)
+            )
+        if isinstance(altitude, np.ndarray) and altitude.size == 1:
+            altitude = altitude.item()
+        delta_t = np.asarray(self.delta_isa).item()
+        if np.iscomplexobj(altitude):
+            return _ComplexAtmosphereSI(altitude, delta_t)
+        return ATMOSPHERE_MODELS[self.atmosphere](altitude, delta_t)
+
     @staticmethod
     def _compute_next_altitude(next_point: FlightPoint, previous_point: FlightPoint):
         time_step = next_point.time - previous_point.time
@@ -351,22 +790,57 @@ class FlightSegment(IFlightPart):
         """
         Computes optimal altitude for provided mass and Mach number.
 
+        As air density and speed of sound verify density * speed_of_sound**2 = 1.4 * pressure,
+        optimal CL is obtained at the altitude where
+        pressure = 2 * mass * g / (1.4 * reference_area * mach**2 * optimal_CL).
+        This altitude is directly computed from ISA pressure laws.
+
+        If obtained altitude does not match optimal CL, or is out of :attr:`altitude_bounds`,
+        it is computed with a root solver.
+
+        Works with numpy arrays.
+
         :param mass:
         :param mach:
+        :param altitude_guess: starting point for the root solver, if needed
         :return: altitude that matches optimal CL
         """
 
-        if altitude_guess is None:
-            altitude_guess = 10000.0
-
         def distance_to_optimum(altitude):
-            atm = AtmosphereSI(altitude)
+            atm = self._get_atmosphere(altitude)
             true_airspeed = mach * atm.speed_of_sound
             optimal_air_density = (
                 2.0 * mass * g / (self.reference_area * true_airspeed ** 2 * self.polar.optimal_cl)
             )
             return (atm.density - optimal_air_density) * 100.0
 
+        optimal_pressure = (
+            2.0 * mass * g / (GAMMA * self.reference_area * mach ** 2 * self.polar.optimal_cl)
+        )
+        with np.errstate(invalid="ignore", divide="ignore"):
+            optimal_altitude = _get_altitude_from_pressure(optimal_pressure)
+
+            # Distance to optimum is 100 times a density difference, hence the tolerance.
+            if np.all(
+                (np.abs(distance_to_optimum(optimal_altitude)) < 1.0e-4)
+                & (self.altitude_bounds[0] <= np.real(optimal_altitude))
+                & (np.real(optimal_altitude) <= self.altitude_bounds[1])
+            ):
+                return optimal_altitude
+
+        if altitude_guess is None:
+            altitude_guess = 10000.0
+
+        if np.size(mass) > 1 or np.size(mach) > 1:
+            # root_scalar() works only with scalars.
+            mass, mach, altitude_guess = np.broadcast_arrays(mass, mach, altitude_guess)
+            return np.array(
+                [
+                    self._get_optimal_altitude(*values)
+                    for values in zip(mass.flat, mach.flat, altitude_guess.flat)
+                ]
+            ).reshape(mass.shape)
+
         optimal_altitude = root_scalar(
             distance_to_optimum, x0=altitude_guess, x1=altitude_guess - 1000.0
         ).root
@@ -460,11 +934,228 @@ class FixedDurationSegment(FlightSegment, ABC):
 
     time_step: float = 60.0
 
-    def compute_from(self, start: FlightPoint) -> pd.DataFrame:
-        if start.time:
-            self.target.time = self.target.time + start.time
-        return super().compute_from(start)
+    def _prepare_start(self, start: FlightPoint) -> FlightPoint:
+        self.target.time = self.target.time + start.time
+        return super()._prepare_start(start)
 
     def get_distance_to_target(self, flight_points: List[FlightPoint]) -> float:
         current = flight_points[-1]
         return self.target.time - current.time
+
+
+def _get_altitude_from_pressure(pressure):
+    """
+    Inverse of ISA pressure laws, as implemented in :mod:`stdatm`.
+
+    Works with numpy arrays.
+
+    :param pressure: in Pa
+    :return: altitude in m
+    """
+    tropospheric_altitude = 44330.78 * (1.0 - (pressure / SEA_LEVEL_PRESSURE) ** (1.0 / 5.25587611))
+    stratospheric_altitude = (
+        1.7345725 - np.log(pressure / 22632.0) / np.log(2.718281)
+    ) / 0.0001576883
+    # As the pressure law is slightly discontinuous at tropopause, some pressure values
+    # have no matching altitude. Tropopause altitude is then returned.
+    return np.where(
+        np.real(tropospheric_altitude) < TROPOPAUSE,
+        tropospheric_altitude,
+        np.where(np.real(stratospheric_altitude) > TROPOPAUSE, stratospheric_altitude, TROPOPAUSE),
+    )
+
+
+class _ComplexAtmosphereSI(AtmosphereSI):
+    """
+    Same as :class:`~stdatm.AtmosphereSI`, but works with complex altitudes.
+
+    Atmosphere layer is decided by the real part of altitude, so that ISA laws can
+    be differentiated using complex step.
+    """
+
+    @property
+    def temperature(self):
+        if self._temperature is None:
+            altitude = np.asarray(self._altitude)
+            self._temperature = (
+                np.where(
+                    np.real(altitude) < TROPOPAUSE,
+                    SEA_LEVEL_TEMPERATURE - 0.0065 * altitude,
+                    216.65,
+                )
+                + self._delta_t
+            )
+            if self._temperature.ndim == 0:
+                self._temperature = self._temperature.item()
+        return self._temperature
+
+    @property
+    def pressure(self):
+        if self._pressure is None:
+            altitude = np.asarray(self._altitude)
+            self._pressure = np.where(
+                np.real(altitude) < TROPOPAUSE,
+                SEA_LEVEL_PRESSURE * (1 - (altitude / 44330.78)) ** 5.25587611,
+                22632.0 * 2.718281 ** (1.7345725 - 0.0001576883 * altitude),
+            )
+            if self._pressure.ndim == 0:
+                self._pressure = self._pressure.item()
+        return self._pressure
+
+
+class _TabulatedAtmosphereSI(AtmosphereSI):
+    """
+    Same as :class:`~stdatm.AtmosphereSI`, but ISA temperature and pressure are linearly
+    interpolated in tables that are computed once.
+
+    Table nodes are every 10 meters, and include the tropopause, so that temperature
+    is exact and relative error on pressure is below 1.0e-6.
+    If an altitude is out of table bounds, ISA laws are used.
+    """
+
+    _altitudes = np.arange(-2000.0, 30000.0 + 1.0, 10.0)
+    _temperatures = AtmosphereSI(_altitudes).temperature
+    _pressures = AtmosphereSI(_altitudes).pressure
+
+    def _is_in_table(self) -> bool:
+        return np.all(
+            (self._altitude >= self._altitudes[0]) & (self._altitude <= self._altitudes[-1])
+        )
+
+    @property
+    def temperature(self):
+        if self._temperature is None:
+            if self._is_in_table():
+                self._temperature = (
+                    np.interp(self._altitude, self._altitudes, self._temperatures) + self._delta_t
+                )
+            else:
+                self._temperature = super().temperature
+        return self._temperature
+
+    @property
+    def pressure(self):
+        if self._pressure is None:
+            if self._is_in_table():
+                self._pressure = np.interp(self._altitude, self._altitudes, self._pressures)
+            else:
+                self._pressure = super().pressure
+        return self._pressure
+
+
+#: Available atmosphere models for :attr:`FlightSegment.atmosphere`.
+ATMOSPHERE_MODELS = {"isa": AtmosphereSI, "tabulated": _TabulatedAtmosphereSI}
+
+
+def _interpolate_flight_points(
+    flight_point1: FlightPoint, flight_point2: FlightPoint, ratio: float
+) -> FlightPoint:
+    """
+    Linear interpolation between two flight points.
+
+    Fields that are not numeric in both flight points take the value of flight_point2.
+
+    :param flight_point1: flight point for ratio == 0.
+    :param flight_point2: flight point for ratio == 1.
+    :param ratio: interpolation ratio
+    :return: the interpolated flight point
+    """
+    interpolated = copy(flight_point2)
+    for field in fields(FlightPoint):
+        value1 = getattr(flight_point1, field.name)
+        value2 = getattr(flight_point2, field.name)
+        if _is_numeric(value1) and _is_numeric(value2):
+            setattr(interpolated, field.name, value1 + ratio * (value2 - value1))
+    return interpolated
+
+
+def _is_numeric(value) -> bool:
+    if isinstance(value, np.ndarray):
+        return np.issubdtype(value.dtype, np.number)
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+
+
+def _stack_flight_points(flight_points: Sequence[FlightPoint]) -> FlightPoint:
+    """
+    Stacks provided FlightPoint instances into one instance with array values.
+
+    Fields that are None for all instances stay None. Fields that have the same
+    non-numeric value (e.g. name or engine setting) for all instances keep this value.
+    """
+    stacked = FlightPoint()
+    for field in fields(FlightPoint):
+        values = [getattr(flight_point, field.name) for flight_point in flight_points]
+        if all(value is None for value in values):
+            value = None
+        elif all(isinstance(value, (str, Enum)) for value in values) and len(set(values)) == 1:
+            value = values[0]
+        else:
+            value = np.array([np.asarray(value).item() for value in values])
+        setattr(stacked, field.name, value)
+    return stacked
+
+
+def _get_flight_point_subset(flight_point: FlightPoint, indices) -> FlightPoint:
+    """
+    :param flight_point: a FlightPoint instance with array values
+    :param indices: indices or boolean mask of the wanted elements
+    :return: a FlightPoint instance with array values restricted to provided indices
+    """
+    subset = FlightPoint()
+    for field in fields(FlightPoint):
+        value = getattr(flight_point, field.name)
+        if np.ndim(value) > 0:
+            value = value[indices]
+        setattr(subset, field.name, value)
+    return subset
+
+
+def _set_flight_point_subset(
+    flight_point: FlightPoint, indices, values: FlightPoint, batch_size: int
+):
+    """
+    Sets values of provided indices in flight_point fields.
+
+    :param flight_point: a FlightPoint instance with array values, modified in place
+    :param indices: indices or boolean mask of the elements to set
+    :param values: a FlightPoint instance with values for provided indices
+    :param batch_size: the array size for fields of flight_point
+    """
+    for field in fields(FlightPoint):
+        value = getattr(flight_point, field.name)
+        new_values = getattr(values, field.name)
+        if np.ndim(value) == 0 and np.ndim(new_values) == 0 and value == new_values:
+            continue
+        value = np.array(np.broadcast_to(value, batch_size))
+        value[indices] = new_values
+        setattr(flight_point, field.name, value)
+
+
+def _build_batch_dataframes(records: list, batch_size: int) -> List[pd.DataFrame]:
+    """
+    Builds one DataFrame per trajectory from batch records.
+
+    :param records: list of (trajectory indices, FlightPoint instance with array values)
+    :param batch_size: number of trajectories
+    :return: list of DataFrame instances
+    """
+    trajectories = np.concatenate([indices for indices, _ in records])
+    order = np.argsort(trajectories, kind="stable")
+    bounds = np.searchsorted(trajectories[order], np.arange(batch_size + 1))
+
+    columns = {}
+    for field in fields(FlightPoint):
+        column = np.concatenate(
+            [
+                np.broadcast_to(np.array(getattr(point, field.name), dtype=object), len(indices))
+                for indices, point in records
+            ]
+        )
+        columns[field.name] = column[order]
+
+    return [
+        pd.DataFrame(
+            {name: column[bounds[i] : bounds[i + 1]].tolist() for name, column in columns.items()}
+        )
+        for i in range(batch_size)
+    ]
@@ -48,10 +48,9 @@ class CruiseSegment(RegulatedThrustSegment):
         ):
             self.target.mach = FlightSegment.CONSTANT_VALUE
 
-    def compute_from(self, start: FlightPoint) -> pd.DataFrame:
-        if start.ground_distance:
-            self.target.ground_distance = self.target.ground_distance + start.ground_distance
-        return super().compute_from(start)
+    def _prepare_start(self, start: FlightPoint) -> FlightPoint:
+        self.target.ground_distance = self.target.ground_distance + start.ground_distance
+        return super()._prepare_start(start)
 
     def get_distance_to_target(self, flight_points: List[FlightPoint]) -> float:
         current = flight_points[-1]
@@ -71,9 +70,9 @@ class OptimalCruiseSegment(CruiseSegment, mission_file_keyword="optimal_cruise")
     `true_airspeed` and `equivalent_airspeed`. If not, Mach will be assumed constant.
     """
 
-    def compute_from(self, start: FlightPoint) -> pd.DataFrame:
+    def _prepare_start(self, start: FlightPoint) -> FlightPoint:
         start.altitude = self._get_optimal_altitude(start.mass, start.mach)
-        return super().compute_from(start)
+        return super()._prepare_start(start)
 
     def _compute_next_altitude(self, next_point: FlightPoint, previous_point: FlightPoint):
         next_point.altitude = self._get_optimal_altitude(
@@ -134,9 +133,10 @@ class ClimbAndCruiseSegment(CruiseSegment, mission_file_keyword="cruise"):
 
             # Go to the next flight level, or keep altitude if already at a flight level
             cruise_altitude = get_closest_flight_level(start.altitude - 1.0e-3)
-            results = self._climb_to_altitude_and_cruise(
+            climb_points = self._climb_to_altitude(
                 start, cruise_altitude, climb_segment, cruise_segment
             )
+            results = self._cruise_after_climb(climb_points, cruise_segment)
             mass_loss = start.mass - results.mass.iloc[-1]
 
             go_to_next_level = True
@@ -144,15 +144,24 @@ class ClimbAndCruiseSegment(CruiseSegment, mission_file_keyword="cruise"):
             while go_to_next_level:
                 old_mass_loss = mass_loss
                 cruise_altitude = get_closest_flight_level(cruise_altitude + 1.0e-3)
-                if cruise_altitude > self.maximum_flight_level * 100.0 * foot:
+                if np.real(cruise_altitude) > self.maximum_flight_level * 100.0 * foot:
                     break
 
-                new_results = self._climb_to_altitude_and_cruise(
-                    start, cruise_altitude, climb_segment, cruise_segment
+                # The climb to next flight level continues the previous climb.
+                additional_climb_points = self._climb_to_altitude(
+                    FlightPoint.create(climb_points.iloc[-1]),
+                    cruise_altitude,
+                    climb_segment,
+                    cruise_segment,
                 )
+                climb_points = pd.concat(
+                    [climb_points, additional_climb_points.iloc[1:]]
+                ).reset_index(drop=True)
+
+                new_results = self._cruise_after_climb(climb_points, cruise_segment)
                 mass_loss = start.mass - new_results.mass.iloc[-1]
 
-                go_to_next_level = mass_loss < old_mass_loss
+                go_to_next_level = np.real(mass_loss) < np.real(old_mass_loss)
                 if go_to_next_level:
                     results = new_results
 
@@ -182,14 +191,46 @@ class ClimbAndCruiseSegment(CruiseSegment, mission_file_keyword="cruise"):
         :param cruise_segment:
         :return:
         """
+        climb_points = self._climb_to_altitude(
+            start, cruise_altitude, climb_segment, cruise_segment
+        )
+        return self._cruise_after_climb(climb_points, cruise_segment)
+
+    @staticmethod
+    def _climb_to_altitude(
+        start: FlightPoint,
+        cruise_altitude: float,
+        climb_segment: AltitudeChangeSegment,
+        cruise_segment: CruiseSegment,
+    ) -> pd.DataFrame:
+        """
+        Climbs up to cruise_altitude, with the speed parameter of cruise_segment target.
+
+        :param start:
+        :param cruise_altitude:
+        :param climb_segment:
+        :param cruise_segment:
+        :return: climb flight points
+        """
         climb_segment.target = FlightPoint(
             altitude=cruise_altitude,
             mach=cruise_segment.target.mach,
             true_airspeed=cruise_segment.target.true_airspeed,
             equivalent_airspeed=cruise_segment.target.equivalent_airspeed,
         )
-        climb_points = climb_segment.compute_from(start)
+        return climb_segment.compute_from(start)
+
+    def _cruise_after_climb(
+        self, climb_points: pd.DataFrame, cruise_segment: CruiseSegment
+    ) -> pd.DataFrame:
+        """
+        Cruises from last climb point, while ensuring final ground_distance is
+        equal to self.target.ground_distance.
 
+        :param climb_points:
+        :param cruise_segment:
+        :return: climb and cruise flight points
+        """
         cruise_start = FlightPoint.create(climb_points.iloc[-1])
         cruise_segment.target.ground_distance = (
             self.target.ground_distance - cruise_start.ground_distance
@@ -199,6 +240,210 @@ class ClimbAndCruiseSegment(CruiseSegment, mission_file_keyword="cruise"):
         return pd.concat([climb_points, cruise_points]).reset_index(drop=True)
 
 
+@dataclass
+class StepClimbCruiseSegment(CruiseSegment, mission_file_keyword="step_climb_cruise"):
+    """
+    Class for computing cruise flight segment with step climbs.
+
+    Target is a specified ground_distance. The target definition indicates
+    the ground_distance to be covered during the segment, independently of
+    the initial value.
+    Target should also specify a speed parameter set to "constant", among `mach`,
+    `true_airspeed` and `equivalent_airspeed`. If not, Mach will be assumed constant.
+
+    Cruise distance is split in :attr:`slice_count` slices. At the beginning
+    of each slice (except the last one), the aircraft may climb to an upper IFR flight
+    level that is a multiple of :attr:`flight_level_step`, while being at most equal to
+    :attr:`maximum_flight_level`.
+
+    Flight levels are chosen by dynamic programming over the (slice, flight level) grid,
+    so that mass at end of cruise is maximum. For this, fuel burn of each slice is
+    assessed for all flight levels at once with the Breguet-Leduc formula, and fuel burn
+    of climbs is assessed from the needed increase of potential energy.
+    Flight levels where cruise would need a thrust rate greater than 1 are rejected.
+
+    The chosen profile is then computed by time-step integration. Climbs are computed
+    with :attr:`climb_segment` if it is provided (its target will be ignored). Otherwise,
+    they are done instantaneously, with the fuel burn used for choosing flight levels.
+    """
+
+    #: The AltitudeChangeSegment that is used for step climbs (its target will be ignored).
+    climb_segment: AltitudeChangeSegment = None
+
+    #: The maximum allowed flight level (i.e. multiple of 100 feet).
+    maximum_flight_level: float = 500.0
+
+    #: The difference between allowed flight levels (i.e. multiple of 100 feet).
+    flight_level_step: float = 20.0
+
+    #: The number of slices of cruise distance. Step climbs may occur only at slice starts.
+    slice_count: int = 10
+
+    def __post_init__(self):
+        super().__post_init__()
+        # Values from mission files may be floats or arrays.
+        self.slice_count = int(np.asarray(self.slice_count).item())
+        if self.slice_count < 1:
+            raise ValueError(f"slice_count should be at least 1 (got {self.slice_count}).")
+
+    def compute_from(self, start: FlightPoint) -> pd.DataFrame:
+        start = deepcopy(start)
+        self.complete_flight_point(start)
+
+        cruise_segment = CruiseSegment(
+            target=deepcopy(self.target),
+            propulsion=self.propulsion,
+            reference_area=self.reference_area,
+            polar=self.polar,
+            name=self.name,
+            engine_setting=self.engine_setting,
+        )
+
+        end_distance = start.ground_distance + self.target.ground_distance
+        slice_distance = self.target.ground_distance / self.slice_count
+        altitudes = self._get_cruise_altitudes(start)
+
+        results = pd.DataFrame([start])
+        previous_altitude = start.altitude
+        for i, altitude in enumerate(altitudes):
+            current = FlightPoint.create(results.iloc[-1])
+            if altitude != previous_altitude:
+                results = pd.concat([results, self._climb(current, altitude, cruise_segment)[1:]])
+                current = FlightPoint.create(results.iloc[-1])
+                previous_altitude = altitude
+
+            # Cruise up to the end of slice, or to the next step climb
+            if i == len(altitudes) - 1 or altitudes[i + 1] != altitude:
+                slice_end_distance = start.ground_distance + (i + 1) * slice_distance
+                if i == len(altitudes) - 1:
+                    slice_end_distance = end_distance
+                if slice_end_distance > current.ground_distance:
+                    cruise_segment.target.ground_distance = (
+                        slice_end_distance - current.ground_distance
+                    )
+                    cruise_points = cruise_segment.compute_from(current)
+                    results = pd.concat([results, cruise_points.iloc[1:]])
+
+        return results.reset_index(drop=True)
+
+    def _get_cruise_altitudes(self, start: FlightPoint) -> np.ndarray:
+        """
+        Chooses flight levels by dynamic programming.
+
+        :param start: the completed start point
+        :return: the cruise altitude for each distance slice
+        """
+        # Values may come as 1-element arrays from OpenMDAO inputs.
+        start_altitude = float(np.ravel(start.altitude)[0])
+        start_mass = float(np.ravel(start.mass)[0])
+
+        altitudes = self._get_candidate_altitudes(start_altitude)
+        level_count = len(altitudes)
+        shape = (level_count, level_count)
+        slice_distance = self.target.ground_distance / self.slice_count
+
+        # Flight points for all (origin level, destination level) pairs, as 1D arrays for
+        # batch computation of the propulsion model.
+        flight_points = FlightPoint(
+            altitude=np.tile(altitudes, level_count),
+            engine_setting=self.engine_setting,
+        )
+        for speed_param in ["true_airspeed", "equivalent_airspeed", "mach"]:
+            if getattr(self.target, speed_param) == self.CONSTANT_VALUE:
+                setattr(flight_points, speed_param, float(np.ravel(getattr(start, speed_param))[0]))
+                break
+        self._complete_speed_values(flight_points)
+        atm = self._get_atmosphere(flight_points.altitude)
+        true_airspeed = np.reshape(flight_points.true_airspeed, shape)
+        reference_force = np.reshape(
+            0.5 * atm.density * flight_points.true_airspeed ** 2 * self.reference_area, shape
+        )
+        altitude_increase = altitudes[np.newaxis, :] - altitudes[:, np.newaxis]
+        is_climb_allowed = altitude_increase >= 0.0
+
+        # masses[i] is the best mass at start of slice at altitudes[i], or -inf if unreachable.
+        masses = np.full(level_count, -np.inf)
+        masses[0] = start_mass
+        origins = np.zeros((self.slice_count, level_count), dtype=int)
+        for k in range(self.slice_count):
+            is_allowed = is_climb_allowed & np.isfinite(masses)[:, np.newaxis]
+            if k == self.slice_count - 1:
+                # No climb at the start of the last slice
+                is_allowed &= altitude_increase == 0.0
+            mass = np.where(is_allowed, masses[:, np.newaxis], start_mass)
+
+            CL = mass * g / reference_force
+            CD = self.polar.cd(CL)
+            flight_points.CL = CL.ravel()
+            flight_points.CD = CD.ravel()
+            flight_points.thrust = (CD * reference_force).ravel()
+            flight_points.thrust_is_regulated = True
+            self.propulsion.compute_flight_points_batch(flight_points)
+
+            # Staying at start altitude is always allowed, so that a solution always exists.
+            is_thrust_enough = np.reshape(flight_points.thrust_rate, shape) <= 1.0
+            is_thrust_enough[0, 0] = True
+            is_allowed &= is_thrust_enough
+
+            # Climb, then cruise along the slice
+            range_factor = true_airspeed / g / np.reshape(flight_points.sfc, shape)
+            mass = mass - mass * altitude_increase / range_factor
+            mass = mass * np.exp(-slice_distance * CD / CL / range_factor)
+            mass = np.where(is_allowed, mass, -np.inf)
+
+            origins[k] = np.argmax(mass, axis=0)
+            masses = np.max(mass, axis=0)
+
+        # Backtracking from the best final flight level
+        level_indices = np.zeros(self.slice_count, dtype=int)
+        level_index = np.argmax(masses)
+        for k in reversed(range(self.slice_count)):
+            level_indices[k] = level_index
+            level_index = origins[k, level_index]
+
+        return altitudes[level_indices]
+
+    def _get_candidate_altitudes(self, start_altitude: float) -> np.ndarray:
+        """
+        :return: start altitude, followed by allowed flight levels above it, in meters
+        """
+        step = self.flight_level_step * 100.0 * foot
+        first_level = np.floor(start_altitude / step + 1.0e-6) + 1.0
+        last_level = np.floor(self.maximum_flight_level * 100.0 * foot / step + 1.0e-6)
+        flight_levels = np.arange(first_level, last_level + 1.0) * step
+        return np.concatenate([[start_altitude], flight_levels])
+
+    def _climb(
+        self, start: FlightPoint, altitude: float, cruise_segment: CruiseSegment
+    ) -> pd.DataFrame:
+        """
+        Climbs up to provided altitude with the speed parameter of cruise_segment target.
+
+        :return: climb flight points, including start point
+        """
+        if self.climb_segment is not None:
+            climb_segment = deepcopy(self.climb_segment)
+            climb_segment.name = self.name
+            return ClimbAndCruiseSegment._climb_to_altitude(
+                start, altitude, climb_segment, cruise_segment
+            )
+
+        # Instantaneous climb
+        end = deepcopy(start)
+        end.altitude = altitude
+        end.true_airspeed = end.equivalent_airspeed = end.mach = None
+        for speed_param in ["true_airspeed", "equivalent_airspeed", "mach"]:
+            if getattr(cruise_segment.target, speed_param) == self.CONSTANT_VALUE:
+                setattr(end, speed_param, getattr(start, speed_param))
+                break
+        end.mass = start.mass - start.mass * start.sfc * g * (altitude - start.altitude) / (
+            start.true_airspeed
+        )
+        end.name = self.name
+        self.complete_flight_point(end)
+        return pd.DataFrame([start, end])
+
+
 @dataclass
 class BreguetCruiseSegment(CruiseSegment, mission_file_keyword="breguet"):
     """
@@ -206,6 +451,10 @@ class BreguetCruiseSegment(CruiseSegment, mission_file_keyword="breguet"):
 
     As formula relies on SFC, the :attr:`propulsion` model must be able to fill FlightPoint.sfc
     when FlightPoint.thrust is provided.
+
+    If :attr:`slice_count` is more than 1, the cruise is split into slices, so that the
+    variations of lift/drag ratio and SFC with mass are accounted for. Results converge to
+    the ones of :class:`CruiseSegment` with much fewer computations.
     """
 
     #: if True, max lift/drag ratio will be used instead of the one computed with polar using
@@ -219,23 +468,36 @@ class BreguetCruiseSegment(CruiseSegment, mission_file_keyword="breguet"):
     #:
     climb_and_descent_distance: float = 0.0
 
+    #: Number of slices of equal distance the cruise is split into. Breguet-Leduc formula is
+    #: applied on each slice, with lift/drag ratio and SFC of the slice start point.
+    slice_count: int = 1
+
     def __post_init__(self):
         super().__post_init__()
         self.target.ground_distance = self.target.ground_distance - self.climb_and_descent_distance
+        # Values from mission files may be floats or arrays.
+        self.slice_count = int(np.asarray(self.slice_count).item())
+        if self.slice_count < 1:
+            raise ValueError(f"slice_count should be at least 1 (got {self.slice_count}).")
 
     def compute_from(self, start: FlightPoint) -> pd.DataFrame:
         self.complete_flight_point(start)
 
-        cruise_mass_ratio = self._compute_cruise_mass_ratio(start, self.target.ground_distance)
-
-        end = deepcopy(start)
-        end.mass = start.mass * cruise_mass_ratio
-        end.ground_distance = start.ground_distance + self.target.ground_distance
-        end.time = start.time + (end.ground_distance - start.ground_distance) / end.true_airspeed
-        end.name = self.name
-        self.complete_flight_point(end)
-
-        return pd.DataFrame([start, end])
+        slice_distance = self.target.ground_distance / self.slice_count
+        flight_points = [start]
+        for _ in range(self.slice_count):
+            slice_start = flight_points[-1]
+            cruise_mass_ratio = self._compute_cruise_mass_ratio(slice_start, slice_distance)
+
+            end = deepcopy(slice_start)
+            end.mass = slice_start.mass * cruise_mass_ratio
+            end.ground_distance = slice_start.ground_distance + slice_distance
+            end.time = slice_start.time + slice_distance / end.true_airspeed
+            end.name = self.name
+            self.complete_flight_point(end)
+            flight_points.append(end)
+
+        return pd.DataFrame(flight_points)
 
     def _compute_cruise_mass_ratio(self, start: FlightPoint, cruise_distance):
         """
@@ -16,8 +16,6 @@ from copy import deepcopy
 from dataclasses import dataclass
 from typing import Tuple
 
-import pandas as pd
-
 from fastoad.model_base import FlightPoint
 from fastoad.models.performances.mission.segments.base import FixedDurationSegment
 from .base import ManualThrustSegment
@@ -41,10 +39,10 @@ class TaxiSegment(ManualThrustSegment, FixedDurationSegment, mission_file_keywor
     def get_gamma_and_acceleration(self, flight_point: FlightPoint) -> Tuple[float, float]:
         return 0.0, 0.0
 
-    def compute_from(self, start: FlightPoint) -> pd.DataFrame:
+    def _prepare_start(self, start: FlightPoint) -> FlightPoint:
         new_start = deepcopy(start)
         new_start.mach = None
         new_start.equivalent_airspeed = None
         new_start.true_airspeed = self.true_airspeed
 
-        return super().compute_from(new_start)
+        return super()._prepare_start(new_start)
@@ -12,6 +12,7 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
+import numpy as np
 from numpy.testing import assert_allclose
 from scipy.constants import foot
 
@@ -91,7 +92,7 @@ def test_climb_optimal_altitude_at_fixed_TAS(polar):
 
     last_point = flight_points.iloc[-1]
     # Note: reference values are obtained by running the process with 0.01s as time step
-    assert_allclose(last_point.altitude, 10085.0, atol=0.1)
+    assert_allclose(last_point.altitude, 10085.5, atol=0.1)
     assert_allclose(last_point.true_airspeed, 250.0)
     assert_allclose(last_point.time, 84.1, rtol=1e-2)
     assert_allclose(last_point.mach, 0.8359, rtol=1e-4)
@@ -249,3 +250,25 @@ def test_descent_to_fixed_EAS_at_constant_mach(polar):
     assert_allclose(last_point.true_airspeed, 238.1, atol=0.1)
     assert_allclose(last_point.mass, 69962.0, rtol=1e-4)
     assert_allclose(last_point.ground_distance, 81042.0, rtol=1e-3)
+
+
+def test_climb_complex_step(polar):
+    propulsion = FuelEngineSet(DummyEngine(1.0e5, 1.0e-5), 2)
+
+    def get_end_point(start_mass):
+        segment = AltitudeChangeSegment(
+            target=FlightPoint(altitude=10000.0, mach="constant"),
+            propulsion=propulsion,
+            reference_area=120.0,
+            polar=polar,
+            thrust_rate=1.0,
+            engine_setting=EngineSetting.CLIMB,
+        )
+        flight_points = segment.compute_from(
+            FlightPoint(altitude=5000.0, mass=start_mass, mach=0.6)
+        )
+        return np.array([flight_points.mass.iloc[-1], flight_points.time.iloc[-1]])
+
+    complex_step_derivatives = np.imag(get_end_point(70000.0 + 1.0e-30j)) / 1.0e-30
+    finite_difference_derivatives = (get_end_point(70001.0) - get_end_point(69999.0)) / 2.0
+    assert_allclose(complex_step_derivatives, finite_difference_derivatives, rtol=1.0e-4)
@@ -0,0 +1,392 @@
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2022 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from copy import deepcopy
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+from scipy.constants import g
+from scipy.optimize import root_scalar
+from stdatm import AtmosphereSI
+
+from fastoad.constants import EngineSetting
+from fastoad.model_base import FlightPoint
+from fastoad.model_base.propulsion import FuelEngineSet
+from .conftest import DummyEngine
+from ..altitude_change import AltitudeChangeSegment
+from ..base import FlightSegment
+from ..cruise import BreguetCruiseSegment, CruiseSegment, OptimalCruiseSegment
+from ..hold import HoldSegment
+
+
+def as_float(values):
+    # Some values may be 1-element arrays
+    return np.array([np.asarray(value).item() for value in values])
+
+
+def check_batch_results(segment, starts):
+    batch_results = segment.compute_from_batch(starts)
+    assert len(batch_results) == len(starts)
+    for start, batch_flight_points in zip(starts, batch_results):
+        flight_points = deepcopy(segment).compute_from(deepcopy(start))
+        assert len(batch_flight_points) == len(flight_points)
+        for name in ["time", "altitude", "ground_distance", "mass", "true_airspeed", "mach"]:
+            assert_allclose(
+                as_float(batch_flight_points[name]), as_float(flight_points[name]), rtol=1e-6
+            )
+        assert list(batch_flight_points.columns) == list(flight_points.columns)
+        assert batch_flight_points.engine_setting.iloc[-1] == segment.engine_setting
+
+
+def test_batch_cruise(polar):
+    propulsion = FuelEngineSet(DummyEngine(0.5e5, 1.0e-5), 2)
+
+    segment = CruiseSegment(
+        target=FlightPoint(ground_distance=5.0e5),
+        propulsion=propulsion,
+        reference_area=120.0,
+        polar=polar,
+        engine_setting=EngineSetting.CRUISE,
+    )
+    starts = [
+        FlightPoint(mass=70000.0, altitude=10000.0, mach=0.78),
+        FlightPoint(mass=60000.0, altitude=10000.0, mach=0.78, ground_distance=1.0e5),
+        FlightPoint(mass=65000.0, altitude=9000.0, mach=0.75, time=500.0),
+    ]
+    check_batch_results(segment, starts)
+
+    # Segment instance is not modified
+    assert segment.target.ground_distance == 5.0e5
+
+
+def test_batch_climb(polar):
+    propulsion = FuelEngineSet(DummyEngine(1.0e5, 1.0e-5), 2)
+
+    segment = AltitudeChangeSegment(
+        target=FlightPoint(altitude=10000.0, equivalent_airspeed="constant"),
+        propulsion=propulsion,
+        reference_area=120.0,
+        polar=polar,
+        thrust_rate=1.0,
+        time_step=2.0,
+        engine_setting=EngineSetting.CLIMB,
+    )
+    starts = [
+        FlightPoint(altitude=5000.0, mass=70000.0, equivalent_airspeed=100.0),
+        FlightPoint(altitude=8000.0, mass=75000.0, equivalent_airspeed=110.0),
+        # Already on target
+        FlightPoint(altitude=10000.0, mass=75000.0, equivalent_airspeed=110.0),
+    ]
+    check_batch_results(segment, starts)
+
+
+def test_batch_climb_interrupted(polar):
+    propulsion = FuelEngineSet(DummyEngine(1.0e5, 1.0e-5), 2)
+
+    segment = AltitudeChangeSegment(
+        target=FlightPoint(altitude=10000.0, true_airspeed="constant"),
+        propulsion=propulsion,
+        reference_area=120.0,
+        polar=polar,
+        thrust_rate=0.1,
+        time_step=2.0,
+    )
+    starts = [
+        # Thrust is too low: aircraft descends instead of climbing.
+        FlightPoint(altitude=5000.0, mass=70000.0, true_airspeed=150.0),
+        FlightPoint(altitude=5000.0, mass=10000.0, true_airspeed=150.0),
+    ]
+    results = segment.compute_from_batch(starts)
+    assert len(results[0]) == 1
+    assert_allclose(results[1].altitude.iloc[-1], 10000.0)
+    check_batch_results(segment, starts)
+
+
+def test_batch_hold(polar):
+    propulsion = FuelEngineSet(DummyEngine(0.5e5, 2.0e-5), 2)
+
+    segment = HoldSegment(
+        target=FlightPoint(time=3000.0),
+        propulsion=propulsion,
+        reference_area=120.0,
+        polar=polar,
+        engine_setting=EngineSetting.CRUISE,
+    )
+    starts = [
+        FlightPoint(altitude=500.0, equivalent_airspeed=250.0, mass=60000.0),
+        FlightPoint(altitude=1000.0, equivalent_airspeed=230.0, mass=55000.0, time=100.0),
+    ]
+    check_batch_results(segment, starts)
+
+
+def test_batch_optimal_cruise(polar):
+    propulsion = FuelEngineSet(DummyEngine(0.5e5, 1.0e-5), 2)
+
+    segment = OptimalCruiseSegment(
+        target=FlightPoint(ground_distance=5.0e5),
+        propulsion=propulsion,
+        reference_area=120.0,
+        polar=polar,
+        engine_setting=EngineSetting.CRUISE,
+    )
+    starts = [
+        FlightPoint(mass=70000.0, mach=0.78),
+        FlightPoint(mass=60000.0, mach=0.78),
+    ]
+    check_batch_results(segment, starts)
+
+
+def test_batch_not_vectorized(polar):
+    propulsion = FuelEngineSet(DummyEngine(0.5e5, 1.0e-5), 2)
+
+    segment = BreguetCruiseSegment(
+        target=FlightPoint(ground_distance=5.0e5),
+        propulsion=propulsion,
+        reference_area=120.0,
+        polar=polar,
+        engine_setting=EngineSetting.CRUISE,
+    )
+    starts = [
+        FlightPoint(mass=70000.0, altitude=10000.0, mach=0.78),
+        FlightPoint(mass=60000.0, altitude=9000.0, mach=0.78),
+    ]
+    check_batch_results(segment, starts)
+
+
+def test_adaptive_time_step(polar):
+    propulsion = FuelEngineSet(DummyEngine(1.0e5, 1.0e-5), 2)
+
+    def compute(segment_class, target, start, **kwargs):
+        segment = segment_class(
+            target=target,
+            propulsion=propulsion,
+            reference_area=120.0,
+            polar=polar,
+            **kwargs,
+        )
+        return segment.compute_from(start)
+
+    for segment_class, target, start, time_step, reference_time_step in [
+        (
+            CruiseSegment,
+            FlightPoint(ground_distance=5.0e6),
+            FlightPoint(mass=70000.0, altitude=10000.0, mach=0.78),
+            60.0,
+            5.0,
+        ),
+        (
+            AltitudeChangeSegment,
+            FlightPoint(altitude=10000.0, equivalent_airspeed="constant"),
+            FlightPoint(altitude=5000.0, mass=70000.0, equivalent_airspeed=100.0),
+            2.0,
+            0.05,
+        ),
+    ]:
+        kwargs = {} if segment_class is CruiseSegment else {"thrust_rate": 1.0}
+        reference = compute(
+            segment_class, target, deepcopy(start), time_step=reference_time_step, **kwargs
+        )
+        fixed = compute(segment_class, target, deepcopy(start), time_step=time_step, **kwargs)
+        adaptive = compute(
+            segment_class,
+            target,
+            deepcopy(start),
+            time_step=time_step,
+            adaptive_time_step=True,
+            **kwargs,
+        )
+        for name in ["ground_distance", "altitude"]:
+            assert_allclose(adaptive[name].iloc[-1], reference[name].iloc[-1], rtol=1.0e-5)
+
+        # Adaptive time step is more accurate than fixed time step
+        reference_fuel = reference.mass.iloc[0] - reference.mass.iloc[-1]
+        fixed_error = abs(fixed.mass.iloc[0] - fixed.mass.iloc[-1] - reference_fuel)
+        adaptive_error = abs(adaptive.mass.iloc[0] - adaptive.mass.iloc[-1] - reference_fuel)
+        assert adaptive_error < fixed_error
+        assert_allclose(adaptive.time.iloc[-1], reference.time.iloc[-1], rtol=1.0e-4)
+
+        if segment_class is CruiseSegment:
+            # Far less points are needed.
+            assert len(adaptive) < len(fixed) / 2
+
+
+class _CountingEngineSet(FuelEngineSet):
+    """Engine set that counts calls to compute_flight_points()."""
+
+    call_count = 0
+
+    def compute_flight_points(self, flight_points):
+        _CountingEngineSet.call_count += 1
+        super().compute_flight_points(flight_points)
+
+
+def _locate_target_crossing_with_root_scalar(
+    self, flight_points, time_step, previous_point_to_target, tol
+):
+    """Locates target crossing with secant iterations from two new time steps."""
+
+    def replace_last_point(new_time_step):
+        if isinstance(new_time_step, np.ndarray):
+            new_time_step = new_time_step.item()
+        del flight_points[-1]
+        self._add_new_flight_point(flight_points, new_time_step)
+        return self.get_distance_to_target(flight_points)
+
+    root_scalar(replace_last_point, x0=time_step, x1=time_step / 2.0, rtol=tol)
+    return self.get_distance_to_target(flight_points)
+
+
+def test_target_crossing(polar, monkeypatch):
+    propulsion = _CountingEngineSet(DummyEngine(0.5e5, 1.0e-5), 2)
+
+    def compute(segment_class, target, start, **kwargs):
+        segment = segment_class(
+            target=target, propulsion=propulsion, reference_area=120.0, polar=polar, **kwargs
+        )
+        _CountingEngineSet.call_count = 0
+        flight_points = segment.compute_from(deepcopy(start))
+        return flight_points, _CountingEngineSet.call_count
+
+    cases = [
+        (
+            CruiseSegment,
+            FlightPoint(ground_distance=5.0e5),
+            FlightPoint(mass=70000.0, altitude=10000.0, mach=0.78),
+            {},
+            "ground_distance",
+        ),
+        (
+            AltitudeChangeSegment,
+            FlightPoint(altitude=10000.0, equivalent_airspeed="constant"),
+            FlightPoint(altitude=5000.0, mass=70000.0, equivalent_airspeed=100.0),
+            {"thrust_rate": 1.0},
+            "altitude",
+        ),
+        (
+            HoldSegment,
+            FlightPoint(time=1234.5),
+            FlightPoint(mass=70000.0, altitude=10000.0, mach=0.78),
+            {},
+            "time",
+        ),
+    ]
+    results = {}
+    for locate_with_root_scalar in [False, True]:
+        if locate_with_root_scalar:
+            monkeypatch.setattr(
+                FlightSegment, "_locate_target_crossing", _locate_target_crossing_with_root_scalar
+            )
+        results[locate_with_root_scalar] = [
+            compute(segment_class, target, start, **kwargs)
+            for segment_class, target, start, kwargs, _ in cases
+        ]
+
+    for i, (_, target, _, _, target_name) in enumerate(cases):
+        flight_points, call_count = results[False][i]
+        reference_flight_points, reference_call_count = results[True][i]
+
+        assert_allclose(
+            flight_points[target_name].iloc[-1], getattr(target, target_name), atol=1.0e-5
+        )
+        # Same results as before, with fewer propulsion calls
+        assert len(flight_points) == len(reference_flight_points)
+        for name in ["time", "altitude", "ground_distance", "mass"]:
+            assert_allclose(
+                flight_points[name].iloc[-1], reference_flight_points[name].iloc[-1], rtol=1.0e-6
+            )
+        assert call_count < reference_call_count
+
+
+def test_atmosphere_with_1_element_arrays(polar):
+    propulsion = FuelEngineSet(DummyEngine(0.5e5, 1.0e-5), 2)
+    segment = CruiseSegment(
+        target=FlightPoint(ground_distance=5.0e5),
+        propulsion=propulsion,
+        reference_area=120.0,
+        polar=polar,
+    )
+
+    flight_point = FlightPoint(altitude=10000.0, mass=70000.0, mach=0.78)
+    array_flight_point = FlightPoint(
+        altitude=np.array([10000.0]), mass=np.array([70000.0]), mach=np.array([0.78])
+    )
+    segment.complete_flight_point(flight_point)
+    segment.complete_flight_point(array_flight_point)
+    for name in ["true_airspeed", "equivalent_airspeed", "CL", "CD", "drag", "thrust"]:
+        assert_allclose(getattr(array_flight_point, name), getattr(flight_point, name))
+
+
+def test_atmosphere_models(polar):
+    propulsion = FuelEngineSet(DummyEngine(0.5e5, 1.0e-5), 2)
+
+    def get_segment(**kwargs):
+        return AltitudeChangeSegment(
+            target=FlightPoint(altitude=10000.0, mach=AltitudeChangeSegment.CONSTANT_VALUE),
+            propulsion=propulsion,
+            reference_area=120.0,
+            polar=polar,
+            thrust_rate=1.0,
+            engine_setting=EngineSetting.CLIMB,
+            **kwargs,
+        )
+
+    altitudes = np.array([-3000.0, 0.0, 5432.1, 11000.0, 12345.6, 35000.0])
+    for delta_isa in [0.0, 15.0]:
+        reference = AtmosphereSI(altitudes, delta_isa)
+        atm = get_segment(atmosphere="tabulated", delta_isa=delta_isa)._get_atmosphere(altitudes)
+        assert_allclose(atm.temperature, reference.temperature, rtol=1.0e-10)
+        assert_allclose(atm.pressure, reference.pressure, rtol=1.0e-6)
+        assert_allclose(atm.density, reference.density, rtol=1.0e-6)
+        assert_allclose(
+            get_segment(delta_isa=delta_isa)._get_atmosphere(altitudes).density,
+            reference.density,
+        )
+
+    start = FlightPoint(altitude=0.0, mass=70000.0, mach=0.5)
+    reference_flight_points = get_segment().compute_from(deepcopy(start))
+    flight_points = get_segment(atmosphere="tabulated").compute_from(deepcopy(start))
+    assert_allclose(flight_points.mass.iloc[-1], reference_flight_points.mass.iloc[-1], rtol=1.0e-6)
+
+    # Higher temperature means lower density, hence higher true airspeed at same Mach.
+    hot_flight_points = get_segment(delta_isa=15.0).compute_from(deepcopy(start))
+    assert hot_flight_points.true_airspeed.iloc[-1] > reference_flight_points.true_airspeed.iloc[-1]
+
+    with pytest.raises(ValueError):
+        get_segment(atmosphere="unknown").compute_from(deepcopy(start))
+
+
+def test_optimal_altitude(polar):
+    propulsion = FuelEngineSet(DummyEngine(0.5e5, 1.0e-5), 2)
+    segment = OptimalCruiseSegment(
+        target=FlightPoint(ground_distance=5.0e5),
+        propulsion=propulsion,
+        reference_area=120.0,
+        polar=polar,
+    )
+
+    masses = np.array([40000.0, 70000.0, 70000.0, 120000.0])
+    machs = np.array([0.78, 0.5, 0.85, 0.78])
+    altitudes = segment._get_optimal_altitude(masses, machs)
+
+    # Results are in troposphere and stratosphere
+    assert np.any(altitudes < 11000.0) and np.any(altitudes > 11000.0)
+    for mass, mach, altitude in zip(masses, machs, altitudes):
+        atm = AtmosphereSI(altitude)
+        atm.mach = mach
+        assert_allclose(
+            mass * g / (0.5 * atm.density * atm.true_airspeed ** 2 * 120.0),
+            polar.optimal_cl,
+            rtol=1.0e-8,
+        )
+        assert_allclose(segment._get_optimal_altitude(mass, mach), altitude)
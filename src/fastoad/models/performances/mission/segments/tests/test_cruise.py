@@ -12,7 +12,12 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
+from copy import deepcopy
+
+import numpy as np
+import pytest
 from numpy.testing import assert_allclose
+from scipy.constants import foot
 
 from fastoad.constants import EngineSetting
 from fastoad.model_base import FlightPoint
@@ -24,6 +29,7 @@ from ..cruise import (
     ClimbAndCruiseSegment,
     CruiseSegment,
     OptimalCruiseSegment,
+    StepClimbCruiseSegment,
 )
 
 
@@ -86,6 +92,45 @@ def test_breguet_cruise(polar):
     assert last_point.engine_setting == EngineSetting.CRUISE
 
 
+def test_breguet_cruise_with_slices(polar):
+    propulsion = FuelEngineSet(DummyEngine(0.5e5, 1.0e-5), 2)
+    start = FlightPoint(mass=70000.0, altitude=10000.0, mach=0.78)
+
+    def compute(segment_class, **kwargs):
+        segment = segment_class(
+            target=FlightPoint(ground_distance=8.0e6),
+            propulsion=propulsion,
+            reference_area=120.0,
+            polar=polar,
+            **kwargs,
+        )
+        return segment.compute_from(deepcopy(start))
+
+    reference_fuel = start.mass - compute(CruiseSegment).mass.iloc[-1]
+
+    flight_points = compute(BreguetCruiseSegment)
+    assert len(flight_points) == 2
+    single_step_fuel = start.mass - flight_points.mass.iloc[-1]
+    assert_allclose(single_step_fuel, reference_fuel, rtol=2e-2)
+
+    flight_points = compute(BreguetCruiseSegment, slice_count=10)
+    assert len(flight_points) == 11
+    assert_allclose(np.diff(flight_points.ground_distance), 8.0e5)
+    assert np.all(np.diff(flight_points.mass) < 0.0)
+    sliced_fuel = start.mass - flight_points.mass.iloc[-1]
+    assert_allclose(sliced_fuel, reference_fuel, rtol=2e-3)
+    assert abs(sliced_fuel - reference_fuel) < 0.2 * abs(single_step_fuel - reference_fuel)
+
+    # Slice count from mission files may be a float or an array
+    for slice_count in [10.0, np.array([10.0])]:
+        assert_allclose(
+            compute(BreguetCruiseSegment, slice_count=slice_count).mass, flight_points.mass
+        )
+
+    with pytest.raises(ValueError):
+        compute(BreguetCruiseSegment, slice_count=0)
+
+
 def test_optimal_cruise(polar):
     propulsion = FuelEngineSet(DummyEngine(0.5e5, 1.0e-5), 2)
 
@@ -162,6 +207,51 @@ def test_climb_and_cruise_at_optimal_flight_level(polar):
     assert last_point.engine_setting == EngineSetting.CRUISE
 
 
+def test_climb_and_cruise_at_optimal_flight_level_reuses_climb(polar):
+    propulsion = FuelEngineSet(DummyEngine(0.5e5, 3.0e-5), 2)
+    reference_area = 120.0
+    start = FlightPoint(mass=70000.0, altitude=8000.0, mach=0.78, ground_distance=1.0e6)
+
+    def compute(target_altitude):
+        segment = ClimbAndCruiseSegment(
+            target=FlightPoint(ground_distance=10.0e6, altitude=target_altitude),
+            propulsion=propulsion,
+            reference_area=reference_area,
+            polar=polar,
+            engine_setting=EngineSetting.CRUISE,
+            climb_segment=AltitudeChangeSegment(
+                target=FlightPoint(),
+                propulsion=propulsion,
+                reference_area=reference_area,
+                polar=polar,
+                thrust_rate=0.9,
+                engine_setting=EngineSetting.CLIMB,
+            ),
+        )
+        return segment.compute_from(deepcopy(start))
+
+    flight_points = compute(AltitudeChangeSegment.OPTIMAL_FLIGHT_LEVEL)
+
+    # Search from scratch: each candidate flight level is reached with a complete climb.
+    best_flight_points = None
+    flight_level = np.ceil(start.altitude / foot / 1000.0) * 10.0
+    while True:
+        candidate = compute(flight_level * 100.0 * foot)
+        if (
+            best_flight_points is not None
+            and candidate.mass.iloc[-1] <= best_flight_points.mass.iloc[-1]
+        ):
+            break
+        best_flight_points = candidate
+        flight_level += 10.0
+    # Several candidate flight levels have been tested.
+    assert flight_level > np.ceil(start.altitude / foot / 1000.0) * 10.0 + 20.0
+
+    assert_allclose(flight_points.altitude.iloc[-1], best_flight_points.altitude.iloc[-1])
+    assert_allclose(flight_points.mass.iloc[-1], best_flight_points.mass.iloc[-1], rtol=1.0e-5)
+    assert_allclose(flight_points.time.iloc[-1], best_flight_points.time.iloc[-1], rtol=1.0e-5)
+
+
 def test_climb_and_cruise_at_optimal_flight_level_with_capped_flight_level(polar):
     propulsion = FuelEngineSet(DummyEngine(0.5e5, 3.0e-5), 2)
     reference_area = 120.0
@@ -240,3 +330,122 @@ def test_climb_and_cruise_at_optimal_flight_level_with_start_at_exact_flight_lev
     assert_allclose(last_point.time, 42659.0, rtol=1e-3)
     assert_allclose(last_point.true_airspeed, 234.4, atol=0.1)
     assert_allclose(last_point.mass, 48987.0, rtol=1e-4)
+
+
+def test_step_climb_cruise(polar):
+    propulsion = FuelEngineSet(DummyEngine(0.5e5, 3.0e-5), 2)
+    reference_area = 120.0
+    start = FlightPoint(mass=70000.0, altitude=8000.0, mach=0.78, ground_distance=1.0e6)
+
+    constant_altitude_points = CruiseSegment(
+        target=FlightPoint(ground_distance=10.0e6),
+        propulsion=propulsion,
+        reference_area=reference_area,
+        polar=polar,
+    ).compute_from(start)
+
+    for climb_segment in [
+        None,
+        AltitudeChangeSegment(
+            target=FlightPoint(),
+            propulsion=propulsion,
+            reference_area=reference_area,
+            polar=polar,
+            thrust_rate=0.9,
+            engine_setting=EngineSetting.CLIMB,
+        ),
+    ]:
+        segment = StepClimbCruiseSegment(
+            target=FlightPoint(ground_distance=10.0e6),
+            propulsion=propulsion,
+            reference_area=reference_area,
+            polar=polar,
+            engine_setting=EngineSetting.CRUISE,
+            climb_segment=climb_segment,
+            maximum_flight_level=390.0,
+            name="cruise",
+        )
+        flight_points = segment.compute_from(start)
+
+        first_point = flight_points.iloc[0]
+        last_point = flight_points.iloc[-1]
+        assert_allclose(first_point.altitude, 8000.0)
+        assert_allclose(flight_points.mach, 0.78)
+        assert_allclose(last_point.ground_distance, 11.0e6)
+        assert (flight_points.name.iloc[1:] == "cruise").all()
+
+        # Altitude only increases, by steps, up to flight levels that are multiples of 2000 ft
+        altitudes = flight_points.altitude.to_numpy()
+        assert np.all(np.diff(altitudes) >= -1.0e-6)
+        cruise_altitudes = np.unique(np.round(altitudes[altitudes > 8000.0] / foot))
+        assert len(cruise_altitudes[cruise_altitudes % 2000 == 0]) >= 2
+        assert np.max(altitudes) <= 39000.0 * foot + 1.0e-6
+
+        # Step climbs save fuel
+        assert last_point.mass > constant_altitude_points.mass.iloc[-1] + 500.0
+
+
+class _AltitudeLimitedEngine(DummyEngine):
+    """Dummy engine where max thrust decreases with altitude, and SFC is constant."""
+
+    def compute_flight_points(self, flight_point: FlightPoint):
+        max_thrust = self.max_thrust * (1.0 - flight_point.altitude / 20000.0)
+        flight_point.thrust_rate = flight_point.thrust / max_thrust
+        flight_point.sfc = self.max_sfc * np.ones_like(flight_point.thrust_rate)
+
+
+def test_step_climb_cruise_thrust_limit(polar):
+    start = FlightPoint(mass=70000.0, altitude=8000.0, mach=0.78)
+
+    def compute(max_thrust):
+        segment = StepClimbCruiseSegment(
+            target=FlightPoint(ground_distance=5.0e6),
+            propulsion=FuelEngineSet(_AltitudeLimitedEngine(max_thrust, 2.0e-5), 2),
+            reference_area=120.0,
+            polar=polar,
+            maximum_flight_level=430.0,
+        )
+        return segment.compute_from(start)
+
+    # With enough thrust, the best profile goes up to FL300...
+    flight_points = compute(1.0e5)
+    assert_allclose(np.max(flight_points.altitude), 30000.0 * foot)
+
+    # ... which needs a thrust rate greater than 1 with a smaller engine.
+    flight_points = compute(2.6e4)
+    assert np.max(flight_points.altitude) > 8000.0
+    assert np.all(flight_points.thrust_rate <= 1.0)
+
+
+class _ScalarDummyEngine(DummyEngine):
+    is_vectorized = False
+
+    def compute_flight_points(self, flight_point: FlightPoint):
+        assert np.ndim(flight_point.thrust) == 0
+        super().compute_flight_points(flight_point)
+
+
+def test_step_climb_cruise_with_scalar_engine(polar):
+    start = FlightPoint(mass=70000.0, altitude=8000.0, mach=0.78)
+
+    def compute(engine, slice_count):
+        segment = StepClimbCruiseSegment(
+            target=FlightPoint(ground_distance=5.0e6),
+            propulsion=FuelEngineSet(engine, 2),
+            reference_area=120.0,
+            polar=polar,
+            maximum_flight_level=390.0,
+            slice_count=slice_count,
+        )
+        assert segment.slice_count == 5
+        return segment.compute_from(start)
+
+    # Slice count from mission files may be a float or an array
+    flight_points = compute(_ScalarDummyEngine(0.5e5, 3.0e-5), 5.0)
+    expected_points = compute(DummyEngine(0.5e5, 3.0e-5), np.array([5]))
+    assert_allclose(flight_points.altitude, expected_points.altitude)
+    assert_allclose(flight_points.mass, expected_points.mass)
+    assert np.max(flight_points.altitude) > 8000.0
+
+    with pytest.raises(ValueError):
+        compute(DummyEngine(0.5e5, 3.0e-5), 0)
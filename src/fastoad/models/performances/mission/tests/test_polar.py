@@ -0,0 +1,122 @@
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2022 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy as np
+import openmdao.api as om
+from numpy.testing import assert_allclose
+from scipy.interpolate import interp1d
+
+from ..polar import Polar
+
+
+def test_polar():
+    cl = np.array([0.0, 0.2, 0.5, 0.7, 0.9, 1.2, 1.5])
+    cd = 0.06 * cl ** 2 - 0.01 * cl + 0.015 + 0.002 * np.sin(5.0 * cl)
+    polar = Polar(cl, cd)
+    reference_cd = interp1d(cl, cd, kind="quadratic", fill_value="extrapolate")
+
+    assert_allclose(polar.cd(), cd, atol=1.0e-15)
+
+    # Array values, with extrapolation
+    cl_values = np.linspace(-0.5, 2.0, 251)
+    assert_allclose(polar.cd(cl_values), reference_cd(cl_values), atol=1.0e-14)
+    assert_allclose(polar.cd(cl_values.reshape((-1, 1))), reference_cd(cl_values).reshape((-1, 1)))
+
+    # Scalar values
+    for cl_value in cl_values:
+        cd_value = polar.cd(float(cl_value))
+        assert isinstance(cd_value, float)
+        assert_allclose(cd_value, reference_cd(cl_value), atol=1.0e-14)
+
+    # Optimal CL
+    lift_drag_ratio = cl_values / reference_cd(cl_values)
+    lift_drag_ratio[(cl_values < 0.0) | (cl_values > 1.5)] = 0.0
+    assert_allclose(polar.optimal_cl, cl_values[np.argmax(lift_drag_ratio)], atol=0.01)
+    assert polar.optimal_cl / polar.cd(polar.optimal_cl) >= np.max(lift_drag_ratio)
+
+
+def test_polar_cache():
+    cl = np.linspace(0.0, 1.5, 16)
+    cd = 0.05 * cl ** 2 + 0.01
+    polar1 = Polar(cl, cd)
+    polar2 = Polar(list(cl), list(cd))
+    polar3 = Polar(cl, cd + 0.001)
+
+    assert polar1._compiled is polar2._compiled
+    assert polar1._compiled is not polar3._compiled
+    assert_allclose(polar1.optimal_cl, np.sqrt(0.01 / 0.05))
+    assert_allclose(polar3.optimal_cl, np.sqrt(0.011 / 0.05))
+
+
+def test_degenerate_polar():
+    # Constant lift/drag ratio
+    cl = np.linspace(0.0, 1.5, 150)
+    polar = Polar(cl, cl / 16.0)
+    assert_allclose(polar.optimal_cl / polar.cd(polar.optimal_cl), 16.0)
+
+
+def test_complex_polar():
+    cl = np.linspace(0.0, 1.5, 16)
+    h = 1.0e-30
+
+    # Complex step on CD definition
+    polar = Polar(cl, 0.05 * cl ** 2 + 0.01 + 1j * h)
+    assert_allclose(np.real(polar.optimal_cl), np.sqrt(0.01 / 0.05))
+    assert_allclose(np.imag(polar.optimal_cl) / h, 0.5 / np.sqrt(0.05 * 0.01), rtol=1.0e-10)
+    assert_allclose(np.imag(polar.cd(0.5)) / h, 1.0, rtol=1.0e-10)
+
+    # Complex step on CL value
+    polar = Polar(cl, 0.05 * cl ** 2 + 0.01)
+    assert_allclose(np.imag(polar.cd(0.5 + 1j * h)) / h, 0.05, rtol=1.0e-10)
+
+
+class _PolarComponent(om.ExplicitComponent):
+    """Computes CD for a CL value and optimal CL of a polar, with complex-step partials."""
+
+    def setup(self):
+        self.add_input("CL", shape=7)
+        self.add_input("CD", shape=7)
+        self.add_input("cl", val=0.6)
+        self.add_output("cd")
+        self.add_output("optimal_cl")
+        self.declare_partials("*", "*", method="cs")
+
+    def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        polar = Polar(inputs["CL"], inputs["CD"])
+        outputs["cd"] = polar.cd(inputs["cl"])
+        outputs["optimal_cl"] = polar.optimal_cl
+
+
+def test_polar_complex_step_partials():
+    cl = np.array([0.0, 0.2, 0.5, 0.7, 0.9, 1.2, 1.5])
+    cd = 0.06 * cl ** 2 - 0.01 * cl + 0.015 + 0.002 * np.sin(5.0 * cl)
+
+    problem = om.Problem()
+    problem.model.add_subsystem("polar", _PolarComponent(), promotes=["*"])
+    problem.setup(force_alloc_complex=True)
+    problem["CL"] = cl
+    problem["CD"] = cd
+    problem.run_model()
+
+    # OpenMDAO does not check complex-step partials with complex step, so central finite
+    # differences are the reference.
+    data = problem.check_partials(method="fd", form="central", step=1.0e-6, out_stream=None)
+    for (output_name, input_name), values in data["polar"].items():
+        assert_allclose(
+            values["J_fwd"],
+            values["J_fd"],
+            rtol=1.0e-5,
+            atol=1.0e-9,
+            err_msg=f"d{output_name}/d{input_name}",
+        )
+    assert np.all(data["polar"]["optimal_cl", "CD"]["J_fwd"] != 0.0)
@@ -22,6 +22,7 @@ non-regression tests).
 
 import os.path as pth
 from abc import ABC
+from copy import deepcopy
 from os import mkdir
 from shutil import rmtree
 from typing import List, Union
@@ -41,6 +42,7 @@ from fastoad.models.performances.mission.routes import RangedRoute
 from fastoad.models.performances.mission.segments.altitude_change import AltitudeChangeSegment
 from fastoad.models.performances.mission.segments.cruise import CruiseSegment
 from fastoad.models.performances.mission.segments.speed_change import SpeedChangeSegment
+from fastoad.models.performances.mission.trajectory import TrajectoryBuffer
 
 DATA_FOLDER_PATH = pth.join(pth.dirname(__file__), "data")
 RESULTS_FOLDER_PATH = pth.join(pth.dirname(__file__), "results")
@@ -153,13 +155,11 @@ def plot_flight(flight_points, fig_filename):
     plt.close()
 
 
-def test_ranged_route(low_speed_polar, high_speed_polar, cleanup):
+def _build_ranged_route(low_speed_polar, high_speed_polar, total_distance) -> RangedRoute:
 
     engine = DummyEngine(1e5, 2.0e-5)
     propulsion = FuelEngineSet(engine, 2)
 
-    total_distance = 2.0e6
-
     kwargs = dict(propulsion=propulsion, reference_area=120.0)
     initial_climb = InitialClimbPhase(
         **kwargs, polar=low_speed_polar, thrust_rate=1.0, name="initial_climb", time_step=0.2
@@ -189,7 +189,13 @@ def test_ranged_route(low_speed_polar, high_speed_polar, cleanup):
         time_step=5.0,
     )
 
-    flight_calculator = RangedRoute([initial_climb, climb], cruise, [descent], total_distance)
+    return RangedRoute([initial_climb, climb], cruise, [descent], total_distance)
+
+
+def test_ranged_route(low_speed_polar, high_speed_polar, cleanup):
+
+    total_distance = 2.0e6
+    flight_calculator = _build_ranged_route(low_speed_polar, high_speed_polar, total_distance)
     assert flight_calculator.cruise_speed == ("mach", 0.78)
 
     start = FlightPoint(
@@ -205,6 +211,63 @@ def test_ranged_route(low_speed_polar, high_speed_polar, cleanup):
         atol=flight_calculator.distance_accuracy,
     )
 
+    # Same computation gives same result
+    cruise_distance = flight_calculator.solved_cruise_distance
+    new_flight_points = flight_calculator.compute_from(start)
+    assert flight_calculator.solved_cruise_distance == cruise_distance
+    assert_allclose(new_flight_points.mass, flight_points.mass, rtol=1e-12)
+
+    # Start from provided guess
+    flight_calculator.cruise_distance_guess = cruise_distance
+    new_flight_points = flight_calculator.compute_from(start)
+    assert_allclose(
+        flight_calculator.solved_cruise_distance,
+        cruise_distance,
+        atol=flight_calculator.distance_accuracy,
+    )
+    assert_allclose(
+        new_flight_points.iloc[-1].ground_distance,
+        total_distance + start.ground_distance,
+        atol=flight_calculator.distance_accuracy,
+    )
+
+    # Boundaries of cruise (phases of this test module are not named flight parts)
+    start, end = flight_calculator.part_boundaries["cruise"]
+    assert (new_flight_points.name.iloc[start + 1 : end + 1] == "cruise").all()
+    assert new_flight_points.name.iloc[start] != "cruise"
+    assert new_flight_points.name.iloc[end + 1] != "cruise"
+
+    # Computation into a shared trajectory, after another flight point
+    trajectory = TrajectoryBuffer()
+    trajectory.append(
+        FlightPoint(
+            true_airspeed=150.0 * knot,
+            altitude=100.0 * foot,
+            mass=70000.0,
+            ground_distance=100000.0,
+            name="takeoff",
+        )
+    )
+    flight_calculator.compute_into(deepcopy(trajectory[-1]), trajectory)
+    assert len(trajectory) == len(new_flight_points)
+    assert_allclose(trajectory.to_dataframe().mass, new_flight_points.mass)
+    assert trajectory[0].name == "takeoff"
+    assert flight_calculator.part_boundaries["cruise"] == (start, end)
+
+
+def test_ranged_route_complex_step(low_speed_polar, high_speed_polar):
+    def get_fuel(start_mass):
+        flight_calculator = _build_ranged_route(low_speed_polar, high_speed_polar, 2.0e6)
+        flight_calculator.distance_accuracy = 1.0e-3
+        start = FlightPoint(true_airspeed=150.0 * knot, altitude=100.0 * foot, mass=start_mass)
+        flight_points = flight_calculator.compute_from(start)
+        assert_allclose(np.real(flight_points.ground_distance.iloc[-1]), 2.0e6, atol=1.0e-3)
+        return start_mass - flight_points.mass.iloc[-1]
+
+    complex_step_derivative = np.imag(get_fuel(70000.0 + 1.0e-30j)) / 1.0e-30
+    finite_difference_derivative = (get_fuel(70010.0) - get_fuel(69990.0)) / 20.0
+    assert_allclose(complex_step_derivative, finite_difference_derivative, rtol=1.0e-4)
+
 
 # We define here in Python the flight phases that feed the test of RangedRoute ============
 
@@ -0,0 +1,192 @@
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2022 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose
+from pandas.testing import assert_frame_equal
+
+from fastoad.constants import EngineSetting
+from fastoad.model_base import FlightPoint
+from ..trajectory import BoundaryTrajectoryBuffer, TrajectoryBuffer
+
+
+@pytest.fixture
+def flight_points():
+    return [
+        FlightPoint(time=0.0, altitude=0.0, mass=70000.0, name="start"),
+        FlightPoint(
+            time=10.0,
+            altitude=100.0,
+            mass=np.array([69990.0]),
+            engine_setting=EngineSetting.CLIMB,
+            thrust_is_regulated=False,
+            name="climb",
+        ),
+        FlightPoint(time=20.0, altitude=200.0, mass=69980.0, CL=0.5, name="climb"),
+    ]
+
+
+def test_buffer(flight_points):
+    buffer = TrajectoryBuffer(capacity=2)
+    buffer.extend(flight_points)
+
+    assert len(buffer) == 3
+    # First and last flight points are the original instances
+    assert buffer[0] is flight_points[0]
+    assert buffer[-1] is flight_points[-1]
+    assert buffer[1] is flight_points[1]
+    with pytest.raises(IndexError):
+        _ = buffer[3]
+
+    expected = pd.DataFrame(flight_points)
+    expected["mass"] = [70000.0, 69990.0, 69980.0]
+    assert_frame_equal(buffer.to_dataframe(), expected)
+
+    del buffer[-1]
+    del buffer[-1]
+    assert len(buffer) == 1
+    buffer.append(flight_points[-1])
+    assert buffer[-2] is flight_points[0]
+    with pytest.raises(IndexError):
+        del buffer[0]
+
+    # Flight points that are not kept as instances are rebuilt from stored values
+    buffer = TrajectoryBuffer()
+    buffer.extend(flight_points + [FlightPoint(), FlightPoint()])
+    assert buffer[1] == FlightPoint(
+        time=10.0,
+        altitude=100.0,
+        mass=69990.0,
+        engine_setting=EngineSetting.CLIMB,
+        thrust_is_regulated=False,
+        name="climb",
+    )
+
+
+def test_buffer_with_added_field(flight_points):
+    FlightPoint.add_field("warp", annotation_type=int, default_value=9)
+    FlightPoint.add_field("ion_drive_power")
+    try:
+        buffer = TrajectoryBuffer()
+        buffer.append(FlightPoint(ion_drive_power=110.0))
+        buffer.append(FlightPoint(warp=12, ion_drive_power="off"))
+        df = buffer.to_dataframe()
+        assert list(df.warp) == [9, 12]
+        assert list(df.ion_drive_power) == [110.0, "off"]
+    finally:
+        FlightPoint.remove_field("warp")
+        FlightPoint.remove_field("ion_drive_power")
+
+
+def test_buffer_with_complex_values(flight_points):
+    buffer = TrajectoryBuffer(capacity=2)
+    buffer.extend(flight_points[:2])
+    buffer.append(FlightPoint(time=20.0, mass=69980.0 + 1.0e-30j))
+    buffer.append(FlightPoint(time=30.0, mass=69970.0))
+
+    df = buffer.to_dataframe()
+    assert df.mass.dtype == complex
+    assert df.time.dtype == float
+    assert_allclose(np.real(df.mass), [70000.0, 69990.0, 69980.0, 69970.0])
+    assert_allclose(np.imag(df.mass), [0.0, 0.0, 1.0e-30, 0.0])
+
+
+def test_buffer_append_dataframe(flight_points):
+    buffer = TrajectoryBuffer(capacity=2)
+    buffer.append_dataframe(pd.DataFrame(flight_points))
+    buffer.append_dataframe(pd.DataFrame(flight_points[1:]))
+
+    assert len(buffer) == 5
+    expected = pd.DataFrame(flight_points + flight_points[1:])
+    expected["mass"] = [70000.0, 69990.0, 69980.0, 69990.0, 69980.0]
+    assert_frame_equal(buffer.to_dataframe(), expected)
+    assert buffer[-1].mass == 69980.0
+    assert buffer[-1].name == "climb"
+
+
+def test_buffer_complete_and_truncate(flight_points):
+    buffer = TrajectoryBuffer()
+    buffer.extend(flight_points)
+
+    buffer.complete(-1, FlightPoint(time=0.0, altitude=300.0, CD=0.03, name="cruise"))
+    # Kept instance is replaced, not modified
+    assert flight_points[-1].CD is None
+    assert buffer[-1] == FlightPoint(
+        time=20.0, altitude=200.0, mass=69980.0, CL=0.5, CD=0.03, name="climb"
+    )
+    assert_allclose(buffer.to_dataframe().CD, [np.nan, np.nan, 0.03])
+
+    buffer.truncate(2)
+    assert len(buffer) == 2
+    assert buffer[-1].time == 10.0
+    buffer.append(FlightPoint(time=15.0))
+    assert_allclose(buffer.to_dataframe().time, [0.0, 10.0, 15.0])
+    buffer.truncate(1)
+    assert buffer[-1] is flight_points[0]
+    with pytest.raises(IndexError):
+        buffer.truncate(2)
+
+
+def test_view(flight_points):
+    buffer = TrajectoryBuffer()
+    buffer.extend(flight_points[:2])
+    start = FlightPoint(time=10.0, altitude=100.0, mass=69990.0, name="cruise")
+    view = buffer.view(start)
+
+    assert len(view) == 1
+    assert view[0] is start
+    assert view[-1] is start
+    with pytest.raises(IndexError):
+        del view[-1]
+
+    view.append(flight_points[2])
+    assert len(view) == 2
+    assert len(buffer) == 3
+    assert view[-1] is flight_points[2]
+    assert view[-2] is start
+    del view[-1]
+    assert len(buffer) == 2
+
+
+def test_boundary_buffer():
+    flight_points = [FlightPoint(time=float(i)) for i in range(10)]
+    buffer = BoundaryTrajectoryBuffer(tail_size=2)
+    buffer.keep(0)
+    buffer.keep(4)
+    buffer.extend(flight_points[:6])
+
+    assert len(buffer) == 6
+    assert buffer.rows == [0, 4, 5]
+    assert buffer[4] is flight_points[4]
+    assert buffer[-2] is flight_points[4]
+    with pytest.raises(IndexError):
+        _ = buffer[3]
+
+    buffer.append_dataframe(pd.DataFrame(flight_points[6:]))
+    assert len(buffer) == 10
+    assert buffer.rows == [0, 4, 8, 9]
+    assert buffer[-1].time == 9.0
+    assert_allclose(buffer.to_dataframe().time, [0.0, 4.0, 8.0, 9.0])
+
+    buffer.complete(-1, FlightPoint(mass=70000.0))
+    assert buffer[-1] == FlightPoint(time=9.0, mass=70000.0)
+
+    # Marks are still used after truncation
+    buffer.truncate(3)
+    assert buffer.rows == [0]
+    buffer.extend(flight_points[3:7])
+    assert buffer.rows == [0, 4, 5, 6]
+    del buffer[-1]
+    assert buffer[-1] is flight_points[5]
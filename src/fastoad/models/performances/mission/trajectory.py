@@ -0,0 +1,494 @@
+"""Storage of computed flight points."""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2022 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from dataclasses import fields, replace
+from typing import Dict, List, Sequence, Set
+
+import numpy as np
+import pandas as pd
+
+from fastoad.model_base import FlightPoint
+
+DEFAULT_CAPACITY = 256
+
+
+class TrajectoryBuffer:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        Growable storage of flight points, with one numpy array per FlightPoint field.
+
+        Fields added with :meth:`~fastoad.model_base.flight_point.FlightPoint.add_field`
+        before instantiation are handled.
+
+        The buffer behaves like a list of FlightPoint instances for the operations that are
+        needed for time-step integration: :code:`len()`, indexing, appending a flight point
+        and deleting the last flight point.
+
+        The first and last appended FlightPoint instances are kept as is, so that they can be
+        used (and modified) without building new instances.
+
+        :param capacity: initial number of flight points that can be stored before the
+                         buffer has to grow
+        """
+        self._capacity = max(int(capacity), 1)
+        self._size = 0
+
+        self._columns = {}
+        # Tells for each float field if a value has been provided at least once.
+        self._is_defined = {}
+        for field in fields(FlightPoint):
+            if field.type is float:
+                self._columns[field.name] = np.full(self._capacity, np.nan)
+                self._is_defined[field.name] = False
+            else:
+                self._columns[field.name] = np.full(self._capacity, None, dtype=object)
+
+        self._first = None
+        # The last appended FlightPoint instances (at most 2 of them)
+        self._tail = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> FlightPoint:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("TrajectoryBuffer index out of range")
+
+        if index == 0 and self._first is not None:
+            return self._first
+        tail_start = self._size - len(self._tail)
+        if index >= tail_start:
+            return self._tail[index - tail_start]
+
+        return self._get_flight_point(index)
+
+    def __delitem__(self, index: int):
+        if index not in [-1, self._size - 1]:
+            raise IndexError("Only the last flight point can be deleted from a TrajectoryBuffer.")
+        self.pop()
+
+    def append(self, flight_point: FlightPoint):
+        """
+        Appends provided flight point at end of buffer.
+
+        :param flight_point: the flight point to add
+        """
+        if self._size == self._capacity:
+            self._grow()
+
+        self._write_row(self._size, flight_point)
+
+        self._size += 1
+        if self._size == 1:
+            self._first = flight_point
+        self._tail = self._tail[-1:] + [flight_point]
+
+    def extend(self, flight_points):
+        """
+        Appends provided flight points at end of buffer.
+
+        :param flight_points: an iterable of FlightPoint instances
+        """
+        for flight_point in flight_points:
+            self.append(flight_point)
+
+    def pop(self) -> FlightPoint:
+        """
+        Removes the last flight point.
+
+        :return: the removed flight point
+        """
+        if self._size == 0:
+            raise IndexError("pop from empty TrajectoryBuffer")
+
+        flight_point = self[-1]
+        self._size -= 1
+        del self._tail[-1]
+        if self._size == 0:
+            self._first = None
+        elif not self._tail:
+            self._tail = [self._get_flight_point(self._size - 1)]
+        return flight_point
+
+    def append_dataframe(self, data: pd.DataFrame):
+        """
+        Appends flight points of provided DataFrame at end of buffer.
+
+        Values are copied column by column, without building FlightPoint instances.
+
+        :param data: a DataFrame where columns names match fields of FlightPoint
+        """
+        count = len(data)
+        if count == 0:
+            return
+        while self._size + count > self._capacity:
+            self._grow()
+
+        rows = slice(self._size, self._size + count)
+        for name, column in self._columns.items():
+            if name not in data.columns:
+                column[rows] = np.nan if column.dtype != object else None
+                continue
+
+            values = data[name].to_numpy()
+            if column.dtype != object:
+                try:
+                    values = self._as_numeric(values)
+                except (TypeError, ValueError):
+                    column = self._columns[name] = self._as_object_column(name)
+            if column.dtype != object:
+                if column.dtype == float and np.iscomplexobj(values):
+                    column = self._columns[name] = self._as_complex_column(name)
+                column[rows] = values
+                if not np.all(np.isnan(values)):
+                    self._is_defined[name] = True
+            else:
+                column[rows] = values
+
+        if self._size == 0:
+            self._first = None
+        self._size += count
+        self._tail = [self._get_flight_point(self._size - 1)]
+
+    def complete(self, index: int, flight_point: FlightPoint):
+        """
+        Sets the missing values of stored flight point at `index` from provided flight point.
+
+        As when concatenating computed flight parts, a value is considered as missing if it
+        is None or evaluates to False.
+        The kept FlightPoint instance, if any, is replaced, not modified.
+
+        :param index: index of the flight point to complete
+        :param flight_point: the flight point that provides values
+        """
+        if index < 0:
+            index += self._size
+        stored_point = self[index]
+        missing_values = {
+            name: getattr(flight_point, name)
+            for name in self._columns
+            if _is_missing(getattr(stored_point, name))
+            and not _is_missing(getattr(flight_point, name))
+        }
+        if not missing_values:
+            return
+
+        new_point = replace(stored_point, **missing_values)
+        self._write_row(index, new_point)
+        if index == 0 and self._first is not None:
+            self._first = new_point
+        tail_start = self._size - len(self._tail)
+        if index >= tail_start:
+            self._tail[index - tail_start] = new_point
+
+    def truncate(self, size: int):
+        """
+        Removes flight points so that only the `size` first ones are kept.
+
+        :param size: the number of flight points to keep
+        """
+        if not 0 <= size <= self._size:
+            raise IndexError("Cannot truncate TrajectoryBuffer to a larger size.")
+        if size == self._size:
+            return
+
+        self._size = size
+        if size == 0:
+            self._first = None
+            self._tail = []
+        elif size == 1 and self._first is not None:
+            self._tail = [self._first]
+        else:
+            self._tail = [self._get_flight_point(size - 1)]
+
+    def keep(self, index: int):
+        """
+        Tells that the flight point at `index` is a boundary of a flight part.
+
+        All flight points are kept in this class, so it does nothing here
+        (see :class:`BoundaryTrajectoryBuffer`).
+
+        :param index: index of the flight point, that may not have been appended yet
+        """
+
+    @property
+    def rows(self) -> Sequence[int]:
+        """Indices of flight points that are provided by :meth:`to_dataframe`."""
+        return range(self._size)
+
+    def view(self, start: FlightPoint) -> "TrajectoryView":
+        """
+        Provides access to flight points that will be appended from now on, as the flight
+        points of a flight part that begins at `start`.
+
+        :param start: the start point of the flight part
+        :return: the TrajectoryView instance
+        """
+        return TrajectoryView(self, start)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Provides stored flight points as a pandas DataFrame.
+
+        Columns names match fields of FlightPoint.
+        Float columns are provided to pandas as views on the buffer arrays, so the buffer
+        should not be modified while the DataFrame is used.
+
+        :return: the DataFrame instance
+        """
+        data = {}
+        for name, column in self._columns.items():
+            values = column[: self._size]
+            if column.dtype == object or not self._is_defined.get(name, True):
+                # Let pandas infer the type, as it does when building a DataFrame
+                # from a list of FlightPoint instances.
+                values = [None] * self._size if column.dtype != object else values.tolist()
+            data[name] = values
+        return pd.DataFrame(data, copy=False)
+
+    def _write_row(self, index: int, flight_point: FlightPoint):
+        """Stores values of provided flight point at `index`."""
+        for name, column in self._columns.items():
+            value = getattr(flight_point, name)
+            if isinstance(value, np.ndarray) and value.size == 1:
+                value = value.item()
+            if value is None:
+                column[index] = np.nan if name in self._is_defined else None
+                continue
+            if column.dtype == float and np.iscomplexobj(value):
+                # Complex values (e.g. when using complex step) are kept as is.
+                column = self._columns[name] = self._as_complex_column(name)
+            try:
+                column[index] = value
+            except (TypeError, ValueError):
+                column = self._columns[name] = self._as_object_column(name)
+                column[index] = value
+            if name in self._is_defined:
+                self._is_defined[name] = True
+
+    def _get_flight_point(self, index: int) -> FlightPoint:
+        """Builds a FlightPoint instance from stored values."""
+        values = {}
+        for name, column in self._columns.items():
+            value = column[index]
+            if name in self._is_defined and column.dtype != object:
+                value = None if np.isnan(value) else value.item()
+            values[name] = value
+        return FlightPoint(**values)
+
+    def _grow(self):
+        self._capacity *= 2
+        for name, column in self._columns.items():
+            fill_value = None if column.dtype == object else np.nan
+            new_column = np.full(self._capacity, fill_value, dtype=column.dtype)
+            new_column[: self._size] = column[: self._size]
+            self._columns[name] = new_column
+
+    def _as_complex_column(self, name: str) -> np.ndarray:
+        """Converts the named float column to complex type."""
+        column = self._columns[name]
+        new_column = np.full(self._capacity, np.nan, dtype=complex)
+        new_column[: self._size] = column[: self._size]
+        return new_column
+
+    def _as_object_column(self, name: str) -> np.ndarray:
+        """Converts the named column to object type, e.g. if a non-float value is provided."""
+        column = self._columns[name]
+        new_column = np.full(self._capacity, None, dtype=object)
+        values = column[: self._size]
+        if column.dtype != object:
+            values = np.where(np.isnan(values), None, values)
+        new_column[: self._size] = values
+        del self._is_defined[name]
+        return new_column
+
+    @staticmethod
+    def _as_numeric(values: np.ndarray) -> np.ndarray:
+        """
+        Converts provided DataFrame column to float (or complex) values, with NaN for None.
+
+        :raise TypeError: if values are not numeric
+        """
+        if values.dtype == object:
+            values = np.array(
+                [
+                    np.nan
+                    if value is None
+                    else value.item()
+                    if isinstance(value, np.ndarray) and value.size == 1
+                    else value
+                    for value in values
+                ]
+            )
+        if values.dtype.kind in "biuf":
+            return values.astype(float)
+        if values.dtype.kind == "c":
+            return values
+        raise TypeError("Values are not numeric.")
+
+
+class BoundaryTrajectoryBuffer(TrajectoryBuffer):
+    def __init__(self, tail_size: int = 3):
+        """
+        Storage of flight points that keeps only the boundaries of flight parts.
+
+        Indices are the same as in :class:`TrajectoryBuffer`, but only the flight points
+        that have been marked with :meth:`keep` and the last ones are stored, so memory
+        does not grow with the number of computed time steps. Accessing another flight
+        point raises an IndexError.
+
+        :meth:`to_dataframe` provides only stored flight points, whose indices are given
+        by :attr:`rows`.
+
+        :param tail_size: number of last flight points that are kept in any case, which
+                          has to be enough for time-step integration
+        """
+        # pylint: disable=super-init-not-called  # Columns of parent class are not used.
+        self._size = 0
+        self._tail_size = tail_size
+        self._points: Dict[int, FlightPoint] = {}
+        self._kept_rows: Set[int] = set()
+
+    def __getitem__(self, index: int) -> FlightPoint:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("BoundaryTrajectoryBuffer index out of range")
+        if index not in self._points:
+            raise IndexError(
+                "Flight point %i has not been kept in BoundaryTrajectoryBuffer" % index
+            )
+        return self._points[index]
+
+    def append(self, flight_point: FlightPoint):
+        self._points[self._size] = flight_point
+        self._size += 1
+        old_index = self._size - self._tail_size - 1
+        if old_index not in self._kept_rows:
+            self._points.pop(old_index, None)
+
+    def pop(self) -> FlightPoint:
+        if self._size == 0:
+            raise IndexError("pop from empty BoundaryTrajectoryBuffer")
+
+        flight_point = self[-1]
+        self._size -= 1
+        del self._points[self._size]
+        return flight_point
+
+    def append_dataframe(self, data: pd.DataFrame):
+        count = len(data)
+        for i in range(max(count - self._tail_size, 0), count):
+            self._points[self._size + i] = FlightPoint.create(data.iloc[i])
+        self._size += count
+        self._forget_old_points()
+
+    def complete(self, index: int, flight_point: FlightPoint):
+        if index < 0:
+            index += self._size
+        stored_point = self[index]
+        missing_values = {
+            field.name: getattr(flight_point, field.name)
+            for field in fields(FlightPoint)
+            if _is_missing(getattr(stored_point, field.name))
+            and not _is_missing(getattr(flight_point, field.name))
+        }
+        if missing_values:
+            self._points[index] = replace(stored_point, **missing_values)
+
+    def truncate(self, size: int):
+        if not 0 <= size <= self._size:
+            raise IndexError("Cannot truncate BoundaryTrajectoryBuffer to a larger size.")
+
+        self._size = size
+        self._points = {index: point for index, point in self._points.items() if index < size}
+
+    def keep(self, index: int):
+        """
+        Marks the flight point at `index` as a boundary of a flight part, so that it is
+        stored.
+
+        Marks are not removed by :meth:`truncate`, as flight parts are usually computed
+        again after truncation.
+
+        :param index: index of the flight point, that may not have been appended yet
+        """
+        self._kept_rows.add(index)
+
+    @property
+    def rows(self) -> List[int]:
+        return sorted(self._points)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        buffer = TrajectoryBuffer(len(self._points))
+        buffer.extend(self._points[index] for index in self.rows)
+        return buffer.to_dataframe()
+
+    def _forget_old_points(self):
+        """Removes stored flight points that are neither kept nor among the last ones."""
+        tail_start = self._size - self._tail_size
+        for index in [index for index in self._points if index < tail_start]:
+            if index not in self._kept_rows:
+                del self._points[index]
+
+
+class TrajectoryView:
+    def __init__(self, buffer: TrajectoryBuffer, start: FlightPoint):
+        """
+        List-like access to the flight points of a flight part that is computed into a
+        :class:`TrajectoryBuffer`.
+
+        Item 0 is the start point of the flight part. Other items are the flight points that
+        have been appended to the buffer after the creation of the view. Therefore, when the
+        buffer is not empty, the start point (that is usually a copy of the last flight point
+        of the buffer) is not stored twice.
+
+        :param buffer: the buffer where flight points are appended
+        :param start: the start point of the flight part
+        """
+        self._buffer = buffer
+        self._start = start
+        self._offset = len(buffer) - 1
+
+    def __len__(self) -> int:
+        return len(self._buffer) - self._offset
+
+    def __getitem__(self, index: int) -> FlightPoint:
+        if index < 0:
+            index += len(self)
+        if index == 0:
+            return self._start
+        if not 0 < index < len(self):
+            raise IndexError("TrajectoryView index out of range")
+        return self._buffer[self._offset + index]
+
+    def __delitem__(self, index: int):
+        if len(self) <= 1 or index not in [-1, len(self) - 1]:
+            raise IndexError("Only the last computed flight point can be deleted.")
+        self._buffer.pop()
+
+    def append(self, flight_point: FlightPoint):
+        """
+        Appends provided flight point at end of buffer.
+
+        :param flight_point: the flight point to add
+        """
+        self._buffer.append(flight_point)
+
+
+def _is_missing(value) -> bool:
+    """Tells if value should be replaced when completing a flight point."""
+    return value is None or (np.size(value) == 1 and not value)
@@ -53,6 +53,8 @@ def get_closest_flight_level(altitude, base_level=0, level_step=10, up_direction
         func = np.floor
 
     base_altitude = FLIGHT_LEVEL * base_level
+    # Flight levels are discrete values, so the imaginary part of a complex altitude
+    # (complex step) is dropped.
     return base_altitude + FLIGHT_LEVEL * level_step * func(
-        (altitude - base_altitude) / FLIGHT_LEVEL / level_step
+        (np.real(altitude) - base_altitude) / FLIGHT_LEVEL / level_step
     )